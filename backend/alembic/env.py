@@ -4,6 +4,7 @@ import sys
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
+from sqlalchemy import text
 
 from alembic import context
 
@@ -23,6 +24,62 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# DDL that cannot get its lock quickly fails instead of queueing behind a
+# long transaction, with every other query on the table queued behind it.
+# statement_timeout bounds the rest; CONCURRENTLY index builds on large
+# tables are the slow part, hence the generous default.
+LOCK_TIMEOUT = os.getenv("MIGRATION_LOCK_TIMEOUT", "5s")
+STATEMENT_TIMEOUT = os.getenv("MIGRATION_STATEMENT_TIMEOUT", "30min")
+
+# A CONCURRENTLY index build that fails part-way leaves an INVALID index
+# behind, which a later CREATE INDEX ... IF NOT EXISTS would take as done.
+# Such leftovers are dropped before migrating, so the revision that failed
+# builds them again. Only the indexes this chain builds concurrently are
+# touched, and only when no build of them is still running: an index that
+# another session is creating or reindexing is INVALID until it finishes.
+# A revision that builds an index CONCURRENTLY lists it here.
+CONCURRENT_INDEXES = (
+    # 002
+    'idx_cases_reminder_date_active', 'idx_executions_reminder_date_active',
+    'idx_compensation_letters_reminder_date_active', 'idx_cases_status_active',
+    # 003
+    'idx_clients_updated_at_id_active', 'idx_cases_updated_at_id_active', 'idx_executions_updated_at_id_active',
+    # 004
+    'idx_clients_updated_at_id', 'idx_cases_updated_at_id', 'idx_executions_updated_at_id',
+    'idx_compensation_letters_updated_at_id',
+    # 005
+    'idx_cases_search_vector', 'idx_cases_search_trgm',
+    # 007, and the legacy indexes its downgrade rebuilds
+    'idx_cases_status_updated_at_active', 'idx_executions_status_updated_at_active',
+    'idx_compensation_letters_status_updated_at_active', 'idx_compensation_letters_updated_at_id_active',
+    'idx_cases_client_id', 'idx_executions_client_id', 'idx_compensation_letters_client_id',
+    'idx_clients_is_deleted', 'idx_cases_is_deleted', 'idx_executions_is_deleted',
+    'idx_compensation_letters_is_deleted', 'idx_cases_status_updated_at', 'idx_executions_status_updated_at',
+    'idx_compensation_letters_status_updated_at', 'idx_cases_defendant', 'idx_executions_defendant',
+    'idx_clients_updated_at',
+    # 009
+    'idx_cases_next_hearing_date_active',
+)
+
+INVALID_INDEXES = text("""
+    SELECT pg_class.relname FROM pg_index
+    JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+    WHERE NOT pg_index.indisvalid
+      AND pg_class.relnamespace = current_schema()::regnamespace
+      AND pg_class.relname = ANY(:names)
+      AND pg_index.indexrelid NOT IN (SELECT index_relid FROM pg_stat_progress_create_index)
+""")
+
+
+def drop_invalid_indexes(connectable) -> None:
+    with connectable.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.execute(text("SELECT set_config('lock_timeout', :value, false)"), {"value": LOCK_TIMEOUT})
+        invalid = connection.execute(INVALID_INDEXES, {"names": list(CONCURRENT_INDEXES)}).scalars().all()
+        for name in invalid:
+            print(f"Dropping invalid index {name} left by a failed concurrent build")
+            connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -61,7 +118,11 @@ def run_migrations_online() -> None:
 
     """
     configuration = config.get_section(config.config_ini_section, {})
-    configuration["sqlalchemy.url"] = os.getenv("DATABASE_URL", configuration.get("sqlalchemy.url"))
+    # Migrations set session timeouts and build indexes outside a
+    # transaction, so they bypass a transaction-pooling PgBouncer.
+    configuration["sqlalchemy.url"] = (
+        os.getenv("DIRECT_DATABASE_URL") or os.getenv("DATABASE_URL") or configuration.get("sqlalchemy.url")
+    )
     
     connectable = engine_from_config(
         configuration,
@@ -69,9 +130,18 @@ def run_migrations_online() -> None:
         poolclass=pool.NullPool,
     )
 
+    drop_invalid_indexes(connectable)
+
     with connectable.connect() as connection:
+        connection.execute(text("SELECT set_config('lock_timeout', :value, false)"), {"value": LOCK_TIMEOUT})
+        connection.execute(text("SELECT set_config('statement_timeout', :value, false)"), {"value": STATEMENT_TIMEOUT})
+        connection.commit()
+
+        # One transaction per revision, so autocommit_block() in a revision
+        # only commits that revision's own earlier statements.
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
@@ -18,6 +18,20 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
+    # Databases created by the old startup-time create_all() already have
+    # these tables; they join the chain here without being recreated.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'clients' not in existing:
+        _create_clients()
+    if 'cases' not in existing:
+        _create_cases()
+    if 'compensation_letters' not in existing:
+        _create_compensation_letters()
+    if 'executions' not in existing:
+        _create_executions()
+
+
+def _create_clients() -> None:
     op.create_table('clients',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('name', sa.String(), nullable=False),
@@ -30,6 +44,9 @@ def upgrade() -> None:
     sa.Column('version', sa.Integer(), nullable=True),
     sa.PrimaryKeyConstraint('id')
     )
+
+
+def _create_cases() -> None:
     op.create_table('cases',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('title', sa.String(), nullable=False),
@@ -52,6 +69,9 @@ def upgrade() -> None:
     sa.Column('version', sa.Integer(), nullable=True),
     sa.PrimaryKeyConstraint('id')
     )
+
+
+def _create_compensation_letters() -> None:
     op.create_table('compensation_letters',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('title', sa.String(), nullable=False),
@@ -70,6 +90,9 @@ def upgrade() -> None:
     sa.Column('version', sa.Integer(), nullable=True),
     sa.PrimaryKeyConstraint('id')
     )
+
+
+def _create_executions() -> None:
     op.create_table('executions',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('client_id', sa.String(), nullable=False),
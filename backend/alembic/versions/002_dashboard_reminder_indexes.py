@@ -0,0 +1,55 @@
+"""Partial indexes backing the dashboard reminder window and status counts
+
+Revision ID: 002_dashboard_reminder_indexes
+Revises: 001_initial_migration
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '002_dashboard_reminder_indexes'
+down_revision: Union[str, None] = '001_initial_migration'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Columns these indexes need. They used to be added outside the chain, so a
+# database created by 001 alone lacks them; 008 adds the rest of the
+# columns the models have gained.
+REQUIRED_COLUMNS = [
+    ('clients', 'is_deleted', 'BOOLEAN DEFAULT FALSE'),
+    ('cases', 'is_deleted', 'BOOLEAN DEFAULT FALSE'),
+    ('compensation_letters', 'is_deleted', 'BOOLEAN DEFAULT FALSE'),
+    ('compensation_letters', 'reminder_date', 'DATE'),
+    ('executions', 'is_deleted', 'BOOLEAN DEFAULT FALSE'),
+]
+
+
+def upgrade() -> None:
+    for table, name, column_type in REQUIRED_COLUMNS:
+        op.execute(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {name} {column_type}')
+    with op.get_context().autocommit_block():
+        op.create_index('idx_cases_reminder_date_active', 'cases', ['reminder_date'],
+                        postgresql_where=sa.text('is_deleted = false AND reminder_date IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_executions_reminder_date_active', 'executions', ['reminder_date'],
+                        postgresql_where=sa.text('is_deleted = false AND reminder_date IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_compensation_letters_reminder_date_active', 'compensation_letters', ['reminder_date'],
+                        postgresql_where=sa.text('is_deleted = false AND reminder_date IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_cases_status_active', 'cases', ['status'],
+                        postgresql_where=sa.text('is_deleted = false'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_cases_status_active', table_name='cases', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_compensation_letters_reminder_date_active', table_name='compensation_letters', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_executions_reminder_date_active', table_name='executions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_cases_reminder_date_active', table_name='cases', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,38 @@
+"""Composite indexes for keyset pagination on list endpoints
+
+Revision ID: 003_keyset_pagination_indexes
+Revises: 002_dashboard_reminder_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '003_keyset_pagination_indexes'
+down_revision: Union[str, None] = '002_dashboard_reminder_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # Scanned backwards for ORDER BY updated_at DESC, id DESC.
+        op.create_index('idx_clients_updated_at_id_active', 'clients', ['updated_at', 'id'],
+                        postgresql_where=sa.text('is_deleted = false'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_cases_updated_at_id_active', 'cases', ['updated_at', 'id'],
+                        postgresql_where=sa.text('is_deleted = false'),
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_executions_updated_at_id_active', 'executions', ['updated_at', 'id'],
+                        postgresql_where=sa.text('is_deleted = false'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_executions_updated_at_id_active', table_name='executions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_cases_updated_at_id_active', table_name='cases', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_clients_updated_at_id_active', table_name='clients', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,36 @@
+"""(updated_at, id) indexes for delta sync, including soft-deleted rows
+
+Revision ID: 004_sync_updated_at_indexes
+Revises: 003_keyset_pagination_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '004_sync_updated_at_indexes'
+down_revision: Union[str, None] = '003_keyset_pagination_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_clients_updated_at_id', 'clients', ['updated_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_cases_updated_at_id', 'cases', ['updated_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_executions_updated_at_id', 'executions', ['updated_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('idx_compensation_letters_updated_at_id', 'compensation_letters', ['updated_at', 'id'],
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_compensation_letters_updated_at_id', table_name='compensation_letters', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_executions_updated_at_id', table_name='executions', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_cases_updated_at_id', table_name='cases', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('idx_clients_updated_at_id', table_name='clients', postgresql_concurrently=True, if_exists=True)
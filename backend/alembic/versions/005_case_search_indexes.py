@@ -0,0 +1,50 @@
+"""Full-text and trigram search indexes for cases
+
+Revision ID: 005_case_search_indexes
+Revises: 004_sync_updated_at_indexes
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '005_case_search_indexes'
+down_revision: Union[str, None] = '004_sync_updated_at_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # unaccent() is only STABLE because its dictionary could change; pinning
+    # the dictionary lets us declare the wrapper IMMUTABLE for use in indexes.
+    # Turkish dotted/dotless i are mapped explicitly before folding.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION lexcloud_fold(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, translate(value, 'İIı', 'iii'))) $$
+    """)
+
+    with op.get_context().autocommit_block():
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_search_vector ON cases USING gin ((
+                setweight(to_tsvector('simple'::regconfig, lexcloud_fold(title || ' ' || case_number)), 'A') ||
+                setweight(to_tsvector('simple'::regconfig, lexcloud_fold(defendant || ' ' || client_name)), 'B')
+            )) WHERE is_deleted = false
+        """)
+        op.execute("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_cases_search_trgm ON cases USING gin ((
+                lexcloud_fold(title || ' ' || case_number || ' ' || defendant || ' ' || client_name)
+            ) gin_trgm_ops) WHERE is_deleted = false
+        """)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_search_trgm")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS idx_cases_search_vector")
+    op.execute("DROP FUNCTION IF EXISTS lexcloud_fold(text)")
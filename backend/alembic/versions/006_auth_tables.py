@@ -0,0 +1,43 @@
+"""Token revocation and application settings tables
+
+Revision ID: 006_auth_tables
+Revises: 005_case_search_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '006_auth_tables'
+down_revision: Union[str, None] = '005_case_search_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # May already exist where the old startup-time create_all() ran.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'revoked_tokens' not in existing:
+        op.create_table('revoked_tokens',
+            sa.Column('jti', sa.String(), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.Column('revoked_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('jti')
+        )
+        op.create_index('idx_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'])
+    if 'app_settings' not in existing:
+        op.create_table('app_settings',
+            sa.Column('key', sa.String(), nullable=False),
+            sa.Column('value', sa.Text(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('key')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('app_settings')
+    op.drop_index('idx_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,74 @@
+"""Replace boolean and out-of-chain indexes with partial indexes on active rows
+
+Revision ID: 007_partial_active_indexes
+Revises: 006_auth_tables
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '007_partial_active_indexes'
+down_revision: Union[str, None] = '006_auth_tables'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Built by migrations/001_add_soft_delete_and_indexes.py / run_migrations.py
+# on some databases. An index on is_deleted alone matches almost every row
+# and is never chosen; the status/updated_at ones are superseded by the
+# partial indexes below; btree indexes on defendant cannot serve the
+# ILIKE '%...%' filters they were meant for; and (updated_at, id) indexes
+# from 003/004 replace the one on clients.updated_at. Downgrading puts
+# them back, as those scripts defined them.
+LEGACY_INDEXES = {
+    'idx_clients_is_deleted': ('clients', ['is_deleted']),
+    'idx_cases_is_deleted': ('cases', ['is_deleted']),
+    'idx_executions_is_deleted': ('executions', ['is_deleted']),
+    'idx_compensation_letters_is_deleted': ('compensation_letters', ['is_deleted']),
+    'idx_cases_status_updated_at': ('cases', ['status', 'updated_at']),
+    'idx_executions_status_updated_at': ('executions', ['status', 'updated_at']),
+    'idx_compensation_letters_status_updated_at': ('compensation_letters', ['status', 'updated_at']),
+    'idx_cases_defendant': ('cases', ['defendant']),
+    'idx_executions_defendant': ('executions', ['defendant']),
+    'idx_clients_updated_at': ('clients', ['updated_at']),
+}
+
+ACTIVE = sa.text('is_deleted = false')
+
+# name, table, columns, partial on active rows
+INDEXES = [
+    # Status-filtered list pages, newest first.
+    ('idx_cases_status_updated_at_active', 'cases', ['status', 'updated_at'], True),
+    ('idx_executions_status_updated_at_active', 'executions', ['status', 'updated_at'], True),
+    ('idx_compensation_letters_status_updated_at_active', 'compensation_letters', ['status', 'updated_at'], True),
+    # Keyset pagination for the compensation letter list added with the
+    # generated CRUD routes.
+    ('idx_compensation_letters_updated_at_id_active', 'compensation_letters', ['updated_at', 'id'], True),
+    # Not partial: client renames rewrite client_name on deleted rows too.
+    # The legacy scripts built these same indexes, so a downgrade keeps them.
+    ('idx_cases_client_id', 'cases', ['client_id'], False),
+    ('idx_executions_client_id', 'executions', ['client_id'], False),
+    ('idx_compensation_letters_client_id', 'compensation_letters', ['client_id'], False),
+]
+LEGACY_CLIENT_ID_INDEXES = {'idx_cases_client_id', 'idx_executions_client_id', 'idx_compensation_letters_client_id'}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, partial in INDEXES:
+            op.create_index(name, table, columns, postgresql_where=ACTIVE if partial else None,
+                            postgresql_concurrently=True, if_not_exists=True)
+        for name in LEGACY_INDEXES:
+            op.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in LEGACY_INDEXES.items():
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, table, _, _ in reversed(INDEXES):
+            if name not in LEGACY_CLIENT_ID_INDEXES:
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,44 @@
+"""Columns the models gained outside the chain: assignment and letter reminders
+
+Revision ID: 008_model_columns
+Revises: 007_partial_active_indexes
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = '008_model_columns'
+down_revision: Union[str, None] = '007_partial_active_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# These used to be added by migrations/001_add_soft_delete_and_indexes.py,
+# run_migrations.py and a probe in startup_event, so most databases already
+# have some of them; IF NOT EXISTS makes this a no-op there. The assignment
+# column's name is the mis-encoded "görevlendiren" the models map to.
+COLUMNS = {
+    'clients': [('is_deleted', 'BOOLEAN DEFAULT FALSE'), ('vekalet_ofis_no', 'VARCHAR')],
+    'cases': [('is_deleted', 'BOOLEAN DEFAULT FALSE'), ('responsible_person', 'VARCHAR'), ('gÃ¶revlendiren', 'VARCHAR')],
+    'compensation_letters': [
+        ('is_deleted', 'BOOLEAN DEFAULT FALSE'), ('reminder_date', 'DATE'), ('reminder_text', 'TEXT'),
+        ('responsible_person', 'VARCHAR'), ('gÃ¶revlendiren', 'VARCHAR'),
+    ],
+    'executions': [('is_deleted', 'BOOLEAN DEFAULT FALSE'), ('responsible_person', 'VARCHAR'), ('gÃ¶revlendiren', 'VARCHAR')],
+}
+
+
+def upgrade() -> None:
+    # Adding a nullable column or one with a constant default only touches
+    # the catalog, so each ALTER holds its lock for milliseconds.
+    for table, columns in COLUMNS.items():
+        for name, column_type in columns:
+            op.execute(f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS "{name}" {column_type}')
+
+
+def downgrade() -> None:
+    # Nearly every database had these columns, and data in them, before
+    # this revision existed; dropping them here would lose that data.
+    pass
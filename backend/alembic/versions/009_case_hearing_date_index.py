@@ -0,0 +1,32 @@
+"""Partial index backing the reminder index's hearing date window
+
+Revision ID: 009_case_hearing_date_index
+Revises: 008_model_columns
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '009_case_hearing_date_index'
+down_revision: Union[str, None] = '008_model_columns'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# The reminder index loads cases whose reminder_date OR next_hearing_date
+# falls in its window; without this the hearing half of the OR reads the
+# whole table.
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('idx_cases_next_hearing_date_active', 'cases', ['next_hearing_date'],
+                        postgresql_where=sa.text('is_deleted = false AND next_hearing_date IS NOT NULL'),
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_cases_next_hearing_date_active', table_name='cases', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import heapq
+import hmac
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import jwt
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import RevokedTokenDB, SettingDB
+
+PASSWORD_SETTING = "admin_password_hash"
+PASSWORD_ITERATIONS = 200_000
+
+
+class TokenRevoked(jwt.InvalidTokenError):
+    pass
+
+
+class TokenVerifier:
+    """Verifies JWTs with an LRU of already-verified tokens and a revocation set.
+
+    A hot token skips HMAC verification and claim parsing entirely; its
+    expiry is still checked against the clock on every call. Revoked ``jti``
+    values are kept in memory until the token they belong to would have
+    expired anyway, so checking revocation never touches the database.
+    """
+
+    def __init__(self, secret: str, algorithm: str = "HS256", cache_size: int = 1024, clock: Callable[[], float] = time.time):
+        self.secret = secret
+        self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.clock = clock
+        self._verified: "OrderedDict[str, dict]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._expiries: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def issue(self, subject: str, lifetime: timedelta) -> str:
+        now = datetime.now(timezone.utc)
+        payload = {"sub": subject, "jti": uuid.uuid4().hex, "iat": now, "exp": now + lifetime}
+        return jwt.encode(payload, self.secret, algorithm=self.algorithm)
+
+    def verify(self, token: str) -> dict:
+        now = self.clock()
+        with self._lock:
+            self._expire_revocations(now)
+            payload = self._verified.get(token)
+            if payload is not None:
+                self._verified.move_to_end(token)
+                self.hits += 1
+        if payload is None:
+            payload = jwt.decode(
+                token, self.secret, algorithms=[self.algorithm], options={"require": ["exp", "jti"]}
+            )
+            with self._lock:
+                self.misses += 1
+                self._verified[token] = payload
+                if len(self._verified) > self.cache_size:
+                    self._verified.popitem(last=False)
+        if payload["exp"] <= now:
+            with self._lock:
+                self._verified.pop(token, None)
+            raise jwt.ExpiredSignatureError("Signature has expired")
+        if payload["jti"] in self._revoked:
+            raise TokenRevoked("Token has been revoked")
+        return payload
+
+    def revoke(self, jti: str, expires_at: float):
+        with self._lock:
+            if jti not in self._revoked:
+                self._revoked[jti] = expires_at
+                heapq.heappush(self._expiries, (expires_at, jti))
+
+    def handle_revocation_event(self, message: dict):
+        self.revoke(message["jti"], message["exp"])
+
+    def _expire_revocations(self, now: float):
+        while self._expiries and self._expiries[0][0] <= now:
+            _, jti = heapq.heappop(self._expiries)
+            self._revoked.pop(jti, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "cached_tokens": len(self._verified),
+                "revoked_tokens": len(self._revoked),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def load_revocations(db: AsyncSession, verifier: TokenVerifier) -> int:
+    rows = (await db.execute(
+        select(RevokedTokenDB.jti, RevokedTokenDB.expires_at).where(RevokedTokenDB.expires_at > _utcnow())
+    )).all()
+    for jti, expires_at in rows:
+        verifier.revoke(jti, expires_at.replace(tzinfo=timezone.utc).timestamp())
+    return len(rows)
+
+
+class RevocationRefresher:
+    """Re-reads revoked_tokens into the verifier every ``interval`` seconds.
+
+    Revocation events only reach other instances through the postgres
+    broadcast backend, and a load that failed at startup would leave this
+    instance accepting logged-out tokens until they expire. Loading is
+    idempotent, so each pass just reads every live revocation again.
+    ``on_loaded`` is called after each successful load.
+    """
+
+    def __init__(self, session_factory, verifier: TokenVerifier, interval: float = 60.0,
+                 on_loaded: Optional[Callable[[int], None]] = None):
+        self.session_factory = session_factory
+        self.verifier = verifier
+        self.interval = interval
+        self.on_loaded = on_loaded
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as db:
+            loaded = await load_revocations(db, self.verifier)
+        if self.on_loaded:
+            self.on_loaded(loaded)
+        return loaded
+
+    async def _loop(self):
+        # Startup has just loaded them, so the first pass waits an interval.
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Token revocation refresh failed: {e}")
+
+
+async def persist_revocation(db: AsyncSession, jti: str, expires_at: float):
+    """Store a revocation and prune the ones whose tokens have expired."""
+    expires = datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
+    await db.execute(insert(RevokedTokenDB).values(jti=jti, expires_at=expires).on_conflict_do_nothing())
+    await db.execute(delete(RevokedTokenDB).where(RevokedTokenDB.expires_at <= _utcnow()))
+    await db.commit()
+
+
+def hash_password(password: str, salt: Optional[bytes] = None) -> str:
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PASSWORD_ITERATIONS)
+    return f"pbkdf2_sha256${PASSWORD_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+
+def password_matches(password: str, stored: str) -> bool:
+    try:
+        _, iterations, salt, digest = stored.split("$")
+        candidate = hashlib.pbkdf2_hmac("sha256", password.encode(), bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(candidate.hex(), digest)
+
+
+async def check_password(db: AsyncSession, password: str, default_password: str) -> bool:
+    """Check against the stored hash, or ADMIN_PASSWORD until one has been set."""
+    stored = (await db.execute(select(SettingDB.value).where(SettingDB.key == PASSWORD_SETTING))).scalar()
+    if stored is None:
+        return hmac.compare_digest(password.encode(), default_password.encode())
+    # PBKDF2 is deliberately slow; keep it off the event loop.
+    return await asyncio.to_thread(password_matches, password, stored)
+
+
+async def set_password(db: AsyncSession, password: str):
+    hashed = await asyncio.to_thread(hash_password, password)
+    await db.execute(
+        insert(SettingDB)
+        .values(key=PASSWORD_SETTING, value=hashed, updated_at=datetime.now())
+        .on_conflict_do_update(index_elements=[SettingDB.key], set_={"value": hashed, "updated_at": datetime.now()})
+    )
+    await db.commit()
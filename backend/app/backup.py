@@ -0,0 +1,111 @@
+import zlib
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, ClientDB, CaseDB, CompensationLetterDB, ExecutionDB
+from app.serialization import dumps
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BACKUP_FORMAT_VERSION = 1
+
+# Parents first, so a restore can load the tables in this order.
+BACKUP_TABLES = {
+    "clients": ClientDB,
+    "cases": CaseDB,
+    "compensation_letters": CompensationLetterDB,
+    "executions": ExecutionDB,
+}
+
+BACKUP_BATCH_SIZE = 1000
+
+# A compressed export is a compressed file, not a compressed transfer of
+# the plain one: media type and filename suffix per compression.
+COMPRESSED_FILES = {
+    "gzip": ("application/gzip", ".gz"),
+    "zstd": ("application/zstd", ".zst"),
+}
+
+
+def compression_available(compression: Optional[str]) -> bool:
+    return compression is None or compression == "gzip" or (compression == "zstd" and zstandard is not None)
+
+
+def column_names(model) -> List[str]:
+    return [str(column.name) for column in model.__table__.columns]
+
+
+async def _table_batches(db, model) -> AsyncIterator[list]:
+    result = await db.stream(
+        select(*model.__table__.columns).execution_options(yield_per=BACKUP_BATCH_SIZE)
+    )
+    async for batch in result.partitions():
+        yield batch
+
+
+async def _snapshot_session():
+    db = AsyncSessionLocal()
+    # One snapshot for every table, so rows written mid-export cannot leave
+    # e.g. a case pointing at a client that is not in the file.
+    await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return db
+
+
+async def stream_ndjson(tables: List[str]) -> AsyncIterator[bytes]:
+    """Yield a header line and then one ``{"table", "row"}`` line per row."""
+    db = await _snapshot_session()
+    try:
+        yield dumps({
+            "format": "lexcloud-backup",
+            "version": BACKUP_FORMAT_VERSION,
+            "created_at": datetime.now(),
+            "tables": tables,
+        }) + b"\n"
+        for table in tables:
+            keys = column_names(BACKUP_TABLES[table])
+            async for batch in _table_batches(db, BACKUP_TABLES[table]):
+                yield b"".join(dumps({"table": table, "row": dict(zip(keys, row))}) + b"\n" for row in batch)
+    finally:
+        await db.close()
+
+
+def _csv_field(value) -> str:
+    # NULL is an empty unquoted field and everything else is quoted, which
+    # is how Postgres COPY ... CSV tells the two apart.
+    if value is None:
+        return ""
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+async def stream_csv(table: str) -> AsyncIterator[bytes]:
+    model = BACKUP_TABLES[table]
+    db = await _snapshot_session()
+    try:
+        yield (",".join(column_names(model)) + "\n").encode("utf-8")
+        async for batch in _table_batches(db, model):
+            yield "".join(",".join(_csv_field(value) for value in row) + "\n" for row in batch).encode("utf-8")
+    finally:
+        await db.close()
+
+
+async def compress(chunks: AsyncIterator[bytes], compression: Optional[str]) -> AsyncIterator[bytes]:
+    if compression is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    else:
+        compressor = zstandard.ZstdCompressor().compressobj()
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
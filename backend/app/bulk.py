@@ -0,0 +1,182 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional, Tuple, Type
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.client_names import propagate_client_names
+from app.database import ClientDB
+
+BULK_MAX_OPERATIONS = 1000
+
+
+class BulkOperation(BaseModel):
+    op: Literal["create", "update", "delete"]
+    id: Optional[str] = None
+    version: Optional[int] = None
+    data: Dict[str, Any] = {}
+
+class BulkRequest(BaseModel):
+    operations: List[BulkOperation]
+    atomic: bool = False
+
+class BulkItemResult(BaseModel):
+    index: int
+    op: str
+    id: Optional[str] = None
+    status: str
+    version: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkResponse(BaseModel):
+    committed: bool
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+def _fail(result: BulkItemResult, status: str, detail: str):
+    result.status = status
+    result.detail = detail
+
+
+async def apply_bulk(
+    db: AsyncSession,
+    model,
+    create_schema: Type[BaseModel],
+    update_schema: Type[BaseModel],
+    request: BulkRequest
+) -> Tuple[BulkResponse, Dict[str, Any]]:
+    """Validate and apply a batch of operations in one transaction.
+
+    Client ids and target rows are each checked with a single query, the
+    target rows are locked with SELECT ... FOR UPDATE so versions cannot move
+    underneath the batch, and writes go out as one multi-row INSERT and
+    executemany UPDATEs. Failed items are reported per index; with
+    ``atomic`` any failure leaves the whole batch unapplied. Returns the
+    response and the ids that changed, keyed by change type, plus the
+    per-entity counts under "propagated" when clients were renamed.
+    """
+    if len(request.operations) > BULK_MAX_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_OPERATIONS} operations per request")
+
+    results: List[BulkItemResult] = []
+    payloads: List[Dict[str, Any]] = []
+    versions: List[Optional[int]] = []
+    seen_ids = set()
+
+    for index, operation in enumerate(request.operations):
+        result = BulkItemResult(index=index, op=operation.op, id=operation.id, status="ok")
+        results.append(result)
+        payload: Dict[str, Any] = {}
+        version = operation.version
+        try:
+            if operation.op == "create":
+                payload = create_schema(**operation.data).dict()
+            elif operation.op == "update":
+                parsed = update_schema(**operation.data)
+                payload = parsed.dict(exclude_unset=True, exclude={"version"})
+                if version is None:
+                    version = parsed.version
+        except ValidationError as e:
+            _fail(result, "invalid", str(e))
+        payloads.append(payload)
+        versions.append(version)
+
+        if result.status == "ok" and operation.op != "create":
+            if not operation.id:
+                _fail(result, "invalid", "id is required")
+            elif operation.id in seen_ids:
+                _fail(result, "invalid", "id appears more than once in the batch")
+            else:
+                seen_ids.add(operation.id)
+
+    client_names: Dict[str, str] = {}
+    if hasattr(model, "client_id"):
+        client_ids = {
+            payload["client_id"] for result, payload in zip(results, payloads)
+            if result.status == "ok" and payload.get("client_id")
+        }
+        if client_ids:
+            rows = await db.execute(
+                select(ClientDB.id, ClientDB.name).where(ClientDB.id.in_(client_ids), ClientDB.is_deleted == False)
+            )
+            client_names = dict(rows.all())
+        for result, payload in zip(results, payloads):
+            if result.status == "ok" and "client_id" in payload and payload["client_id"] not in client_names:
+                _fail(result, "invalid", "Invalid client ID")
+
+    current_versions: Dict[str, int] = {}
+    target_ids = [result.id for result in results if result.status == "ok" and result.op != "create"]
+    if target_ids:
+        rows = await db.execute(
+            select(model.id, model.version)
+            .where(model.id.in_(target_ids), model.is_deleted == False)
+            .with_for_update()
+        )
+        current_versions = dict(rows.all())
+    for result, version in zip(results, versions):
+        if result.status != "ok" or result.op == "create":
+            continue
+        if result.id not in current_versions:
+            _fail(result, "not_found", "Not found")
+        elif version is not None and version != current_versions[result.id]:
+            _fail(result, "conflict", "Version conflict. Please refresh and try again.")
+
+    failed = sum(1 for result in results if result.status != "ok")
+    if request.atomic and failed:
+        await db.rollback()
+        for result in results:
+            if result.status == "ok":
+                result.status = "skipped"
+        return BulkResponse(committed=False, succeeded=0, failed=failed, results=results), {}
+
+    now = datetime.now()
+    inserts, updates, deletes = [], [], []
+    changes: Dict[str, Any] = {"create": [], "update": [], "delete": []}
+    for result, payload in zip(results, payloads):
+        if result.status != "ok":
+            continue
+        if "client_id" in payload:
+            payload["client_name"] = client_names[payload["client_id"]]
+        if result.op == "create":
+            result.id = str(uuid.uuid4())
+            result.version = 1
+            inserts.append({
+                **payload,
+                "id": result.id,
+                "created_at": now,
+                "updated_at": now,
+                "version": 1,
+                "is_deleted": False
+            })
+        elif result.op == "update":
+            result.version = current_versions[result.id] + 1
+            updates.append({**payload, "id": result.id, "updated_at": now, "version": result.version})
+        else:
+            deletes.append({"id": result.id, "is_deleted": True, "updated_at": now})
+        changes[result.op].append(result.id)
+
+    try:
+        if inserts:
+            await db.execute(insert(model), inserts)
+        if updates:
+            await db.execute(update(model), updates)
+        if deletes:
+            await db.execute(update(model), deletes)
+        if model is ClientDB:
+            renamed = [row["id"] for row in updates if "name" in row]
+            if renamed:
+                propagated = await propagate_client_names(db, renamed, now)
+                if propagated:
+                    changes["propagated"] = propagated
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        print(f"Error applying bulk {model.__tablename__} operations: {e}")
+        raise HTTPException(status_code=500, detail="Failed to apply bulk operations")
+
+    return BulkResponse(committed=True, succeeded=len(results) - failed, failed=failed, results=results), changes
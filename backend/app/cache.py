@@ -0,0 +1,86 @@
+import asyncio
+import time
+import uuid
+from datetime import date
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+class DashboardCache:
+    """In-process snapshot of the dashboard payload.
+
+    A snapshot is served until its TTL runs out, the calendar day changes
+    (reminder ``days_until`` values are relative to today) or a data change
+    invalidates it. Concurrent misses share a single rebuild. Each cached
+    snapshot gets its own ETag, so clients revalidating against an
+    unchanged snapshot can be answered without re-encoding it.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic,
+                 today: Callable[[], date] = date.today):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._today = today
+        self._lock = asyncio.Lock()
+        self._snapshot: Optional[Any] = None
+        self._expires_at = 0.0
+        self._day: Optional[date] = None
+        self._generation = 0
+        self._tag: Optional[str] = None
+        self._tag_prefix = uuid.uuid4().hex[:8]
+        self._builds = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _fresh(self) -> bool:
+        return (
+            self._snapshot is not None
+            and self._clock() < self._expires_at
+            and self._day == self._today()
+        )
+
+    async def get(self, loader: Callable[[], Awaitable[Any]]) -> Any:
+        snapshot, _ = await self.get_tagged(loader)
+        return snapshot
+
+    async def get_tagged(self, loader: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        """The snapshot and its ETag; the tag is None for a build that was
+        invalidated while it ran and so is not cached."""
+        if self._fresh():
+            self.hits += 1
+            return self._snapshot, self._tag
+
+        async with self._lock:
+            if self._fresh():
+                self.hits += 1
+                return self._snapshot, self._tag
+
+            self.misses += 1
+            generation = self._generation
+            day = self._today()
+            snapshot = await loader()
+            if generation != self._generation:
+                return snapshot, None
+            self._builds += 1
+            self._snapshot = snapshot
+            self._tag = f'W/"dashboard-{self._tag_prefix}-{self._builds}"'
+            self._day = day
+            self._expires_at = self._clock() + self.ttl_seconds
+            return snapshot, self._tag
+
+    def invalidate(self, *_args) -> None:
+        self._generation += 1
+        self._snapshot = None
+        self._tag = None
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+            "cached": self._fresh(),
+        }
@@ -0,0 +1,150 @@
+import asyncio
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import ClientDB, CaseDB, CompensationLetterDB, ExecutionDB
+
+# Tables carrying a copy of clients.name, keyed by change event entity type.
+DENORMALIZED_MODELS = {
+    "case": CaseDB,
+    "execution": ExecutionDB,
+    "compensation_letter": CompensationLetterDB,
+}
+
+
+async def propagate_client_names(db: AsyncSession, client_ids: List[str], now: datetime) -> Dict[str, int]:
+    """Copy the current names of ``client_ids`` into every dependent row.
+
+    Issues one UPDATE ... FROM clients per table, in the caller's
+    transaction and after the clients themselves have been updated. Both
+    updated_at and version are bumped, like any other edit of the row, so
+    clients that cache rows by version pick up the new name; an open edit
+    of one of those rows gets a version conflict. Returns the number of
+    rows changed per entity type.
+    """
+    changed = {}
+    for entity_type, model in DENORMALIZED_MODELS.items():
+        result = await db.execute(
+            update(model)
+            .where(
+                model.client_id.in_(client_ids),
+                model.client_id == ClientDB.id,
+                model.client_name.is_distinct_from(ClientDB.name)
+            )
+            .values(client_name=ClientDB.name, updated_at=now, version=model.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            changed[entity_type] = result.rowcount
+    return changed
+
+
+async def reconcile_chunk(db: AsyncSession, model, after_id: str, chunk_size: int) -> Tuple[Optional[str], int]:
+    """Repair drifted names among the next ``chunk_size`` rows by id.
+
+    Walking the primary key keeps each statement bounded to one chunk, and
+    committing per chunk keeps row locks short. Returns the last id seen
+    (None once the table is exhausted) and the number of rows repaired.
+    """
+    ids = (await db.execute(
+        select(model.id).where(model.id > after_id).order_by(model.id).limit(chunk_size)
+    )).scalars().all()
+    if not ids:
+        return None, 0
+    result = await db.execute(
+        update(model)
+        .where(
+            model.id > after_id,
+            model.id <= ids[-1],
+            model.client_id == ClientDB.id,
+            model.client_name.is_distinct_from(ClientDB.name)
+        )
+        .values(client_name=ClientDB.name, updated_at=datetime.now(), version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return ids[-1], result.rowcount
+
+
+# Key of the transaction-level advisory lock a reconciliation pass holds.
+RECONCILE_LOCK_KEY = 0x6C6578636C6E  # "lexcln"
+
+
+class ClientNameReconciler:
+    """Periodically repairs client_name copies that drifted from clients.name.
+
+    The first pass waits ``initial_delay`` seconds, so a cold start is not
+    slowed down by it, and each pass holds an advisory lock: when several
+    instances are running, only one of them reconciles at a time and the
+    others skip that pass.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        on_repaired: Callable[[str, int], Awaitable[None]],
+        interval: float = 3600.0,
+        chunk_size: int = 1000,
+        pause: float = 0.1,
+        initial_delay: float = 300.0
+    ):
+        self.session_factory = session_factory
+        self.on_repaired = on_repaired
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.initial_delay = initial_delay
+        self.last_run: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run_once(self) -> Optional[Dict[str, int]]:
+        """Reconcile every table; None when another instance holds the lock."""
+        # The lock lives in its own transaction, kept open for the whole
+        # pass and released by closing it, even if the pass fails.
+        async with self.session_factory() as lock_db:
+            if not await lock_db.scalar(select(func.pg_try_advisory_xact_lock(RECONCILE_LOCK_KEY))):
+                return None
+            return await self._reconcile()
+
+    async def _reconcile(self) -> Dict[str, int]:
+        repaired = {}
+        for entity_type, model in DENORMALIZED_MODELS.items():
+            total = 0
+            after_id = ""
+            while after_id is not None:
+                async with self.session_factory() as db:
+                    after_id, fixed = await reconcile_chunk(db, model, after_id, self.chunk_size)
+                total += fixed
+                await asyncio.sleep(self.pause)
+            repaired[entity_type] = total
+            if total:
+                await self.on_repaired(entity_type, total)
+        self.last_run = repaired
+        return repaired
+
+    async def _loop(self):
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            try:
+                repaired = await self.run_once()
+                if repaired and any(repaired.values()):
+                    print(f"Repaired drifted client names: {repaired}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Client name reconciliation failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,261 @@
+import inspect
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from pydantic import BaseModel
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import QueryableAttribute
+
+from app.database import ClientDB
+from app.etag import collection_etag, etag_matches, not_modified, row_etag, tag_response
+from app.pagination import NEXT_CURSOR_HEADER, keyset_query, next_cursor
+from app.serialization import FastJSONResponse, projection, rows_as_dicts
+
+
+# Always returned by a sparse list: row identity, the keyset cursor and the
+# version an edit has to send back.
+REQUIRED_FIELDS = ("id", "updated_at", "version")
+
+
+def list_response(rows, next_page: Optional[str] = None) -> FastJSONResponse:
+    headers = {NEXT_CURSOR_HEADER: next_page} if next_page else None
+    return FastJSONResponse(rows_as_dicts(rows), headers=headers)
+
+
+class CrudResource:
+    """Create/list/get/update/delete routes for one soft-deleted, versioned model.
+
+    Everything that does not depend on the request is worked out once, when
+    the resource is built: the column projection every route returns, the
+    WHERE clause for each list filter, whether rows carry a denormalized
+    client_name, and the list endpoint's query parameters. Each route then
+    costs a single statement plus, when a client_id is written, one lookup of
+    the client's name. Writes use INSERT/UPDATE ... RETURNING, so nothing is
+    loaded into the session and nothing is read back after the commit.
+    Lists and single rows carry an ETag; a list's is built from the ids and
+    versions of the rows on the page, and a matching If-None-Match is
+    answered with 304 without encoding them.
+
+    ``filters`` maps query parameter names to a column (equality) or to a
+    callable building the clause from the value. ``prepare`` may add derived
+    values before a create or update; ``after_update`` runs in the update's
+    transaction and returns extra data for the change event.
+
+    Lists accept ``fields=``, a comma-separated list of schema fields, where
+    ``summary`` stands for the ``summary`` preset (every field when none is
+    given). Only those columns are selected and encoded; without ``fields``
+    the list returns full rows as before.
+    """
+
+    def __init__(
+        self,
+        model,
+        schema: Type[BaseModel],
+        create_schema: Type[BaseModel],
+        update_schema: Type[BaseModel],
+        entity_type: str,
+        label: str,
+        filters: Optional[Dict[str, Any]] = None,
+        prepare: Optional[Callable[[Dict[str, Any]], None]] = None,
+        after_update: Optional[Callable[[AsyncSession, str, Dict[str, Any], datetime], Awaitable[dict]]] = None,
+        summary: Optional[Sequence[str]] = None
+    ):
+        self.model = model
+        self.schema = schema
+        self.create_schema = create_schema
+        self.update_schema = update_schema
+        self.entity_type = entity_type
+        self.label = label
+        self.prepare = prepare
+        self.after_update = after_update
+        self.columns = projection(schema, model)
+        self.field_columns = dict(zip(schema.model_fields, self.columns))
+        self.summary = tuple(summary or schema.model_fields)
+        unknown = set(self.summary) - set(self.field_columns)
+        if unknown:
+            raise ValueError(f"Unknown summary fields for {entity_type}: {', '.join(sorted(unknown))}")
+        self.has_client = hasattr(model, "client_id")
+        self.filters = {
+            name: (lambda value, column=clause: column == value) if isinstance(clause, QueryableAttribute) else clause
+            for name, clause in (filters or {}).items()
+        }
+        self.active = model.is_deleted == False
+        self.list_query = select(*self.columns).where(self.active)
+
+    async def _client_name(self, db: AsyncSession, client_id: Optional[str]) -> str:
+        name = await db.scalar(select(ClientDB.name).where(ClientDB.id == client_id, ClientDB.is_deleted == False))
+        if name is None:
+            raise HTTPException(status_code=400, detail="Invalid client ID")
+        return name
+
+    def select_fields(self, fields: Optional[str]) -> List:
+        """Columns for a ``fields=`` value, in schema order; all of them for None."""
+        if not fields:
+            return self.columns
+        names = set(REQUIRED_FIELDS)
+        for name in (name.strip() for name in fields.split(",")):
+            if name == "summary":
+                names.update(self.summary)
+            elif name in self.field_columns:
+                names.add(name)
+            elif name:
+                raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        return [column for field, column in self.field_columns.items() if field in names]
+
+    async def page_rows(self, db: AsyncSession, filters: Dict[str, Optional[str]], page: int, limit: int,
+                        cursor: Optional[str], fields: Optional[str] = None) -> Tuple[Sequence, Optional[str]]:
+        """One page of rows and the cursor for the next, if any."""
+        query = select(*self.select_fields(fields)).where(self.active) if fields else self.list_query
+        for name, value in filters.items():
+            if value:
+                query = query.where(self.filters[name](value))
+        if cursor is not None:
+            result = await db.execute(keyset_query(query, self.model, cursor, limit))
+            return next_cursor(result.all(), limit)
+        offset = (page - 1) * limit
+        result = await db.execute(query.order_by(self.model.updated_at.desc()).offset(offset).limit(limit))
+        return result.all(), None
+
+    async def fetch_page(self, db: AsyncSession, filters: Dict[str, Optional[str]], page: int, limit: int,
+                         cursor: Optional[str], fields: Optional[str] = None):
+        return list_response(*await self.page_rows(db, filters, page, limit, cursor, fields))
+
+    async def fetch(self, db: AsyncSession, item_id: str, if_none_match: Optional[str] = None):
+        row = (await db.execute(select(*self.columns).where(self.model.id == item_id, self.active))).first()
+        if row is None:
+            raise HTTPException(status_code=404, detail=f"{self.label} not found")
+        etag = row_etag(row.version, row.updated_at)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return tag_response(FastJSONResponse(row._asdict()), etag)
+
+    async def create(self, db: AsyncSession, item: BaseModel, broadcast):
+        item_id = str(uuid.uuid4())
+        now = datetime.now()
+        values = item.dict()
+        if self.has_client:
+            values["client_name"] = await self._client_name(db, values["client_id"])
+        if self.prepare:
+            self.prepare(values)
+        values.update(id=item_id, created_at=now, updated_at=now, version=1, is_deleted=False)
+
+        try:
+            row = (await db.execute(insert(self.model).values(values).returning(*self.columns))).one()
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"Error creating {self.entity_type}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to create {self.label.lower()}")
+
+        created = row._asdict()
+        await broadcast("create", self.entity_type, item_id, created)
+        print(f"{self.label} created successfully: {item_id}")
+        return FastJSONResponse(created)
+
+    async def update(self, db: AsyncSession, item_id: str, item: BaseModel, broadcast):
+        now = datetime.now()
+        values = item.dict(exclude_unset=True, exclude={"version"})
+        if self.has_client and "client_id" in values:
+            values["client_name"] = await self._client_name(db, values["client_id"])
+        if self.prepare:
+            self.prepare(values)
+        values.update(updated_at=now, version=self.model.version + 1)
+
+        statement = update(self.model).where(self.model.id == item_id, self.active)
+        if item.version is not None:
+            statement = statement.where(self.model.version == item.version)
+        try:
+            row = (await db.execute(statement.values(values).returning(*self.columns))).first()
+            if row is None:
+                current = await db.scalar(select(self.model.version).where(self.model.id == item_id, self.active))
+                await db.rollback()
+                if current is None:
+                    raise HTTPException(status_code=404, detail=f"{self.label} not found")
+                raise HTTPException(status_code=409, detail="Version conflict. Please refresh and try again.")
+            extra = await self.after_update(db, item_id, values, now) if self.after_update else {}
+            await db.commit()
+        except HTTPException:
+            raise
+        except Exception as e:
+            await db.rollback()
+            print(f"Error updating {self.entity_type} {item_id}: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to update {self.label.lower()}")
+
+        updated = row._asdict()
+        await broadcast("update", self.entity_type, item_id, {**updated, **extra})
+        print(f"{self.label} updated successfully: {item_id}")
+        return FastJSONResponse(updated)
+
+    async def delete(self, db: AsyncSession, item_id: str, broadcast):
+        deleted = await db.scalar(
+            update(self.model)
+            .where(self.model.id == item_id, self.active)
+            .values(is_deleted=True, updated_at=datetime.now())
+            .returning(self.model.id)
+        )
+        if deleted is None:
+            raise HTTPException(status_code=404, detail=f"{self.label} not found")
+        await db.commit()
+        await broadcast("delete", self.entity_type, item_id, {})
+        return {"message": f"{self.label} deleted successfully"}
+
+    def router(self, prefix: str, get_db, verify_token, broadcast) -> APIRouter:
+        """Build the routes under ``prefix`` (e.g. ``/api/cases``)."""
+        router = APIRouter(prefix=prefix)
+        resource = self
+        create_schema, update_schema = self.create_schema, self.update_schema
+
+        async def list_items(
+            request: Request, page: int, limit: int, cursor: Optional[str], fields: Optional[str],
+            db: AsyncSession, token: str, **filters
+        ):
+            # The validator is checked before the rows are encoded, so a
+            # matching request costs the page query and nothing else.
+            rows, next_page = await resource.page_rows(db, filters, page, limit, cursor, fields)
+            etag = collection_etag(resource.entity_type, rows, request.query_params)
+            if etag_matches(request.headers.get("if-none-match"), etag):
+                return not_modified(etag)
+            return tag_response(list_response(rows, next_page), etag)
+
+        # FastAPI reads query parameters from the signature, so the filter
+        # parameters are spliced in here rather than accepted as **kwargs.
+        list_items.__signature__ = inspect.Signature(
+            [
+                inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ] + [
+                inspect.Parameter(name, inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[str])
+                for name in self.filters
+            ] + [
+                inspect.Parameter("page", inspect.Parameter.KEYWORD_ONLY, default=Query(1, ge=1), annotation=int),
+                inspect.Parameter("limit", inspect.Parameter.KEYWORD_ONLY, default=Query(1000, ge=1, le=10000), annotation=int),
+                inspect.Parameter("cursor", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[str]),
+                inspect.Parameter("fields", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[str]),
+                inspect.Parameter("db", inspect.Parameter.KEYWORD_ONLY, default=Depends(get_db), annotation=AsyncSession),
+                inspect.Parameter("token", inspect.Parameter.KEYWORD_ONLY, default=Depends(verify_token), annotation=str),
+            ]
+        )
+        router.add_api_route("", list_items, methods=["GET"], response_model=list[self.schema])
+
+        @router.post("", response_model=self.schema)
+        async def create_item(item: create_schema, db: AsyncSession = Depends(get_db), token: str = Depends(verify_token)):
+            return await resource.create(db, item, broadcast)
+
+        @router.get("/{item_id}", response_model=self.schema)
+        async def get_item(
+            item_id: str, if_none_match: Optional[str] = Header(None),
+            db: AsyncSession = Depends(get_db), token: str = Depends(verify_token)
+        ):
+            return await resource.fetch(db, item_id, if_none_match)
+
+        @router.put("/{item_id}", response_model=self.schema)
+        async def update_item(item_id: str, item: update_schema, db: AsyncSession = Depends(get_db), token: str = Depends(verify_token)):
+            return await resource.update(db, item_id, item, broadcast)
+
+        @router.delete("/{item_id}")
+        async def delete_item(item_id: str, db: AsyncSession = Depends(get_db), token: str = Depends(verify_token)):
+            return await resource.delete(db, item_id, broadcast)
+
+        return router
@@ -1,10 +1,14 @@
-from sqlalchemy import create_engine, Column, String, DateTime, Date, Integer, Text, Boolean
+from sqlalchemy import create_engine, Column, String, DateTime, Date, Integer, Text, Boolean, Index, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.sql import func
 import os
 from datetime import datetime, date
 
+from app.pool import PoolConfig, PoolStats, instrumented
+
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
@@ -18,23 +22,37 @@ if DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
 
+pool_config = PoolConfig(DATABASE_URL)
+
 engine = create_engine(
     DATABASE_URL,
     echo=False,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_pre_ping=True,
-    pool_recycle=3600,
     connect_args={
         "application_name": "lexcloud-backend"
-    }
+    },
+    **pool_config.engine_kwargs()
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+ASYNC_DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1)
+
+async_pool_stats = PoolStats()
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=False,
+    poolclass=instrumented(AsyncAdaptedQueuePool, async_pool_stats),
+    connect_args=pool_config.connect_args(),
+    **pool_config.engine_kwargs()
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 class ClientDB(Base):
     __tablename__ = "clients"
+    __table_args__ = (
+        Index("idx_clients_updated_at_id_active", "updated_at", "id", postgresql_where=text("is_deleted = false")),
+        Index("idx_clients_updated_at_id", "updated_at", "id"),
+    )
     
     id = Column(String, primary_key=True)
     name = Column(String, nullable=False)
@@ -50,6 +68,15 @@ class ClientDB(Base):
 
 class CaseDB(Base):
     __tablename__ = "cases"
+    __table_args__ = (
+        Index("idx_cases_reminder_date_active", "reminder_date", postgresql_where=text("is_deleted = false AND reminder_date IS NOT NULL")),
+        Index("idx_cases_next_hearing_date_active", "next_hearing_date", postgresql_where=text("is_deleted = false AND next_hearing_date IS NOT NULL")),
+        Index("idx_cases_status_active", "status", postgresql_where=text("is_deleted = false")),
+        Index("idx_cases_updated_at_id_active", "updated_at", "id", postgresql_where=text("is_deleted = false")),
+        Index("idx_cases_updated_at_id", "updated_at", "id"),
+        Index("idx_cases_status_updated_at_active", "status", "updated_at", postgresql_where=text("is_deleted = false")),
+        Index("idx_cases_client_id", "client_id"),
+    )
     
     id = Column(String, primary_key=True)
     title = Column(String, nullable=False)
@@ -76,6 +103,13 @@ class CaseDB(Base):
 
 class CompensationLetterDB(Base):
     __tablename__ = "compensation_letters"
+    __table_args__ = (
+        Index("idx_compensation_letters_reminder_date_active", "reminder_date", postgresql_where=text("is_deleted = false AND reminder_date IS NOT NULL")),
+        Index("idx_compensation_letters_updated_at_id_active", "updated_at", "id", postgresql_where=text("is_deleted = false")),
+        Index("idx_compensation_letters_updated_at_id", "updated_at", "id"),
+        Index("idx_compensation_letters_status_updated_at_active", "status", "updated_at", postgresql_where=text("is_deleted = false")),
+        Index("idx_compensation_letters_client_id", "client_id"),
+    )
     
     id = Column(String, primary_key=True)
     title = Column(String, nullable=False)
@@ -100,6 +134,13 @@ class CompensationLetterDB(Base):
 
 class ExecutionDB(Base):
     __tablename__ = "executions"
+    __table_args__ = (
+        Index("idx_executions_reminder_date_active", "reminder_date", postgresql_where=text("is_deleted = false AND reminder_date IS NOT NULL")),
+        Index("idx_executions_updated_at_id_active", "updated_at", "id", postgresql_where=text("is_deleted = false")),
+        Index("idx_executions_updated_at_id", "updated_at", "id"),
+        Index("idx_executions_status_updated_at_active", "status", "updated_at", postgresql_where=text("is_deleted = false")),
+        Index("idx_executions_client_id", "client_id"),
+    )
     
     id = Column(String, primary_key=True)
     client_id = Column(String, nullable=False)
@@ -122,6 +163,23 @@ class ExecutionDB(Base):
     version = Column(Integer, default=1)
     is_deleted = Column(Boolean, default=False)
 
+class RevokedTokenDB(Base):
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("idx_revoked_tokens_expires_at", "expires_at"),
+    )
+    
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, default=func.now())
+
+class SettingDB(Base):
+    __tablename__ = "app_settings"
+    
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=False)
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
 def get_db():
     db = SessionLocal()
     try:
@@ -129,6 +187,10 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 def create_tables():
     Base.metadata.create_all(bind=engine)
 
@@ -0,0 +1,54 @@
+import hashlib
+from datetime import datetime
+from typing import Optional, Sequence
+
+from fastapi import Response
+
+# Clients may keep a copy but must revalidate it before every use.
+CACHE_CONTROL = "no-cache"
+
+
+def collection_etag(entity_type: str, rows: Sequence, params) -> str:
+    """Validator for one list response.
+
+    Built from the rows on the page: each one's id, version and
+    ``updated_at``. Every write bumps a row's version or moves its
+    ``updated_at`` (soft delete), so the tag changes whenever a row on the
+    page changes, joins it or leaves it, however late the write commits or
+    whatever timestamp it carries. The query parameters are folded in so a
+    different field selection gets its own tag. Weak, because GZip may
+    re-encode the body.
+    """
+    digest = hashlib.sha1(entity_type.encode("utf-8"))
+    digest.update("&".join(f"{name}={value}" for name, value in sorted(params.multi_items())).encode("utf-8"))
+    for row in rows:
+        stamp = row.updated_at.isoformat() if row.updated_at else ""
+        digest.update(f"\n{row.id}|{row.version}|{stamp}".encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:20]}"'
+
+
+def row_etag(version: int, updated_at: datetime) -> str:
+    """Validator for one row: ``version`` plus ``updated_at``, which also
+    moves on writes that keep the version, such as a soft delete."""
+    return f'W/"{version}-{updated_at.isoformat()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+
+
+def tag_response(response: Response, etag: Optional[str]) -> Response:
+    if etag:
+        response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
@@ -1,37 +1,79 @@
-from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, Query
+from app.startup import StartupReport, check_schema, startup_mode, warm_pool
+from fastapi import FastAPI, HTTPException, Depends, Header, WebSocket, WebSocketDisconnect, Query, Request, Response
 from fastapi.security import HTTPBearer
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any, Set
-from datetime import datetime, date
-import json
-import uuid
+from typing import List, Optional, Dict, Any
+from datetime import datetime, date, timedelta
 import jwt
 import os
 import asyncio
-import threading
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import text, Index, ForeignKey, or_
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, or_, select, func
 import logging
-from app.database import get_db, create_tables, ClientDB, CaseDB, CompensationLetterDB, ExecutionDB
+from app.database import DATABASE_URL, engine, async_engine, async_pool_stats, pool_config, get_async_db, AsyncSessionLocal, ClientDB, CaseDB, CompensationLetterDB, ExecutionDB
+from app.auth import RevocationRefresher, TokenVerifier, check_password, persist_revocation, set_password
+from app.backup import BACKUP_TABLES, COMPRESSED_FILES, compress, compression_available, stream_csv, stream_ndjson
+from app.bulk import BulkRequest, BulkResponse, apply_bulk
+from app.cache import DashboardCache
+from app.client_names import ClientNameReconciler, propagate_client_names
+from app.crud import CrudResource, list_response
+from app.etag import etag_matches, not_modified, tag_response
+from app.realtime import ConnectionManager, PostgresBroadcastBackend
+from app.reminders import ReminderScheduler
+from app.pagination import NEXT_CURSOR_HEADER
+from app.metrics import CONTENT_TYPE, Counter, CumulativeHistogram, Gauge, Histogram, Registry, RequestMetrics, instrument_engine, scrape_authorized
+from app.pool import pool_status
+from app.query_stats import QueryStatsConfig, QueryStatsMiddleware, QueryStatsRecorder
+from app.restore import restore_backup
+from app.search import apply_case_search, escape_like
+from app.sync import SYNC_GRACE, decode_sync_token, encode_sync_token, changes_probe, changes_query, advance_position, sync_row
 from dotenv import load_dotenv
 
 load_dotenv()
 
 app = FastAPI(title="LexCloud API", version="1.0.0")
 
+startup_report = StartupReport(startup_mode())
+POOL_WARMUP_CONNECTIONS = int(os.getenv("POOL_WARMUP_CONNECTIONS", "2"))
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+metrics = Registry()
+request_duration = metrics.register(Histogram(
+    "lexcloud_http_request_duration_seconds", "HTTP request latency by route template and status",
+    ["method", "route", "status"]
+))
+requests_in_flight = metrics.register(Gauge("lexcloud_http_requests_in_flight", "HTTP requests being served"))
+query_duration = metrics.register(Histogram(
+    "lexcloud_db_query_duration_seconds", "Database statement latency; the count is the number of queries",
+    ["statement"]
+))
+query_errors = metrics.register(Counter("lexcloud_db_query_errors", "Database statements that raised", ["statement"]))
+broadcast_fanout = metrics.register(Histogram(
+    "lexcloud_broadcast_fanout_duration_seconds", "Time to serialize a change event and queue it for every socket",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+))
+
+query_stats = QueryStatsRecorder(QueryStatsConfig())
+app.add_middleware(QueryStatsMiddleware, recorder=query_stats)
+# Outermost, so the latency includes compression and CORS handling.
+app.add_middleware(RequestMetrics, duration=request_duration, in_flight=requests_in_flight)
+instrument_engine(async_engine.sync_engine, query_duration, query_errors, observers=[query_stats.observe])
+instrument_engine(engine, query_duration, query_errors, observers=[query_stats.observe])
+
 @app.on_event("startup")
 async def startup_event():
     print("Initializing database on startup...")
@@ -54,31 +96,54 @@ async def startup_event():
         print("❌ DATABASE_URL not set!")
         raise ValueError("DATABASE_URL environment variable is required")
     
-    try:
-        create_tables()
-        print("✅ Database tables created successfully")
-    except Exception as table_error:
-        print(f"⚠️ Table creation failed: {table_error}")
-        print("✅ Backend starting without table creation - tables may already exist")
+    startup_report.mark("import")
     
-    try:
-        from app.database import engine
-        from sqlalchemy.orm import sessionmaker
-        from sqlalchemy import text
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-        with SessionLocal() as db:
-            try:
-                db.execute(text("SELECT custody_no FROM clients LIMIT 1"))
-                print("✅ custody_no column already exists")
-            except Exception:
-                print("🔧 Adding custody_no column to clients table...")
-                db.execute(text("ALTER TABLE clients ADD COLUMN custody_no VARCHAR"))
-                db.commit()
-                print("✅ Successfully added custody_no column")
-    except Exception as migration_error:
-        print(f"⚠️ Migration error: {migration_error}")
+    async def load_token_revocations():
+        revoked = await revocation_refresher.run_once()
+        print(f"✅ Loaded {revoked} token revocations")
+    
+    async def timed(name, step, required=True):
+        async with startup_report.phase(name, required):
+            await step()
     
-    print("✅ Backend startup completed - table creation and migration completed")
+    # The phases are independent and run concurrently. Fast mode leaves out
+    # the schema check, since deploys migrate in the release command, and
+    # leaves the reminder index to the scheduler's first pass, which the
+    # dashboard waits on if it gets there first. For the same reason the
+    # reminder index is optional; a failure in any other phase keeps /ready
+    # failing.
+    phases = [
+        timed("pool_warmup", lambda: warm_pool(async_engine, POOL_WARMUP_CONNECTIONS)),
+        timed("token_revocations", load_token_revocations),
+    ]
+    if startup_report.mode == "full":
+        phases.append(timed("schema_check", lambda: check_schema(async_engine)))
+        phases.append(timed("reminder_index", reminder_scheduler.ensure_loaded, required=False))
+    await asyncio.gather(*phases)
+    
+    if broadcast_backend is not None:
+        broadcast_backend.start()
+        print(f"✅ Relaying change events over LISTEN/NOTIFY channel {broadcast_backend.channel}")
+    
+    if CLIENT_NAME_RECONCILE_INTERVAL > 0:
+        client_name_reconciler.start()
+    
+    reminder_scheduler.start()
+
+    if revocation_refresher.interval > 0:
+        revocation_refresher.start()
+
+    startup_report.finish()
+    print(f"✅ Backend startup completed in {startup_report.total_ms} ms ({startup_report.mode} mode)")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await reminder_scheduler.stop()
+    await client_name_reconciler.stop()
+    await revocation_refresher.stop()
+    if broadcast_backend is not None:
+        await broadcast_backend.stop()
 
 
 class Client(BaseModel):
@@ -88,7 +153,7 @@ class Client(BaseModel):
     phone: str
     address: str
     tax_id: Optional[str] = None
-    custody_no: Optional[str] = None
+    vekalet_ofis_no: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     version: int
@@ -99,7 +164,7 @@ class ClientCreate(BaseModel):
     phone: str
     address: str
     tax_id: Optional[str] = None
-    custody_no: Optional[str] = None
+    vekalet_ofis_no: Optional[str] = None
 
 class ClientUpdate(BaseModel):
     name: Optional[str] = None
@@ -107,7 +172,7 @@ class ClientUpdate(BaseModel):
     phone: Optional[str] = None
     address: Optional[str] = None
     tax_id: Optional[str] = None
-    custody_no: Optional[str] = None
+    vekalet_ofis_no: Optional[str] = None
     version: int
 
 class Case(BaseModel):
@@ -128,7 +193,7 @@ class Case(BaseModel):
     reminder_date: Optional[date] = None
     office_archive_no: str
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     version: int
@@ -149,7 +214,7 @@ class CaseCreate(BaseModel):
     reminder_date: Optional[date] = None
     office_archive_no: str
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
 
 class CaseUpdate(BaseModel):
     title: Optional[str] = None
@@ -167,7 +232,7 @@ class CaseUpdate(BaseModel):
     reminder_date: Optional[date] = None
     office_archive_no: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
     version: Optional[int] = None
 
 class CompensationLetter(BaseModel):
@@ -187,7 +252,7 @@ class CompensationLetter(BaseModel):
     reminder_text: Optional[str] = None
     responsible_person: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     version: int
@@ -205,7 +270,7 @@ class CompensationLetterCreate(BaseModel):
     reminder_date: Optional[date] = None
     reminder_text: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
 
 class CompensationLetterUpdate(BaseModel):
     client_id: Optional[str] = None
@@ -220,7 +285,7 @@ class CompensationLetterUpdate(BaseModel):
     reminder_date: Optional[date] = None
     reminder_text: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
     version: Optional[int] = None
 
 class Execution(BaseModel):
@@ -239,7 +304,7 @@ class Execution(BaseModel):
     notes: Optional[str] = None
     haciz_durumu: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     version: int
@@ -258,7 +323,7 @@ class ExecutionCreate(BaseModel):
     notes: Optional[str] = None
     haciz_durumu: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
 
 class ExecutionUpdate(BaseModel):
     client_id: Optional[str] = None
@@ -274,93 +339,66 @@ class ExecutionUpdate(BaseModel):
     notes: Optional[str] = None
     haciz_durumu: Optional[str] = None
     responsible_person: Optional[str] = None
-    commisioner: Optional[str] = None
+    görevlendiren: Optional[str] = None
     version: Optional[int] = None
 
-def db_to_pydantic_client(db_client: ClientDB) -> Client:
-    return Client(
-        id=db_client.id,
-        name=db_client.name,
-        email=db_client.email,
-        phone=db_client.phone,
-        address=db_client.address,
-        tax_id=db_client.tax_id,
-        custody_no=db_client.custody_no,
-        created_at=db_client.created_at,
-        updated_at=db_client.updated_at,
-        version=db_client.version
-    )
+async def propagate_renamed_client(db: AsyncSession, client_id: str, values: Dict[str, Any], now: datetime) -> dict:
+    # One event covers the client and every row that took its new name;
+    # "propagated" tells listeners which other entity types changed.
+    if "name" not in values:
+        return {"propagated": {}}
+    return {"propagated": await propagate_client_names(db, [client_id], now)}
+
+def compensation_letter_title(values: Dict[str, Any]):
+    if "bank" in values or "letter_number" in values:
+        values["title"] = func.concat(
+            values.get("bank", CompensationLetterDB.bank), " - ", values.get("letter_number", CompensationLetterDB.letter_number)
+        )
 
-def db_to_pydantic_case(db_case: CaseDB) -> Case:
-    return Case(
-        id=db_case.id,
-        title=db_case.title,
-        case_name=db_case.case_name,
-        description=db_case.description,
-        client_id=db_case.client_id,
-        client_name=db_case.client_name,
-        case_type=db_case.case_type,
-        status=db_case.status,
-        court=db_case.court,
-        case_number=db_case.case_number,
-        defendant=db_case.defendant,
-        notes=db_case.notes,
-        start_date=db_case.start_date,
-        next_hearing_date=db_case.next_hearing_date,
-        reminder_date=db_case.reminder_date,
-        office_archive_no=db_case.office_archive_no,
-        responsible_person=db_case.responsible_person,
-        commisioner=db_case.commisioner,
-        created_at=db_case.created_at,
-        updated_at=db_case.updated_at,
-        version=db_case.version
-    )
+def search_cases_text(query: str):
+    return or_(CaseDB.title.ilike(f"%{query}%"), CaseDB.defendant.ilike(f"%{query}%"))
 
-def db_to_pydantic_compensation_letter(db_letter: CompensationLetterDB) -> CompensationLetter:
-    return CompensationLetter(
-        id=db_letter.id,
-        title=db_letter.title,
-        client_id=db_letter.client_id,
-        client_name=db_letter.client_name,
-        letter_number=db_letter.letter_number,
-        bank=db_letter.bank,
-        customer_number=db_letter.customer_number,
-        customer=db_letter.customer,
-        court=db_letter.court,
-        case_number=db_letter.case_number,
-        status=db_letter.status,
-        description_text=db_letter.description_text,
-        reminder_date=db_letter.reminder_date,
-        reminder_text=db_letter.reminder_text,
-        responsible_person=db_letter.responsible_person,
-        commisioner=db_letter.commisioner,
-        created_at=db_letter.created_at,
-        updated_at=db_letter.updated_at,
-        version=db_letter.version
-    )
+# The columns the Cases and Executions tables show and filter on; long
+# free text (description, notes, reminder_text) is left to the detail
+# routes unless a list asks for it by name.
+CASE_SUMMARY = (
+    "title", "case_name", "client_id", "client_name", "case_type", "status", "court", "case_number",
+    "defendant", "start_date", "next_hearing_date", "reminder_date", "responsible_person", "görevlendiren",
+)
+EXECUTION_SUMMARY = (
+    "client_id", "client_name", "defendant", "execution_office", "execution_number", "status",
+    "execution_type", "start_date", "reminder_date", "haciz_durumu", "responsible_person", "görevlendiren",
+)
+
+# Routes for all four entities are generated from these; lists and single
+# rows are read as column projections and encoded straight to JSON instead of
+# being hydrated into ORM objects and copied into pydantic models.
+clients = CrudResource(ClientDB, Client, ClientCreate, ClientUpdate, "client", "Client", after_update=propagate_renamed_client)
+cases = CrudResource(CaseDB, Case, CaseCreate, CaseUpdate, "case", "Case", filters={
+    "status": CaseDB.status,
+    "query": search_cases_text,
+    "responsible_person": CaseDB.responsible_person,
+    "görevlendiren": CaseDB.görevlendiren,
+}, summary=CASE_SUMMARY)
+executions = CrudResource(ExecutionDB, Execution, ExecutionCreate, ExecutionUpdate, "execution", "Execution", filters={
+    "status": ExecutionDB.status,
+    "client_id": ExecutionDB.client_id,
+    "haciz_durumu": ExecutionDB.haciz_durumu,
+    "responsible_person": ExecutionDB.responsible_person,
+    "görevlendiren": ExecutionDB.görevlendiren,
+}, summary=EXECUTION_SUMMARY)
+compensation_letters = CrudResource(
+    CompensationLetterDB, CompensationLetter, CompensationLetterCreate, CompensationLetterUpdate,
+    "compensation_letter", "Compensation letter",
+    filters={
+        "status": CompensationLetterDB.status,
+        "client_id": CompensationLetterDB.client_id,
+        "responsible_person": CompensationLetterDB.responsible_person,
+        "görevlendiren": CompensationLetterDB.görevlendiren,
+    },
+    prepare=compensation_letter_title
+)
 
-def db_to_pydantic_execution(db_execution: ExecutionDB) -> Execution:
-    return Execution(
-        id=db_execution.id,
-        client_id=db_execution.client_id,
-        client_name=db_execution.client_name,
-        defendant=db_execution.defendant,
-        execution_office=db_execution.execution_office,
-        execution_number=db_execution.execution_number,
-        status=db_execution.status,
-        execution_type=db_execution.execution_type,
-        start_date=db_execution.start_date,
-        office_archive_no=db_execution.office_archive_no,
-        reminder_date=db_execution.reminder_date,
-        reminder_text=db_execution.reminder_text,
-        notes=db_execution.notes,
-        haciz_durumu=db_execution.haciz_durumu,
-        responsible_person=db_execution.responsible_person,
-        commisioner=db_execution.commisioner,
-        created_at=db_execution.created_at,
-        updated_at=db_execution.updated_at,
-        version=db_execution.version
-    )
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 JWT_SECRET = os.getenv("JWT_SECRET")
 
@@ -371,60 +409,98 @@ if not JWT_SECRET:
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
-        self.connection_lock = threading.Lock()
-
-    def connect(self, websocket: WebSocket, user_token: str):
-        with self.connection_lock:
-            if user_token not in self.active_connections:
-                self.active_connections[user_token] = set()
-            self.active_connections[user_token].add(websocket)
-
-    def disconnect(self, websocket: WebSocket, user_token: str):
-        with self.connection_lock:
-            if user_token in self.active_connections:
-                self.active_connections[user_token].discard(websocket)
-                if not self.active_connections[user_token]:
-                    del self.active_connections[user_token]
-
-    async def broadcast_data_change(self, change_type: str, entity_type: str, entity_id: str, data: dict):
-        serializable_data = self._make_serializable(data)
-        
-        message = {
-            "type": "data_change",
-            "change_type": change_type,
-            "entity_type": entity_type,
-            "entity_id": entity_id,
-            "data": serializable_data,
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        disconnected_connections = []
-        with self.connection_lock:
-            for user_token, connections in self.active_connections.items():
-                for connection in connections.copy():
-                    try:
-                        await connection.send_text(json.dumps(message))
-                    except Exception as e:
-                        print(f"Error sending WebSocket message: {e}")
-                        disconnected_connections.append((connection, user_token))
-        
-        for connection, user_token in disconnected_connections:
-            self.disconnect(connection, user_token)
-    
-    def _make_serializable(self, obj):
-        """Convert datetime objects to ISO format strings for JSON serialization"""
-        if isinstance(obj, dict):
-            return {key: self._make_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._make_serializable(item) for item in obj]
-        elif isinstance(obj, (date, datetime)):
-            return obj.isoformat()
-        else:
-            return obj
-manager = ConnectionManager()
+token_verifier = TokenVerifier(
+    JWT_SECRET,
+    JWT_ALGORITHM,
+    cache_size=int(os.getenv("TOKEN_CACHE_SIZE", "1024"))
+)
+
+manager = ConnectionManager(
+    queue_size=int(os.getenv("WS_SEND_QUEUE_SIZE", "256")),
+    send_timeout=float(os.getenv("WS_SEND_TIMEOUT_SECONDS", "10"))
+)
+
+dashboard_cache = DashboardCache(ttl_seconds=float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "30")))
+manager.add_change_listener(dashboard_cache.invalidate)
+# Each process keeps its own index (remote events reach it through the
+# broadcast backend too) and announces due reminders to its own sockets.
+reminder_scheduler = ReminderScheduler(AsyncSessionLocal, manager.send_to_all, on_change=dashboard_cache.invalidate)
+manager.add_change_listener(reminder_scheduler.handle_change)
+manager.add_event_handler("token_revoked", token_verifier.handle_revocation_event)
+# Also picks up logouts on other instances under the local broadcast
+# backend, and retries a startup load that failed; a later success clears
+# that phase's error, so the instance becomes ready.
+revocation_refresher = RevocationRefresher(
+    AsyncSessionLocal,
+    token_verifier,
+    interval=float(os.getenv("TOKEN_REVOCATION_REFRESH_SECONDS", "60")),
+    on_loaded=lambda revoked: startup_report.resolve("token_revocations")
+)
+manager.fanout_observer = lambda seconds, recipients: broadcast_fanout.observe(seconds)
+
+
+def pool_saturation() -> float:
+    capacity = async_engine.pool.size() + pool_config.max_overflow
+    return async_engine.pool.checkedout() / capacity if capacity else 0.0
+
+
+metrics.register(Gauge(
+    "lexcloud_websocket_connections", "Open WebSocket connections",
+    function=lambda: sum(len(sockets) for sockets in list(manager.active_connections.values()))
+))
+metrics.register(Counter("lexcloud_websocket_messages_sent", "WebSocket frames sent", function=lambda: manager.messages_sent))
+metrics.register(Counter("lexcloud_websocket_resyncs", "Subscribers told to resync after their queue filled", function=lambda: manager.resyncs))
+metrics.register(Counter("lexcloud_websocket_dropped_connections", "Sockets closed after a failed or slow send", function=lambda: manager.dropped_connections))
+metrics.register(Gauge("lexcloud_db_pool_size", "Base size of the connection pool", function=async_engine.pool.size))
+metrics.register(Gauge("lexcloud_db_pool_checked_out", "Connections in use", function=async_engine.pool.checkedout))
+metrics.register(Gauge("lexcloud_db_pool_overflow", "Connections open beyond the base size", function=async_engine.pool.overflow))
+metrics.register(Gauge("lexcloud_db_pool_saturation", "Connections in use as a fraction of size plus overflow", function=pool_saturation))
+metrics.register(CumulativeHistogram(
+    "lexcloud_db_pool_wait_seconds", "Time to check out a connection",
+    lambda: (async_pool_stats.histogram(), async_pool_stats.wait_seconds_total, async_pool_stats.checkouts)
+))
+metrics.register(Counter("lexcloud_db_pool_timeouts", "Checkouts that gave up waiting for a connection", function=lambda: async_pool_stats.timeouts))
+metrics.register(Counter("lexcloud_query_stats_warnings", "Requests over a query count, DB time, repeat or slow query threshold", function=lambda: query_stats.warnings))
+metrics.register(Gauge("lexcloud_ready", "1 once startup has finished without a required phase failing", function=lambda: int(startup_report.ready)))
+metrics.register(Gauge(
+    "lexcloud_startup_phase_seconds", "Duration of each startup phase", ["phase"],
+    function=lambda: {(phase,): ms / 1000 for phase, ms in startup_report.phases.items()}
+))
+
+# "local" only reaches sockets connected to this process; "postgres" relays
+# change events to every instance through LISTEN/NOTIFY.
+BROADCAST_BACKEND = os.getenv("BROADCAST_BACKEND", "local")
+if BROADCAST_BACKEND not in ("local", "postgres"):
+    raise ValueError("BROADCAST_BACKEND must be 'local' or 'postgres'")
+broadcast_backend = None
+if BROADCAST_BACKEND == "postgres":
+    # LISTEN holds a session, which a transaction-pooling PgBouncer cannot
+    # give us; it goes to DIRECT_DATABASE_URL when one is set.
+    if pool_config.pgbouncer and pool_config.direct_url == DATABASE_URL:
+        print("⚠️ DB_PGBOUNCER is set without DIRECT_DATABASE_URL; LISTEN will not receive notifications through a transaction pooler")
+    broadcast_backend = PostgresBroadcastBackend(
+        manager,
+        pool_config.direct_url,
+        async_engine,
+        channel=os.getenv("BROADCAST_CHANNEL", "lexcloud_changes")
+    )
+
+async def broadcast_reconciled_names(entity_type: str, count: int):
+    await manager.broadcast_data_change("bulk", entity_type, "", {"client_name_repaired": count})
+
+CLIENT_NAME_RECONCILE_INTERVAL = float(os.getenv("CLIENT_NAME_RECONCILE_INTERVAL_SECONDS", "3600"))
+client_name_reconciler = ClientNameReconciler(
+    AsyncSessionLocal,
+    broadcast_reconciled_names,
+    interval=CLIENT_NAME_RECONCILE_INTERVAL,
+    chunk_size=int(os.getenv("CLIENT_NAME_RECONCILE_CHUNK_SIZE", "1000")),
+    initial_delay=float(os.getenv("CLIENT_NAME_RECONCILE_INITIAL_DELAY_SECONDS", "300"))
+)
+
+async def broadcast_bulk_change(entity_type: str, changes: Dict[str, Any]):
+    """Announce a whole batch as one event instead of one per row."""
+    if any(changes.values()):
+        await manager.broadcast_data_change("bulk", entity_type, "", changes)
 
 class LoginRequest(BaseModel):
     password: str
@@ -433,21 +509,47 @@ class LoginResponse(BaseModel):
     token: str
 
 class PasswordChangeRequest(BaseModel):
+    current_password: str
     new_password: str
 
-def verify_token(token: str = Depends(HTTPBearer())):
+async def verify_token(token: str = Depends(HTTPBearer())):
     try:
-        payload = jwt.decode(token.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload
+        return token_verifier.verify(token.credentials)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+@app.post("/api/login", response_model=LoginResponse)
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    if not await check_password(db, request.password, ADMIN_PASSWORD):
+        raise HTTPException(status_code=401, detail="Invalid password")
+    return LoginResponse(token=token_verifier.issue("admin", timedelta(hours=JWT_EXPIRATION_HOURS)))
+
+@app.post("/api/logout")
+async def logout(db: AsyncSession = Depends(get_async_db), payload: dict = Depends(verify_token)):
+    await persist_revocation(db, payload["jti"], payload["exp"])
+    await manager.publish({"type": "token_revoked", "jti": payload["jti"], "exp": payload["exp"]})
+    return {"message": "Logged out successfully"}
+
+@app.post("/api/auth/change-password")
+async def change_password(request: PasswordChangeRequest, db: AsyncSession = Depends(get_async_db), token: str = Depends(verify_token)):
+    if not await check_password(db, request.current_password, ADMIN_PASSWORD):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+    if len(request.new_password) < 6:
+        raise HTTPException(status_code=400, detail="New password must be at least 6 characters")
+    await set_password(db, request.new_password)
+    print("Admin password changed")
+    return {"message": "Password changed successfully"}
+
+@app.get("/api/auth/cache")
+async def get_token_cache_stats(token: str = Depends(verify_token)):
+    return token_verifier.stats()
+
 @app.websocket("/ws/{token}")
 async def websocket_endpoint(websocket: WebSocket, token: str):
     try:
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = token_verifier.verify(token)
         await websocket.accept()
         manager.connect(websocket, token)
 
@@ -468,184 +570,64 @@ async def websocket_endpoint(websocket: WebSocket, token: str):
                 data = await websocket.receive_text()
                 print(f"Received WebSocket message: {data}")
         except WebSocketDisconnect:
+            pass
+        finally:
             ping_coroutine.cancel()
             manager.disconnect(websocket, token)
     except jwt.InvalidTokenError:
         await websocket.close(code=1008)
 
 
-@app.post("/api/clients", response_model=Client)
-async def create_client(client: ClientCreate, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    client_id = str(uuid.uuid4())
-    now = datetime.now()
-    
-    db_client = ClientDB(
-        id=client_id,
-        name=client.name,
-        email=client.email,
-        phone=client.phone,
-        address=client.address,
-        tax_id=client.tax_id,
-        vekalet_ofis_no=client.vekalet_ofis_no,
-        created_at=now,
-        updated_at=now,
-        version=1,
-        is_deleted=False
-    )
-    
-    db.add(db_client)
-    db.commit()
-    db.refresh(db_client)
-    
-    new_client = db_to_pydantic_client(db_client)
-    await manager.broadcast_data_change("create", "client", client_id, new_client.dict())
-    
-    return new_client
+@app.post("/api/clients/bulk", response_model=BulkResponse)
+async def bulk_clients(request: BulkRequest, response: Response, db: AsyncSession = Depends(get_async_db), token: str = Depends(verify_token)):
+    result, changes = await apply_bulk(db, ClientDB, ClientCreate, ClientUpdate, request)
+    if not result.committed:
+        response.status_code = 409
+    await broadcast_bulk_change("client", changes)
+    print(f"Bulk clients applied: {result.succeeded} succeeded, {result.failed} failed")
+    return result
 
-@app.get("/api/clients", response_model=List[Client])
-async def get_clients(
-    page: int = Query(1, ge=1),
-    limit: int = Query(1000, ge=1, le=10000),
-    db: Session = Depends(get_db), 
+
+
+@app.get("/api/dashboard")
+async def get_dashboard(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(verify_token)
 ):
-    offset = (page - 1) * limit
-    db_clients = db.query(ClientDB).filter(ClientDB.is_deleted == False).order_by(ClientDB.updated_at.desc()).offset(offset).limit(limit).all()
-    return [db_to_pydantic_client(client) for client in db_clients]
-
-@app.get("/api/clients/{client_id}", response_model=Client)
-async def get_client(client_id: str, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_client = db.query(ClientDB).filter(ClientDB.id == client_id, ClientDB.is_deleted == False).first()
-    if not db_client:
-        raise HTTPException(status_code=404, detail="Client not found")
-    return db_to_pydantic_client(db_client)
-
-@app.put("/api/clients/{client_id}", response_model=Client)
-async def update_client(client_id: str, client_update: ClientUpdate, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_client = db.query(ClientDB).filter(ClientDB.id == client_id, ClientDB.is_deleted == False).first()
-    if not db_client:
-        raise HTTPException(status_code=404, detail="Client not found")
-    
-    if client_update.version is not None and db_client.version != client_update.version:
-        raise HTTPException(status_code=409, detail="Version conflict. Please refresh and try again.")
-    
-    update_data = client_update.dict(exclude_unset=True, exclude={"version"})
-    for field, value in update_data.items():
-        setattr(db_client, field, value)
-    
-    db_client.updated_at = datetime.now()
-    db_client.version += 1
-    
-    try:
-        db.commit()
-        db.refresh(db_client)
-        
-        client = db_to_pydantic_client(db_client)
-        await manager.broadcast_data_change("update", "client", client_id, client.dict())
-        
-        print(f"Client updated successfully: {client_id}")
-        return client
-    except Exception as e:
-        db.rollback()
-        print(f"Error updating client {client_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to update client")
-
-@app.delete("/api/clients/{client_id}")
-async def delete_client(client_id: str, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_client = db.query(ClientDB).filter(ClientDB.id == client_id, ClientDB.is_deleted == False).first()
-    if not db_client:
-        raise HTTPException(status_code=404, detail="Client not found")
-    
-    db_client.is_deleted = True
-    db_client.updated_at = datetime.now()
-    db.commit()
-    
-    await manager.broadcast_data_change("delete", "client", client_id, {})
-    
-    return {"message": "Client deleted successfully"} 
+    snapshot, etag = await dashboard_cache.get_tagged(lambda: build_dashboard(db))
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    tag_response(response, etag)
+    return snapshot
 
 
-@app.get("/api/dashboard")
-async def get_dashboard(db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    total_cases = db.query(CaseDB).filter(CaseDB.is_deleted == False).count()
-    total_clients = db.query(ClientDB).filter(ClientDB.is_deleted == False).count()
-    total_executions = db.query(ExecutionDB).filter(ExecutionDB.is_deleted == False).count()
-    total_compensation_letters = db.query(CompensationLetterDB).filter(CompensationLetterDB.is_deleted == False).count()
-    
-    upcoming_reminders = []
-    
-    db_cases = db.query(CaseDB).filter(CaseDB.reminder_date.isnot(None), CaseDB.is_deleted == False).all()
-    for case in db_cases:
-        if case.reminder_date:
-            reminder_date = case.reminder_date
-            days_until = (reminder_date - date.today()).days
-            
-            if 0 <= days_until <= 7:
-                upcoming_reminders.append({
-                    "type": "case",
-                    "case_id": case.id,
-                    "case_number": case.case_number,
-                    "case_name": case.case_name,
-                    "court": case.court,
-                    "client_name": case.client_name,
-                    "defendant": case.defendant,
-                    "reminder_date": reminder_date.isoformat(),
-                    "description": case.description,
-                    "responsible_person": case.responsible_person,
-                    "görevlendiren": case.görevlendiren,
-                    "days_until": days_until
-                })
-    
-    db_executions = db.query(ExecutionDB).filter(ExecutionDB.reminder_date.isnot(None), ExecutionDB.is_deleted == False).all()
-    for execution in db_executions:
-        if execution.reminder_date:
-            reminder_date = execution.reminder_date
-            days_until = (reminder_date - date.today()).days
-            
-            if 0 <= days_until <= 7:
-                upcoming_reminders.append({
-                    "type": "execution",
-                    "execution_id": execution.id,
-                    "execution_number": execution.execution_number,
-                    "execution_office": execution.execution_office,
-                    "client_name": execution.client_name,
-                    "defendant": execution.defendant,
-                    "reminder_date": reminder_date.isoformat(),
-                    "reminder_text": execution.reminder_text,
-                    "responsible_person": execution.responsible_person,
-                    "görevlendiren": execution.görevlendiren,
-                    "days_until": days_until
-                })
-    
-    db_compensation_letters = db.query(CompensationLetterDB).filter(CompensationLetterDB.reminder_date.isnot(None), CompensationLetterDB.is_deleted == False).all()
-    for letter in db_compensation_letters:
-        if letter.reminder_date:
-            reminder_date = letter.reminder_date
-            days_until = (reminder_date - date.today()).days
-            
-            if 0 <= days_until <= 7:
-                upcoming_reminders.append({
-                    "type": "compensation_letter",
-                    "compensation_letter_id": letter.id,
-                    "letter_number": letter.letter_number,
-                    "court": letter.court,
-                    "case_number": letter.case_number,
-                    "customer": letter.customer,
-                    "client_name": letter.client_name,
-                    "reminder_date": reminder_date.isoformat(),
-                    "reminder_text": letter.reminder_text,
-                    "responsible_person": letter.responsible_person,
-                    "görevlendiren": letter.görevlendiren,
-                    "days_until": days_until
-                })
+@app.get("/api/dashboard/cache")
+async def get_dashboard_cache_stats(token: str = Depends(verify_token)):
+    return dashboard_cache.stats()
+
+
+@app.get("/api/dashboard/reminders")
+async def get_reminder_index_stats(token: str = Depends(verify_token)):
+    return reminder_scheduler.stats()
+
+
+async def build_dashboard(db: AsyncSession) -> dict:
+    totals = (await db.execute(select(
+        select(func.count()).select_from(CaseDB).where(CaseDB.is_deleted == False).scalar_subquery(),
+        select(func.count()).select_from(ClientDB).where(ClientDB.is_deleted == False).scalar_subquery(),
+        select(func.count()).select_from(ExecutionDB).where(ExecutionDB.is_deleted == False).scalar_subquery(),
+        select(func.count()).select_from(CompensationLetterDB).where(CompensationLetterDB.is_deleted == False).scalar_subquery(),
+    ))).one()
+    total_cases, total_clients, total_executions, total_compensation_letters = totals
     
-    upcoming_reminders.sort(key=lambda x: x["days_until"])
+    await reminder_scheduler.ensure_loaded()
     
-    status_counts = {}
-    db_cases = db.query(CaseDB).filter(CaseDB.is_deleted == False).all()
-    for case in db_cases:
-        status = case.status
-        status_counts[status] = status_counts.get(status, 0) + 1
+    status_rows = await db.execute(
+        select(CaseDB.status, func.count()).where(CaseDB.is_deleted == False).group_by(CaseDB.status)
+    )
+    status_counts = {status: count for status, count in status_rows}
     
     return {
         "total_cases": total_cases,
@@ -653,17 +635,114 @@ async def get_dashboard(db: Session = Depends(get_db), token: str = Depends(veri
         "total_executions": total_executions,
         "total_compensation_letters": total_compensation_letters,
         "status_counts": status_counts,
-        "upcoming_reminders": upcoming_reminders
+        **reminder_scheduler.upcoming(days=7)
+    }
+
+
+SYNC_ENTITIES = {
+    "clients": (ClientDB, Client),
+    "cases": (CaseDB, Case),
+    "executions": (ExecutionDB, Execution),
+    "compensation_letters": (CompensationLetterDB, CompensationLetter),
+}
+
+@app.get("/api/sync/token")
+async def get_sync_token(token: str = Depends(verify_token)):
+    horizon = (datetime.now() - SYNC_GRACE, "")
+    return {"token": encode_sync_token({entity: horizon for entity in SYNC_ENTITIES})}
+
+@app.get("/api/sync")
+async def sync_changes(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(verify_token)
+):
+    try:
+        positions = decode_sync_token(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync token")
+    
+    now = datetime.now()
+    models = {entity: model for entity, (model, _) in SYNC_ENTITIES.items()}
+    probe = (await db.execute(changes_probe(models, positions))).one()
+    
+    changes = {entity: [] for entity in SYNC_ENTITIES}
+    deleted = {entity: [] for entity in SYNC_ENTITIES}
+    has_more = False
+    for (entity, (model, schema)), changed in zip(SYNC_ENTITIES.items(), probe):
+        if not changed:
+            continue
+        result = await db.execute(changes_query(model, positions.get(entity), limit))
+        rows = result.scalars().all()
+        position, truncated = advance_position(positions.get(entity), rows, limit, now)
+        if position is not None:
+            positions[entity] = position
+        has_more = has_more or truncated
+        for row in rows[:limit]:
+            if row.is_deleted:
+                deleted[entity].append(row.id)
+            else:
+                changes[entity].append(sync_row(schema, row))
+    
+    return {
+        "token": encode_sync_token(positions),
+        "has_more": has_more,
+        "changes": changes,
+        "deleted": deleted
     }
 
 
+@app.get("/api/backup")
+async def backup_export(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    table: Optional[str] = None,
+    compression: Optional[str] = Query(None, pattern="^(gzip|zstd)$"),
+    token: str = Depends(verify_token)
+):
+    if table is not None and table not in BACKUP_TABLES:
+        raise HTTPException(status_code=400, detail=f"Unknown table: {table}")
+    if format == "csv" and table is None:
+        raise HTTPException(status_code=400, detail="CSV exports one table at a time; pass table=")
+    if not compression_available(compression):
+        raise HTTPException(status_code=400, detail=f"{compression} compression is not available")
+    
+    if format == "csv":
+        chunks = stream_csv(table)
+        media_type = "text/csv; charset=utf-8"
+    else:
+        chunks = stream_ndjson([table] if table else list(BACKUP_TABLES))
+        media_type = "application/x-ndjson"
+    
+    filename = f"lexcloud-backup-{date.today().isoformat()}{'-' + table if table else ''}.{format}"
+    if compression:
+        media_type, suffix = COMPRESSED_FILES[compression]
+        filename += suffix
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    
+    print(f"Backup export started: format={format} table={table or 'all'} compression={compression or 'none'}")
+    return StreamingResponse(compress(chunks, compression), media_type=media_type, headers=headers)
+
+@app.post("/api/restore")
+async def restore(request: Request, token: str = Depends(verify_token)):
+    # A .gz export uploaded as is, or a plain one sent with Content-Encoding.
+    gzipped = (request.headers.get("content-encoding", "").lower() == "gzip"
+               or request.headers.get("content-type", "").split(";")[0].strip().lower() == COMPRESSED_FILES["gzip"][0])
+    started = time.perf_counter()
+    tables = await restore_backup(request.stream(), gzipped=gzipped)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+    
+    await manager.broadcast_resync("restore")
+    
+    print(f"Backup restored in {elapsed_ms} ms: {tables}")
+    return {"message": "Backup restored successfully", "elapsed_ms": elapsed_ms, "tables": tables}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Fly.io"""
     try:
-        db = next(get_db())
-        db.execute(text("SELECT 1"))
-        db.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
 
         return {
             "status": "healthy",
@@ -673,145 +752,44 @@ async def health_check():
     except Exception as e:
         logging.error(f"Health check failed: {e}")
         raise HTTPException(status_code=503, detail="Service unavailable")
-    
 
-@app.post("/api/cases", response_model=Case)
-async def create_case(case: CaseCreate, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    case_id = str(uuid.uuid4())
-    now = datetime.now()
-    
-    db_client = db.query(ClientDB).filter(ClientDB.id == case.client_id, ClientDB.is_deleted == False).first()
-    if not db_client:
-        raise HTTPException(status_code=400, detail="Invalid client ID")
-    
-    db_case = CaseDB(
-        id=case_id,
-        title=case.title,
-        case_name=case.case_name,
-        description=case.description,
-        client_id=case.client_id,
-        client_name=db_client.name,
-        case_type=case.case_type,
-        status=case.status,
-        court=case.court,
-        case_number=case.case_number,
-        defendant=case.defendant,
-        notes=case.notes,
-        start_date=case.start_date,
-        next_hearing_date=case.next_hearing_date,
-        reminder_date=case.reminder_date,
-        office_archive_no=case.office_archive_no,
-        responsible_person=case.responsible_person,
-        görevlendiren=case.görevlendiren,
-        created_at=now,
-        updated_at=now,
-        version=1
-    )
-    
-    try:
-        db.add(db_case)
-        db.commit()
-        db.refresh(db_case)
-        
-        new_case = db_to_pydantic_case(db_case)
-        await manager.broadcast_data_change("create", "case", case_id, new_case.dict())
-        
-        print(f"Case created successfully: {case_id}")
-        return new_case
-    except Exception as e:
-        db.rollback()
-        print(f"Error creating case: {e}")
-        raise HTTPException(status_code=500, detail="Failed to create case")
-
-@app.get("/api/cases", response_model=List[Case])
-async def get_cases(
-    status: Optional[str] = None, 
-    query: Optional[str] = None,
-    responsible_person: Optional[str] = None,
-    görevlendiren: Optional[str] = None,
-    page: int = Query(1, ge=1),
-    limit: int = Query(1000, ge=1, le=10000),
-    db: Session = Depends(get_db), 
-    token: str = Depends(verify_token)
-):
-    db_query = db.query(CaseDB).filter(CaseDB.is_deleted == False)
-    if status:
-        db_query = db_query.filter(CaseDB.status == status)
-    if responsible_person:
-        db_query = db_query.filter(CaseDB.responsible_person == responsible_person)
-    if görevlendiren:
-        db_query = db_query.filter(CaseDB.görevlendiren == görevlendiren)
-    if query:
-        db_query = db_query.filter(
-            or_(
-                CaseDB.title.ilike(f"%{query}%"),
-                CaseDB.defendant.ilike(f"%{query}%")
-            )
-        )
-    
-    offset = (page - 1) * limit
-    db_cases = db_query.order_by(CaseDB.updated_at.desc()).offset(offset).limit(limit).all()
-    return [db_to_pydantic_case(case) for case in db_cases]
-
-@app.get("/api/cases/{case_id}", response_model=Case)
-async def get_case(case_id: str, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_case = db.query(CaseDB).filter(CaseDB.id == case_id, CaseDB.is_deleted == False).first()
-    if not db_case:
-        raise HTTPException(status_code=404, detail="Case not found")
-    return db_to_pydantic_case(db_case)
-
-@app.put("/api/cases/{case_id}", response_model=Case)
-async def update_case(case_id: str, case_update: CaseUpdate, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_case = db.query(CaseDB).filter(CaseDB.id == case_id, CaseDB.is_deleted == False).first()
-    if not db_case:
-        raise HTTPException(status_code=404, detail="Case not found")
-    
-    if case_update.version is not None and db_case.version != case_update.version:
-        raise HTTPException(status_code=409, detail="Version conflict. Please refresh and try again.")
-    
-    if case_update.client_id:
-        db_client = db.query(ClientDB).filter(ClientDB.id == case_update.client_id, ClientDB.is_deleted == False).first()
-        if not db_client:
-            raise HTTPException(status_code=400, detail="Invalid client ID")
-    
-    update_data = case_update.dict(exclude_unset=True, exclude={"version"})
-    for field, value in update_data.items():
-        setattr(db_case, field, value)
-    
-    if case_update.client_id:
-        db_client = db.query(ClientDB).filter(ClientDB.id == case_update.client_id, ClientDB.is_deleted == False).first()
-        db_case.client_name = db_client.name
-    
-    db_case.updated_at = datetime.now()
-    db_case.version += 1
-    
-    try:
-        db.commit()
-        db.refresh(db_case)
-        
-        case = db_to_pydantic_case(db_case)
-        await manager.broadcast_data_change("update", "case", case_id, case.dict())
-        
-        print(f"Case updated successfully: {case_id}")
-        return case
-    except Exception as e:
-        db.rollback()
-        print(f"Error updating case {case_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to update case")
-
-@app.delete("/api/cases/{case_id}")
-async def delete_case(case_id: str, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_case = db.query(CaseDB).filter(CaseDB.id == case_id, CaseDB.is_deleted == False).first()
-    if not db_case:
-        raise HTTPException(status_code=404, detail="Case not found")
-    
-    db_case.is_deleted = True
-    db_case.updated_at = datetime.now()
-    db.commit()
-    
-    await manager.broadcast_data_change("delete", "case", case_id, {})
-    
-    return {"message": "Case deleted successfully"}
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness check: passes once startup has finished and no required phase failed"""
+    if not startup_report.ready:
+        response.status_code = 503
+    return startup_report.as_dict()
+
+# Scrapers send it as a bearer token (Prometheus' ``authorization`` scrape
+# option). Without it /metrics is not served: the app is public and the
+# metrics name routes, pool sizes and error counts.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics(authorization: Optional[str] = Header(None)):
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not scrape_authorized(authorization, METRICS_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid metrics token", headers={"WWW-Authenticate": "Bearer"})
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/metrics/startup")
+async def get_startup_metrics(token: str = Depends(verify_token)):
+    return startup_report.as_dict()
+
+@app.get("/api/metrics/pool")
+async def get_pool_metrics(token: str = Depends(verify_token)):
+    return {"config": pool_config.as_dict(), **pool_status(async_engine.pool, async_pool_stats)}
+    
+
+@app.post("/api/cases/bulk", response_model=BulkResponse)
+async def bulk_cases(request: BulkRequest, response: Response, db: AsyncSession = Depends(get_async_db), token: str = Depends(verify_token)):
+    result, changes = await apply_bulk(db, CaseDB, CaseCreate, CaseUpdate, request)
+    if not result.committed:
+        response.status_code = 409
+    await broadcast_bulk_change("case", changes)
+    print(f"Bulk cases applied: {result.succeeded} succeeded, {result.failed} failed")
+    return result
 
 class CaseSearchParams(BaseModel):
     q: Optional[str] = None
@@ -827,165 +805,47 @@ async def search_cases(
     client_id: Optional[str] = None,
     court: Optional[str] = None,
     case_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    page: int = Query(1, ge=1),
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(verify_token)
 ):
-    query = db.query(CaseDB)
-    
-    if q:
-        q_lower = f"%{q.lower()}%"
-        query = query.filter(
-            (CaseDB.title.ilike(q_lower)) |
-            (CaseDB.case_number.ilike(q_lower)) |
-            (CaseDB.defendant.ilike(q_lower)) |
-            (CaseDB.client_name.ilike(q_lower))
-        )
+    query = select(*cases.columns).where(CaseDB.is_deleted == False)
     
     if status:
-        query = query.filter(CaseDB.status == status)
+        query = query.where(CaseDB.status == status)
     
     if client_id:
-        query = query.filter(CaseDB.client_id == client_id)
+        query = query.where(CaseDB.client_id == client_id)
     
     if court:
-        query = query.filter(CaseDB.court.ilike(f"%{court}%"))
+        query = query.where(CaseDB.court.ilike(f"%{escape_like(court)}%", escape="\\"))
     
     if case_type:
-        query = query.filter(CaseDB.case_type == case_type)
-    
-    db_cases = query.all()
-    return [db_to_pydantic_case(case) for case in db_cases]
-
-@app.post("/api/executions", response_model=Execution)
-async def create_execution(execution: ExecutionCreate, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    execution_id = str(uuid.uuid4())
-    now = datetime.now()
-    
-    db_client = db.query(ClientDB).filter(ClientDB.id == execution.client_id, ClientDB.is_deleted == False).first()
-    if not db_client:
-        raise HTTPException(status_code=400, detail="Invalid client ID")
+        query = query.where(CaseDB.case_type == case_type)
     
-    db_execution = ExecutionDB(
-        id=execution_id,
-        client_id=execution.client_id,
-        client_name=db_client.name,
-        defendant=execution.defendant,
-        execution_office=execution.execution_office,
-        execution_number=execution.execution_number,
-        status=execution.status,
-        execution_type=execution.execution_type,
-        start_date=execution.start_date,
-        office_archive_no=execution.office_archive_no,
-        reminder_date=execution.reminder_date,
-        reminder_text=execution.reminder_text,
-        notes=execution.notes,
-        haciz_durumu=execution.haciz_durumu,
-        responsible_person=execution.responsible_person,
-        görevlendiren=execution.görevlendiren,
-        created_at=now,
-        updated_at=now,
-        version=1
-    )
-    
-    try:
-        db.add(db_execution)
-        db.commit()
-        db.refresh(db_execution)
-        
-        new_execution = db_to_pydantic_execution(db_execution)
-        await manager.broadcast_data_change("create", "execution", execution_id, new_execution.dict())
-        
-        print(f"Execution created successfully: {execution_id}")
-        return new_execution
-    except Exception as e:
-        db.rollback()
-        print(f"Error creating execution: {e}")
-        raise HTTPException(status_code=500, detail="Failed to create execution")
-
-@app.get("/api/executions", response_model=List[Execution])
-async def get_executions(
-    status: Optional[str] = None,
-    client_id: Optional[str] = None,
-    haciz_durumu: Optional[str] = None,
-    responsible_person: Optional[str] = None,
-    görevlendiren: Optional[str] = None,
-    page: int = Query(1, ge=1),
-    limit: int = Query(1000, ge=1, le=10000),
-    db: Session = Depends(get_db),
-    token: str = Depends(verify_token)
-):
-    query = db.query(ExecutionDB).filter(ExecutionDB.is_deleted == False)
-    if status:
-        query = query.filter(ExecutionDB.status == status)
-    if client_id:
-        query = query.filter(ExecutionDB.client_id == client_id)
-    if responsible_person:
-        query = query.filter(ExecutionDB.responsible_person == responsible_person)
-    if görevlendiren:
-        query = query.filter(ExecutionDB.görevlendiren == görevlendiren)
-    if haciz_durumu:
-        query = query.filter(ExecutionDB.haciz_durumu == haciz_durumu)
+    if q and q.strip():
+        query = apply_case_search(query, q)
+    else:
+        query = query.order_by(CaseDB.updated_at.desc(), CaseDB.id)
     
     offset = (page - 1) * limit
-    db_executions = query.order_by(ExecutionDB.updated_at.desc()).offset(offset).limit(limit).all()
-    return [db_to_pydantic_execution(execution) for execution in db_executions]
-
-@app.get("/api/executions/{execution_id}", response_model=Execution)
-async def get_execution(execution_id: str, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_execution = db.query(ExecutionDB).filter(ExecutionDB.id == execution_id, ExecutionDB.is_deleted == False).first()
-    if not db_execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-    return db_to_pydantic_execution(db_execution)
-
-@app.put("/api/executions/{execution_id}", response_model=Execution)
-async def update_execution(execution_id: str, execution_update: ExecutionUpdate, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_execution = db.query(ExecutionDB).filter(ExecutionDB.id == execution_id, ExecutionDB.is_deleted == False).first()
-    if not db_execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-    
-    if execution_update.version is not None and db_execution.version != execution_update.version:
-        raise HTTPException(status_code=409, detail="Version conflict. Please refresh and try again.")
-    
-    if execution_update.client_id:
-        db_client = db.query(ClientDB).filter(ClientDB.id == execution_update.client_id, ClientDB.is_deleted == False).first()
-        if not db_client:
-            raise HTTPException(status_code=400, detail="Invalid client ID")
-    
-    update_data = execution_update.dict(exclude_unset=True, exclude={"version"})
-    for field, value in update_data.items():
-        setattr(db_execution, field, value)
-    
-    if execution_update.client_id:
-        db_client = db.query(ClientDB).filter(ClientDB.id == execution_update.client_id, ClientDB.is_deleted == False).first()
-        db_execution.client_name = db_client.name
-    
-    db_execution.updated_at = datetime.now()
-    db_execution.version += 1
-    
-    try:
-        db.commit()
-        db.refresh(db_execution)
-        
-        execution = db_to_pydantic_execution(db_execution)
-        await manager.broadcast_data_change("update", "execution", execution_id, execution.dict())
-        
-        print(f"Execution updated successfully: {execution_id}")
-        return execution
-    except Exception as e:
-        db.rollback()
-        print(f"Error updating execution {execution_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to update execution")
-
-@app.delete("/api/executions/{execution_id}")
-async def delete_execution(execution_id: str, db: Session = Depends(get_db), token: str = Depends(verify_token)):
-    db_execution = db.query(ExecutionDB).filter(ExecutionDB.id == execution_id, ExecutionDB.is_deleted == False).first()
-    if not db_execution:
-        raise HTTPException(status_code=404, detail="Execution not found")
-    
-    db_execution.is_deleted = True
-    db_execution.updated_at = datetime.now()
-    db.commit()
-    
-    await manager.broadcast_data_change("delete", "execution", execution_id, {})
-    
-    return {"message": "Execution deleted successfully"}
\ No newline at end of file
+    return list_response((await db.execute(query.offset(offset).limit(limit))).all())
+
+@app.post("/api/executions/bulk", response_model=BulkResponse)
+async def bulk_executions(request: BulkRequest, response: Response, db: AsyncSession = Depends(get_async_db), token: str = Depends(verify_token)):
+    result, changes = await apply_bulk(db, ExecutionDB, ExecutionCreate, ExecutionUpdate, request)
+    if not result.committed:
+        response.status_code = 409
+    await broadcast_bulk_change("execution", changes)
+    print(f"Bulk executions applied: {result.succeeded} succeeded, {result.failed} failed")
+    return result
+
+# Registered last so the fixed paths above (/bulk, /search) win over /{item_id}.
+for resource, prefix in (
+    (clients, "/api/clients"),
+    (cases, "/api/cases"),
+    (executions, "/api/executions"),
+    (compensation_letters, "/api/compensation-letters"),
+):
+    app.include_router(resource.router(prefix, get_async_db, verify_token, manager.broadcast_data_change))
@@ -0,0 +1,245 @@
+import bisect
+import hmac
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+# Upper bounds, in seconds, for request and query latency histograms.
+LATENCY_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (name suffix, labels, value)
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Gauge(Metric):
+    """A value set directly, or read from ``function`` at scrape time.
+
+    ``function`` returns either a number or, for labelled metrics, a
+    mapping from label-value tuples to numbers. Reading at scrape time lets
+    existing counters (``ConnectionManager.messages_sent`` and the like)
+    be exported without touching the code that keeps them.
+    """
+
+    kind = "gauge"
+    suffix = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), function: Optional[Callable] = None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values: Dict[tuple, float] = {}
+
+    def set(self, value: float, *labels: str):
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def samples(self) -> Iterable[Sample]:
+        values = self._values
+        if self.function is not None:
+            values = self.function()
+            if not isinstance(values, dict):
+                values = {(): values}
+        for labels, value in values.items():
+            yield self.suffix, dict(zip(self.labelnames, labels)), value
+
+
+class Counter(Gauge):
+    """A monotonically increasing value; exported with a ``_total`` suffix."""
+
+    kind = "counter"
+    suffix = "_total"
+
+    def set(self, value: float, *labels: str):
+        raise TypeError("Counters only go up")
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        raise TypeError("Counters only go up")
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # Per label tuple: [per-bucket counts (last is +Inf), sum, count].
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, (counts, total, count) in self._series.items():
+            base = dict(zip(self.labelnames, labels))
+            running = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                running += bucket_count
+                yield "_bucket", {**base, "le": _format_value(bound)}, running
+            yield "_sum", base, total
+            yield "_count", base, count
+
+
+class CumulativeHistogram(Metric):
+    """A histogram kept elsewhere, read at scrape time.
+
+    ``function`` returns ``(cumulative counts by bound, sum, count)``, as
+    ``PoolStats`` already does for checkout waits.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, function: Callable[[], Tuple[Dict[str, int], float, int]]):
+        super().__init__(name, documentation)
+        self.function = function
+
+    def samples(self) -> Iterable[Sample]:
+        counts, total, count = self.function()
+        for bound, running in counts.items():
+            yield "_bucket", {"le": bound}, running
+        yield "_sum", {}, total
+        yield "_count", {}, count
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Text exposition format, version 0.0.4."""
+        lines = []
+        for metric in self.metrics:
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                print(f"Error collecting metric {metric.name}: {e}")
+                continue
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for suffix, labels, value in samples:
+                lines.append(f"{metric.name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+class RequestMetrics:
+    """ASGI middleware timing every HTTP request.
+
+    Latency is labelled with the matched route template rather than the
+    raw path, so ids do not create a series each; requests no route
+    matched share ``route="unmatched"``. WebSocket and lifespan scopes are
+    passed through untouched.
+    """
+
+    def __init__(self, app, duration: Histogram, in_flight: Gauge, clock: Callable[[], float] = time.perf_counter):
+        self.app = app
+        self.duration = duration
+        self.in_flight = in_flight
+        self.clock = clock
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        self.in_flight.inc()
+        started = self.clock()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.in_flight.dec()
+            route = scope.get("route")
+            self.duration.observe(
+                self.clock() - started,
+                scope["method"], getattr(route, "path", "unmatched"), str(status[0])
+            )
+
+
+def scrape_authorized(authorization: Optional[str], token: str) -> bool:
+    """Whether an Authorization header carries ``Bearer <token>``."""
+    scheme, _, credentials = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(credentials.strip().encode(), token.encode())
+
+
+def statement_kind(statement: str) -> str:
+    """First keyword of a statement, e.g. ``SELECT``; a cheap, bounded label."""
+    head = statement.lstrip()[:8].split(None, 1)
+    kind = head[0].upper() if head else ""
+    return kind if kind in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY") else "OTHER"
+
+
+def instrument_engine(sync_engine, duration: Histogram, errors: Counter,
+                      observers: Sequence[Callable[[str, float], None]] = ()):
+    """Time every statement ``sync_engine`` executes.
+
+    For an AsyncEngine pass ``async_engine.sync_engine``; the events fire
+    inside the greenlet that runs the DBAPI call, so the measured time is
+    the round trip to Postgres, without waiting for the event loop. Each
+    of ``observers`` is also called with the statement and its duration.
+    """
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        seconds = time.perf_counter() - context._metrics_started
+        duration.observe(seconds, statement_kind(statement))
+        for observer in observers:
+            observer(statement, seconds)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        statement = exception_context.statement or ""
+        errors.inc(statement_kind(statement))
@@ -0,0 +1,47 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Select, tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(updated_at: datetime, entity_id: str) -> str:
+    raw = json.dumps([updated_at.isoformat(), entity_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, entity_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(updated_at), str(entity_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Malformed cursor")
+
+
+def keyset_query(query: Select, model, cursor: str, limit: int) -> Select:
+    """Order by (updated_at DESC, id DESC) and seek past ``cursor``.
+
+    An empty cursor starts at the first page. One extra row is fetched so
+    that ``next_cursor`` can tell whether another page exists.
+    """
+    if cursor:
+        try:
+            updated_at, entity_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(model.updated_at, model.id) < tuple_(updated_at, entity_id))
+    return query.order_by(model.updated_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def next_cursor(rows: Sequence, limit: int) -> Tuple[Sequence, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.updated_at, last.id)
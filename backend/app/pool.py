@@ -0,0 +1,138 @@
+import bisect
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# Upper bounds, in seconds, of the checkout wait histogram buckets.
+WAIT_BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+class PoolConfig:
+    """Connection pool settings, read from the environment.
+
+    ``pgbouncer`` is for a transaction-pooling PgBouncer in front of
+    Postgres: a server connection only belongs to us for one transaction,
+    so nothing may rely on session state and psycopg must not create
+    server-side prepared statements. LISTEN and migrations need a real
+    session and use ``direct_url`` instead.
+    """
+
+    def __init__(self, database_url: str, environ=os.environ):
+        self.size = int(environ.get("DB_POOL_SIZE", "5"))
+        self.max_overflow = int(environ.get("DB_POOL_MAX_OVERFLOW", "10"))
+        self.timeout = float(environ.get("DB_POOL_TIMEOUT_SECONDS", "30"))
+        self.recycle = int(environ.get("DB_POOL_RECYCLE_SECONDS", "3600"))
+        self.pgbouncer = environ.get("DB_PGBOUNCER", "false").lower() in TRUE_VALUES
+        direct_url = environ.get("DIRECT_DATABASE_URL") or database_url
+        if direct_url.startswith("postgres://"):
+            direct_url = direct_url.replace("postgres://", "postgresql://", 1)
+        self.direct_url = direct_url
+
+    def engine_kwargs(self) -> dict:
+        return {
+            "pool_size": self.size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.timeout,
+            "pool_recycle": self.recycle,
+            "pool_pre_ping": True,
+            # Reusing the most recent connection lets idle ones age out,
+            # which keeps the server-side footprint small behind PgBouncer.
+            "pool_use_lifo": self.pgbouncer,
+        }
+
+    def connect_args(self) -> dict:
+        connect_args = {"application_name": "lexcloud-backend"}
+        if self.pgbouncer:
+            connect_args["prepare_threshold"] = None
+        return connect_args
+
+    def as_dict(self) -> dict:
+        return {
+            "size": self.size,
+            "max_overflow": self.max_overflow,
+            "timeout_seconds": self.timeout,
+            "recycle_seconds": self.recycle,
+            "pgbouncer": self.pgbouncer,
+        }
+
+
+class PoolStats:
+    """Checkout wait times and timeouts for one connection pool."""
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.bucket_counts: List[int] = [0] * (len(buckets) + 1)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+
+    def observe(self, wait_seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.bucket_counts[bisect.bisect_left(self.buckets, wait_seconds)] += 1
+            self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def histogram(self) -> Dict[str, int]:
+        """Cumulative counts keyed by bucket upper bound, Prometheus style."""
+        counts, running = {}, 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.bucket_counts):
+            running += count
+            counts[bound] = running
+        return counts
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "max_wait_seconds": round(self.max_wait_seconds, 6),
+            "wait_histogram": self.histogram(),
+        }
+
+
+def instrumented(pool_class, stats: PoolStats):
+    """Subclass ``pool_class`` so every checkout is timed into ``stats``.
+
+    The time covers waiting for a free slot, opening a new connection and
+    the pre-ping, i.e. how long a request waited before it could query.
+    """
+
+    class InstrumentedPool(pool_class):
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except PoolTimeoutError:
+                waited = time.perf_counter() - started
+                stats.observe(waited, timed_out=True)
+                print(f"⚠️ Timed out after {waited:.1f}s waiting for a database connection "
+                      f"({self.checkedout()} checked out)")
+                raise
+            stats.observe(time.perf_counter() - started)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def pool_status(pool, stats: Optional[PoolStats] = None) -> dict:
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # Negative while the pool has not opened all of its base slots yet.
+        "overflow": pool.overflow(),
+    }
+    if stats is not None:
+        status.update(stats.as_dict())
+    return status
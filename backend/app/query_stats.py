@@ -0,0 +1,134 @@
+import os
+import random
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+class QueryStatsConfig:
+    """Thresholds for the per-request query report, read from the environment."""
+
+    def __init__(self, environ=os.environ):
+        self.sample_rate = float(environ.get("QUERY_STATS_SAMPLE_RATE", "1.0"))
+        self.max_queries = int(environ.get("QUERY_STATS_MAX_QUERIES", "20"))
+        self.max_repeats = int(environ.get("QUERY_STATS_MAX_REPEATS", "5"))
+        self.max_db_ms = float(environ.get("QUERY_STATS_MAX_DB_MS", "500"))
+        self.slow_query_ms = float(environ.get("QUERY_STATS_SLOW_QUERY_MS", "200"))
+        self.server_timing = environ.get("SERVER_TIMING", "false").lower() in TRUE_VALUES
+
+
+class RequestQueries:
+    """Statements one request executed, grouped by their SQL text.
+
+    SQLAlchemy sends bound parameters separately, so two executions of the
+    same query shape have the same text; a shape seen many times in one
+    request is the usual sign of an N+1 loop.
+    """
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.db_seconds = 0.0
+        self.shapes: Dict[str, int] = {}
+        self.slow: List[tuple] = []
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope.get('method', '')} {getattr(route, 'path', self.scope.get('path', ''))}"
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.db_seconds += seconds
+        self.shapes[statement] = self.shapes.get(statement, 0) + 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        return {statement: count for statement, count in self.shapes.items() if count >= threshold}
+
+    def server_timing(self, total_seconds: float) -> str:
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.count} queries", '
+            f'app;dur={max(total_seconds - self.db_seconds, 0.0) * 1000:.1f}'
+        )
+
+
+current_request: ContextVar[Optional[RequestQueries]] = ContextVar("current_request", default=None)
+
+
+def _shorten(statement: str, limit: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+class QueryStatsRecorder:
+    """Statement observer for ``instrument_engine`` plus the per-request report."""
+
+    def __init__(self, config: QueryStatsConfig, log: Callable[[str], None] = print):
+        self.config = config
+        self.log = log
+        self.warnings = 0
+
+    def observe(self, statement: str, seconds: float):
+        queries = current_request.get()
+        if queries is None:
+            return
+        queries.record(statement, seconds)
+        if seconds * 1000 >= self.config.slow_query_ms:
+            queries.slow.append((statement, seconds))
+
+    def report(self, queries: RequestQueries):
+        problems = []
+        if queries.count > self.config.max_queries:
+            problems.append(f"{queries.count} queries")
+        if queries.db_seconds * 1000 > self.config.max_db_ms:
+            problems.append(f"{queries.db_seconds * 1000:.0f} ms in the database")
+        for statement, count in queries.repeated(self.config.max_repeats).items():
+            problems.append(f"{count}x {_shorten(statement)}")
+        for statement, seconds in queries.slow:
+            problems.append(f"slow query ({seconds * 1000:.0f} ms): {_shorten(statement)}")
+        if problems:
+            self.warnings += 1
+            self.log(f"⚠️ {queries.route}: " + "; ".join(problems))
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting ``RequestQueries`` for sampled requests.
+
+    After the response the request is checked against the thresholds and
+    a single warning line names the route and everything it exceeded. With
+    ``SERVER_TIMING`` on, the response also carries a ``Server-Timing``
+    header splitting its time into database and application; queries a
+    streaming response runs after its headers are not included there.
+    """
+
+    def __init__(self, app, recorder: QueryStatsRecorder, sample: Callable[[], float] = random.random,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.app = app
+        self.recorder = recorder
+        self.sample = sample
+        self.clock = clock
+
+    async def __call__(self, scope, receive, send):
+        config = self.recorder.config
+        if scope["type"] != "http" or (config.sample_rate < 1.0 and self.sample() >= config.sample_rate):
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = current_request.set(queries)
+        started = self.clock()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and config.server_timing:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", queries.server_timing(self.clock() - started).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request.reset(token)
+            self.recorder.report(queries)
@@ -0,0 +1,303 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import datetime, date
+from typing import Callable, Dict, List, Optional, Set
+
+import psycopg
+from psycopg import sql
+from fastapi import WebSocket
+from sqlalchemy import text
+
+
+class Subscriber:
+    """A connected socket with its own bounded outbox and writer task."""
+
+    def __init__(self, websocket: WebSocket, user_token: str, queue_size: int):
+        self.websocket = websocket
+        self.user_token = user_token
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.needs_resync = False
+        self.writer: Optional[asyncio.Task] = None
+
+
+class ConnectionManager:
+    """Fans change events out to every connected WebSocket.
+
+    Messages are serialized once per broadcast and pushed onto each
+    subscriber's queue without awaiting the socket, so a broadcast costs the
+    same however slow individual clients are. A subscriber whose queue fills
+    up has its backlog replaced by a single ``resync`` message telling the
+    client to refetch; a socket that cannot accept a frame within
+    ``send_timeout`` seconds is closed.
+    """
+
+    def __init__(self, queue_size: int = 256, send_timeout: float = 10.0):
+        self.active_connections: Dict[str, Set[WebSocket]] = {}
+        self.connection_lock = threading.Lock()
+        self.change_listeners: List[Callable[[dict], None]] = []
+        self.event_handlers: Dict[str, Callable[[dict], None]] = {}
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self._subscribers: Dict[WebSocket, Subscriber] = {}
+        self.backend: Optional["PostgresBroadcastBackend"] = None
+        self.messages_sent = 0
+        self.resyncs = 0
+        self.dropped_connections = 0
+        # Called with (seconds, recipients) after every fan-out.
+        self.fanout_observer: Optional[Callable[[float, int], None]] = None
+
+    def add_change_listener(self, listener: Callable[[dict], None]):
+        self.change_listeners.append(listener)
+
+    def add_event_handler(self, event_type: str, handler: Callable[[dict], None]):
+        """Handle ``event_type`` in-process instead of sending it to sockets."""
+        self.event_handlers[event_type] = handler
+
+    def connect(self, websocket: WebSocket, user_token: str) -> Subscriber:
+        subscriber = Subscriber(websocket, user_token, self.queue_size)
+        with self.connection_lock:
+            if user_token not in self.active_connections:
+                self.active_connections[user_token] = set()
+            self.active_connections[user_token].add(websocket)
+            self._subscribers[websocket] = subscriber
+        subscriber.writer = asyncio.create_task(self._write(subscriber))
+        return subscriber
+
+    def disconnect(self, websocket: WebSocket, user_token: str):
+        with self.connection_lock:
+            if user_token in self.active_connections:
+                self.active_connections[user_token].discard(websocket)
+                if not self.active_connections[user_token]:
+                    del self.active_connections[user_token]
+            subscriber = self._subscribers.pop(websocket, None)
+        if subscriber and subscriber.writer and subscriber.writer is not asyncio.current_task():
+            subscriber.writer.cancel()
+
+    async def broadcast_data_change(self, change_type: str, entity_type: str, entity_id: str, data: dict):
+        serializable_data = self._make_serializable(data)
+
+        message = {
+            "type": "data_change",
+            "change_type": change_type,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "data": serializable_data,
+            "timestamp": datetime.now().isoformat()
+        }
+
+        await self.publish(message)
+
+    async def broadcast_resync(self, reason: str):
+        """Tell every client, on every instance, to refetch everything."""
+        await self.publish({
+            "type": "resync",
+            "reason": reason,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    async def publish(self, message: dict):
+        """Deliver ``message`` here and, with a broadcast backend, everywhere else."""
+        self.deliver(message)
+        if self.backend is not None:
+            await self.backend.publish(message)
+
+    def resync_all(self, reason: str):
+        self.deliver({
+            "type": "resync",
+            "reason": reason,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    def deliver(self, message: dict):
+        """Run change listeners and fan ``message`` out to local sockets."""
+        handler = self.event_handlers.get(message.get("type"))
+        if handler is not None:
+            try:
+                handler(message)
+            except Exception as e:
+                print(f"Error in {message.get('type')} handler: {e}")
+            return
+
+        for listener in self.change_listeners:
+            try:
+                listener(message)
+            except Exception as e:
+                print(f"Error in change listener: {e}")
+
+        self.send_to_all(message)
+
+    def send_to_all(self, message: dict):
+        started = time.perf_counter()
+        text = json.dumps(message)
+        with self.connection_lock:
+            subscribers = list(self._subscribers.values())
+        for subscriber in subscribers:
+            self._enqueue(subscriber, text)
+        if self.fanout_observer is not None:
+            self.fanout_observer(time.perf_counter() - started, len(subscribers))
+
+    def _enqueue(self, subscriber: Subscriber, text: str):
+        if subscriber.needs_resync:
+            return
+        try:
+            subscriber.queue.put_nowait(text)
+        except asyncio.QueueFull:
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(self._resync_message())
+            subscriber.needs_resync = True
+            self.resyncs += 1
+
+    def _resync_message(self) -> str:
+        return json.dumps({
+            "type": "resync",
+            "reason": "backpressure",
+            "timestamp": datetime.now().isoformat()
+        })
+
+    async def _write(self, subscriber: Subscriber):
+        try:
+            while True:
+                text = await subscriber.queue.get()
+                await asyncio.wait_for(subscriber.websocket.send_text(text), self.send_timeout)
+                self.messages_sent += 1
+                if subscriber.needs_resync and subscriber.queue.empty():
+                    subscriber.needs_resync = False
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error sending WebSocket message: {e}")
+            self.dropped_connections += 1
+            self.disconnect(subscriber.websocket, subscriber.user_token)
+            try:
+                await subscriber.websocket.close(code=1011)
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        with self.connection_lock:
+            subscribers = list(self._subscribers.values())
+        return {
+            "connections": len(subscribers),
+            "queued_messages": sum(subscriber.queue.qsize() for subscriber in subscribers),
+            "messages_sent": self.messages_sent,
+            "resyncs": self.resyncs,
+            "dropped_connections": self.dropped_connections,
+        }
+
+    def _make_serializable(self, obj):
+        """Convert datetime objects to ISO format strings for JSON serialization"""
+        if isinstance(obj, dict):
+            return {key: self._make_serializable(value) for key, value in obj.items()}
+        elif isinstance(obj, list):
+            return [self._make_serializable(item) for item in obj]
+        elif isinstance(obj, (date, datetime)):
+            return obj.isoformat()
+        else:
+            return obj
+
+
+class PostgresBroadcastBackend:
+    """Relays change events between processes over Postgres LISTEN/NOTIFY.
+
+    Events are still delivered to local sockets first; the backend publishes
+    them with ``pg_notify`` and a single LISTEN connection per process feeds
+    events from other processes into the local fan-out. Events from this
+    process are recognised by ``instance_id`` and skipped.
+    """
+
+    # NOTIFY payloads are capped at 8000 bytes.
+    MAX_PAYLOAD_BYTES = 7900
+
+    def __init__(self, manager: ConnectionManager, dsn: str, publish_engine, channel: str = "lexcloud_changes",
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.manager = manager
+        self.dsn = dsn
+        self.publish_engine = publish_engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.instance_id = uuid.uuid4().hex
+        self.listening = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._connection: Optional[psycopg.AsyncConnection] = None
+        self.published = 0
+        self.received = 0
+
+    def start(self):
+        self.manager.backend = self
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self.manager.backend is self:
+            self.manager.backend = None
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._connection is not None:
+            await self._connection.close()
+
+    def _encode(self, message: dict) -> str:
+        payload = json.dumps({"origin": self.instance_id, "message": message})
+        if len(payload.encode()) > self.MAX_PAYLOAD_BYTES:
+            message = {**message, "data": {}, "truncated": True}
+            payload = json.dumps({"origin": self.instance_id, "message": message})
+        return payload
+
+    async def publish(self, message: dict):
+        try:
+            async with self.publish_engine.begin() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": self._encode(message)}
+                )
+            self.published += 1
+        except Exception as e:
+            print(f"Error publishing change notification: {e}")
+
+    def _handle(self, payload: str):
+        try:
+            envelope = json.loads(payload)
+        except ValueError:
+            print(f"Ignoring malformed change notification: {payload[:200]}")
+            return
+        if envelope.get("origin") == self.instance_id:
+            return
+        self.received += 1
+        self.manager.deliver(envelope["message"])
+
+    async def _listen(self):
+        delay = self.reconnect_delay
+        connected_before = False
+        while True:
+            try:
+                self._connection = await psycopg.AsyncConnection.connect(self.dsn, autocommit=True)
+                await self._connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                self.listening.set()
+                delay = self.reconnect_delay
+                if connected_before:
+                    # Anything published while we were away is lost.
+                    self.manager.resync_all("listener_reconnected")
+                connected_before = True
+                async for notify in self._connection.notifies():
+                    self._handle(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Change listener connection lost: {e}")
+            finally:
+                self.listening.clear()
+                if self._connection is not None:
+                    try:
+                        await self._connection.close()
+                    except Exception:
+                        pass
+                    self._connection = None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
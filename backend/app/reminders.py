@@ -0,0 +1,390 @@
+import asyncio
+import bisect
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_, select
+
+from app.database import CaseDB, CompensationLetterDB, ExecutionDB
+
+# (entity type, entity id, kind); kind is "reminder" or "hearing".
+ReminderKey = Tuple[str, str, str]
+
+# Free-text notes are cut to what a dashboard card shows, both when read
+# from the database and when taken from a change event, so a long case
+# description is never held in the index.
+TEXT_FIELDS = ("description", "reminder_text")
+TEXT_PREVIEW_LENGTH = 280
+
+# How far ahead the index looks. The dashboard shows the next 7 days, so
+# rows dated further out are neither loaded nor kept.
+REMINDER_HORIZON_DAYS = 7
+
+
+def _preview(text: Optional[str]) -> Optional[str]:
+    if text is None or len(text) <= TEXT_PREVIEW_LENGTH:
+        return text
+    return text[:TEXT_PREVIEW_LENGTH - 1] + "…"
+
+
+def _case_reminder(row: dict, day: date) -> dict:
+    return {
+        "type": "case",
+        "case_id": row["id"],
+        "case_number": row["case_number"],
+        "case_name": row["case_name"],
+        "court": row["court"],
+        "client_name": row["client_name"],
+        "defendant": row["defendant"],
+        "reminder_date": day.isoformat(),
+        "description": _preview(row["description"]),
+        "responsible_person": row["responsible_person"],
+        "görevlendiren": row["görevlendiren"],
+    }
+
+
+def _case_hearing(row: dict, day: date) -> dict:
+    return {
+        "case_id": row["id"],
+        "case_title": row["title"],
+        "case_number": row["case_number"],
+        "client_name": row["client_name"],
+        "hearing_date": day.isoformat(),
+        "court": row["court"],
+        "defendant": row["defendant"],
+    }
+
+
+def _execution_reminder(row: dict, day: date) -> dict:
+    return {
+        "type": "execution",
+        "execution_id": row["id"],
+        "execution_number": row["execution_number"],
+        "execution_office": row["execution_office"],
+        "client_name": row["client_name"],
+        "defendant": row["defendant"],
+        "reminder_date": day.isoformat(),
+        "reminder_text": _preview(row["reminder_text"]),
+        "responsible_person": row["responsible_person"],
+        "görevlendiren": row["görevlendiren"],
+    }
+
+
+def _letter_reminder(row: dict, day: date) -> dict:
+    return {
+        "type": "compensation_letter",
+        "compensation_letter_id": row["id"],
+        "letter_number": row["letter_number"],
+        "court": row["court"],
+        "case_number": row["case_number"],
+        "customer": row["customer"],
+        "client_name": row["client_name"],
+        "reminder_date": day.isoformat(),
+        "reminder_text": _preview(row["reminder_text"]),
+        "responsible_person": row["responsible_person"],
+        "görevlendiren": row["görevlendiren"],
+    }
+
+
+# Per entity type: the model and, per kind, the date column it is keyed on
+# and how an entry is rendered from a row.
+REMINDER_SOURCES = {
+    "case": (CaseDB, {"reminder": ("reminder_date", _case_reminder), "hearing": ("next_hearing_date", _case_hearing)}),
+    "execution": (ExecutionDB, {"reminder": ("reminder_date", _execution_reminder)}),
+    "compensation_letter": (CompensationLetterDB, {"reminder": ("reminder_date", _letter_reminder)}),
+}
+
+# Row fields each renderer reads, i.e. what a change event must carry for
+# the index to update from it without going back to the database.
+REMINDER_FIELDS = {
+    "case": ("id", "title", "case_number", "case_name", "court", "client_name", "defendant", "description",
+             "responsible_person", "görevlendiren", "reminder_date", "next_hearing_date"),
+    "execution": ("id", "execution_number", "execution_office", "client_name", "defendant", "reminder_text",
+                  "responsible_person", "görevlendiren", "reminder_date"),
+    "compensation_letter": ("id", "letter_number", "court", "case_number", "customer", "client_name",
+                            "reminder_text", "responsible_person", "görevlendiren", "reminder_date"),
+}
+
+
+def _as_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+class ReminderIndex:
+    """Upcoming reminder and hearing dates, kept sorted in memory.
+
+    Entries are rendered once, when a row is indexed, in the shape the
+    dashboard returns; reads only slice the sorted list and add
+    ``days_until``. Only dates from ``floor`` to ``ceiling`` are indexed.
+    """
+
+    def __init__(self, horizon_days: int = REMINDER_HORIZON_DAYS):
+        self.horizon_days = horizon_days
+        self.floor: Optional[date] = None
+        self.ceiling: Optional[date] = None
+        self.loaded = False
+        self._entries: Dict[ReminderKey, Tuple[date, dict]] = {}
+        self._order: List[Tuple[date, ReminderKey]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _put(self, key: ReminderKey, day: date, entry: dict):
+        self._discard(key)
+        self._entries[key] = (day, entry)
+        bisect.insort(self._order, (day, key))
+
+    def _discard(self, key: ReminderKey):
+        current = self._entries.pop(key, None)
+        if current is not None:
+            position = bisect.bisect_left(self._order, (current[0], key))
+            del self._order[position]
+
+    def index_row(self, entity_type: str, row: dict):
+        for kind, (column, render) in REMINDER_SOURCES[entity_type][1].items():
+            key = (entity_type, row["id"], kind)
+            day = _as_date(row.get(column))
+            if day is None or (self.floor is not None and not self.floor <= day <= self.ceiling):
+                self._discard(key)
+                continue
+            self._put(key, day, render(row, day))
+
+    def remove(self, entity_type: str, entity_id: str):
+        for kind in REMINDER_SOURCES[entity_type][1]:
+            self._discard((entity_type, entity_id, kind))
+
+    def replace(self, entity_type: str, rows: List[dict]):
+        for key in [key for key in self._entries if key[0] == entity_type]:
+            self._discard(key)
+        for row in rows:
+            self.index_row(entity_type, row)
+
+    def roll(self, today: date):
+        """Drop entries before ``today`` and move the window to start there."""
+        self.floor = today
+        self.ceiling = today + timedelta(days=self.horizon_days)
+        position = bisect.bisect_left(self._order, (today,))
+        for _, key in self._order[:position]:
+            del self._entries[key]
+        del self._order[:position]
+
+    def on(self, day: date) -> List[Tuple[ReminderKey, dict]]:
+        low = bisect.bisect_left(self._order, (day,))
+        high = bisect.bisect_left(self._order, (day + timedelta(days=1),))
+        return [(key, self._entries[key][1]) for _, key in self._order[low:high]]
+
+    def between(self, start: date, end: date, kind: str, today: date) -> List[dict]:
+        low = bisect.bisect_left(self._order, (start,))
+        high = bisect.bisect_left(self._order, (end + timedelta(days=1),))
+        return [
+            {**self._entries[key][1], "days_until": (day - today).days}
+            for day, key in self._order[low:high]
+            if key[2] == kind
+        ]
+
+
+class ReminderScheduler:
+    """Keeps a ReminderIndex current and announces reminders as they fall due.
+
+    The index covers ``horizon_days`` from today and is loaded once at
+    start. Change events with full rows update it in place; bulk changes,
+    renames, truncated events and resyncs mark the affected entity types
+    for a reload from the database. At midnight the index rolls forward,
+    reloads to take in the day that entered the window, and everything due
+    that day is announced with a single ``reminder_due`` message; a
+    reminder moved onto today is announced as soon as its change event
+    arrives.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        notify: Callable[[dict], None],
+        on_change: Callable[[], None] = lambda: None,
+        today: Callable[[], date] = date.today,
+        now: Callable[[], datetime] = datetime.now,
+        max_sleep: float = 3600.0,
+        horizon_days: int = REMINDER_HORIZON_DAYS
+    ):
+        self.session_factory = session_factory
+        self.notify = notify
+        self.on_change = on_change
+        self.today = today
+        self.now = now
+        self.max_sleep = max_sleep
+        self.index = ReminderIndex(horizon_days)
+        self.announced: Set[ReminderKey] = set()
+        self.announcements = 0
+        self._dirty: Set[str] = set()
+        # Change events applied in place while a type is being fetched,
+        # replayed once the fetched rows have replaced the index's.
+        self._replay: Dict[str, List[Tuple[str, str, dict]]] = {}
+        self._wake = asyncio.Event()
+        self._load_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _fetch(self, entity_type: str, today: date, ceiling: date) -> List[dict]:
+        model, kinds = REMINDER_SOURCES[entity_type]
+        date_columns = [getattr(model, column) for column, _ in kinds.values()]
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(*(
+                    # One character over the limit, so _preview still knows to add the ellipsis.
+                    func.left(getattr(model, field), TEXT_PREVIEW_LENGTH + 1).label(field) if field in TEXT_FIELDS
+                    else getattr(model, field)
+                    for field in REMINDER_FIELDS[entity_type]
+                ))
+                .where(model.is_deleted == False, or_(*(column.between(today, ceiling) for column in date_columns)))
+            )
+            return [row._asdict() for row in result]
+
+    async def reload(self, entity_types) -> None:
+        if self.index.floor is None:
+            self.index.roll(self.today())
+        for entity_type in entity_types:
+            # Cleared first: a type marked dirty while the query runs stays
+            # dirty and is reloaded again. A change event applied in place
+            # meanwhile may be newer than what the query sees, so it is
+            # applied again on top of the fetched rows.
+            self._dirty.discard(entity_type)
+            self._replay[entity_type] = []
+            try:
+                rows = await self._fetch(entity_type, self.index.floor, self.index.ceiling)
+            finally:
+                replay = self._replay.pop(entity_type, [])
+            self.index.replace(entity_type, rows)
+            for change_type, entity_id, data in replay:
+                self._apply(entity_type, change_type, entity_id, data)
+        if self.index.loaded:
+            self._announce_due()
+        self.on_change()
+
+    async def ensure_loaded(self):
+        if self.index.loaded:
+            return
+        async with self._load_lock:
+            if not self.index.loaded:
+                today = self.today()
+                self.index.roll(today)
+                await self.reload(REMINDER_SOURCES)
+                # Whatever is already due was there before this process
+                # started; only what falls due from now on is announced.
+                self.announced = {key for key, _ in self.index.on(today)}
+                self.index.loaded = True
+
+    def handle_change(self, message: dict):
+        """Change listener: apply a broadcast event to the index."""
+        if message.get("type") == "resync":
+            self._mark_dirty(REMINDER_SOURCES)
+            return
+        if message.get("type") != "data_change":
+            return
+
+        entity_type = message.get("entity_type")
+        data = message.get("data") or {}
+        if entity_type == "client":
+            # A rename rewrote client_name on dependent rows.
+            self._mark_dirty([t for t, count in (data.get("propagated") or {}).items() if count and t in REMINDER_SOURCES])
+            return
+        if entity_type not in REMINDER_SOURCES:
+            return
+
+        change_type = message.get("change_type")
+        if change_type == "delete" or (
+            change_type in ("create", "update") and all(field in data for field in REMINDER_FIELDS[entity_type])
+        ):
+            if entity_type in self._replay:
+                self._replay[entity_type].append((change_type, message["entity_id"], data))
+            self._apply(entity_type, change_type, message["entity_id"], data)
+            if self.index.loaded:
+                self._announce_due()
+            self.on_change()
+        else:
+            self._mark_dirty([entity_type])
+
+    def _apply(self, entity_type: str, change_type: str, entity_id: str, data: dict):
+        if change_type == "delete":
+            self.index.remove(entity_type, entity_id)
+        else:
+            self.index.index_row(entity_type, data)
+
+    def _mark_dirty(self, entity_types):
+        self._dirty.update(entity_types)
+        self._wake.set()
+
+    def _announce_due(self):
+        due = [(key, entry) for key, entry in self.index.on(self.index.floor) if key not in self.announced]
+        if not due:
+            return
+        self.announced.update(key for key, _ in due)
+        self.announcements += 1
+        self.notify({
+            "type": "reminder_due",
+            "date": self.index.floor.isoformat(),
+            "reminders": [entry for _, entry in due],
+            "timestamp": self.now().isoformat()
+        })
+
+    def _roll(self, today: date):
+        self.index.roll(today)
+        self.announced = set()
+        self._announce_due()
+        self.on_change()
+        # The window has moved on by a day the index has not loaded yet.
+        self._mark_dirty(REMINDER_SOURCES)
+
+    def _seconds_to_midnight(self) -> float:
+        tomorrow = datetime.combine(self.today() + timedelta(days=1), time.min)
+        return max((tomorrow - self.now()).total_seconds(), 0.0)
+
+    async def _loop(self):
+        while True:
+            # Cleared before _dirty is read: a type marked dirty while the
+            # reload below is awaiting sets it again, and the next pass
+            # starts at once instead of after the sleep.
+            self._wake.clear()
+            try:
+                await self.ensure_loaded()
+                if self.today() != self.index.floor:
+                    self._roll(self.today())
+                if self._dirty:
+                    await self.reload(list(self._dirty))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Reminder index refresh failed: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=min(self._seconds_to_midnight() + 1, self.max_sleep))
+            except asyncio.TimeoutError:
+                pass
+
+    def upcoming(self, days: int = REMINDER_HORIZON_DAYS) -> Dict[str, List[dict]]:
+        """Reminders and hearings in the next ``days``, at most ``horizon_days``."""
+        today = self.today()
+        end = today + timedelta(days=min(days, self.index.horizon_days))
+        return {
+            "upcoming_reminders": self.index.between(today, end, "reminder", today),
+            "upcoming_hearings": self.index.between(today, end, "hearing", today),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.index.loaded,
+            "entries": len(self.index),
+            "floor": self.index.floor.isoformat() if self.index.floor else None,
+            "pending_reloads": sorted(self._dirty),
+            "announcements": self.announcements,
+        }
@@ -0,0 +1,157 @@
+import json
+import time
+import zlib
+from typing import AsyncIterator, Dict, Optional
+
+import psycopg
+from fastapi import HTTPException
+
+from app.backup import BACKUP_FORMAT_VERSION, BACKUP_TABLES, column_names
+from app.database import async_engine
+
+
+async def _lines(chunks: AsyncIterator[bytes], gzipped: bool) -> AsyncIterator[bytes]:
+    decompressor = zlib.decompressobj(31) if gzipped else None
+    buffer = b""
+    async for chunk in chunks:
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if decompressor is not None:
+        buffer += decompressor.flush()
+    if buffer.strip():
+        yield buffer
+
+
+async def _next_record(lines: AsyncIterator[bytes]) -> Optional[dict]:
+    line = await anext(lines, None)
+    if line is None:
+        return None
+    try:
+        record = json.loads(line)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Backup file is not valid NDJSON")
+    if not isinstance(record, dict):
+        raise HTTPException(status_code=400, detail="Backup file is not valid NDJSON")
+    return record
+
+
+def _table_row(record: Optional[dict]) -> Optional[dict]:
+    if record is not None and (record.get("table") not in BACKUP_TABLES or not isinstance(record.get("row"), dict)):
+        raise HTTPException(status_code=400, detail=f"Unknown table in backup: {record.get('table')}")
+    return record
+
+
+def _upsert_sql(table: str) -> str:
+    columns = column_names(BACKUP_TABLES[table])
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    # Restored rows are stamped with the time they are written, not the
+    # backup's, so sync, polling and list ETags all see them as changed.
+    # clock_timestamp() rather than now(): now() is when the transaction
+    # began, before the COPY, and a restore that runs longer than
+    # SYNC_GRACE would commit rows behind positions clients have already
+    # moved past.
+    values = ", ".join("clock_timestamp()" if column == "updated_at" else f'"{column}"' for column in columns)
+    # The version only moves forward, including when a row is undeleted
+    # from a backup older than its soft delete.
+    assignments = ", ".join(
+        '"updated_at" = clock_timestamp()' if column == "updated_at"
+        else f'"version" = GREATEST({table}.version + 1, EXCLUDED.version)' if column == "version"
+        else f'"{column}" = EXCLUDED."{column}"'
+        for column in columns if column != "id"
+    )
+    # DISTINCT ON keeps the newest version when a file repeats an id. The
+    # WHERE clause leaves rows alone unless the file has a newer version,
+    # or has the row live where it has since been soft deleted (deletes do
+    # not bump the version).
+    return f"""
+        WITH upserted AS (
+            INSERT INTO {table} ({column_list})
+            SELECT DISTINCT ON (id) {values} FROM restore_{table} ORDER BY id, version DESC
+            ON CONFLICT (id) DO UPDATE SET {assignments}
+            WHERE {table}.version < EXCLUDED.version
+               OR ({table}.is_deleted AND NOT EXCLUDED.is_deleted)
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+    """
+
+
+async def restore_backup(chunks: AsyncIterator[bytes], gzipped: bool = False) -> Dict[str, dict]:
+    """Load an NDJSON backup produced by /api/backup in one transaction.
+
+    Rows are streamed with COPY into temporary staging tables, one per
+    table, and then merged into the real tables with a single
+    INSERT ... ON CONFLICT per table. An existing row is only replaced when
+    the backup holds a newer version of it or a live copy of a row deleted
+    since, and every row written gets the time it was written as its
+    ``updated_at``. Returns per-table counts and
+    timings.
+    """
+    stats = {
+        table: {"rows": 0, "inserted": 0, "updated": 0, "skipped": 0, "copy_ms": 0.0, "upsert_ms": 0.0}
+        for table in BACKUP_TABLES
+    }
+
+    async with async_engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        pg: psycopg.AsyncConnection = raw.driver_connection
+        try:
+            async with pg.cursor() as cur:
+                for table in BACKUP_TABLES:
+                    await cur.execute(
+                        f"CREATE TEMP TABLE restore_{table} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+
+                lines = _lines(chunks, gzipped)
+                header = await _next_record(lines)
+                if not header or header.get("format") != "lexcloud-backup":
+                    raise HTTPException(status_code=400, detail="Not a LexCloud backup file")
+                version = header.get("version", 0)
+                if not isinstance(version, int) or isinstance(version, bool):
+                    raise HTTPException(status_code=400, detail="Backup file has an invalid format version")
+                if version > BACKUP_FORMAT_VERSION:
+                    raise HTTPException(status_code=400, detail="Backup file was written by a newer version")
+
+                record = _table_row(await _next_record(lines))
+                while record is not None:
+                    table = record["table"]
+                    columns = column_names(BACKUP_TABLES[table])
+                    column_list = ", ".join(f'"{column}"' for column in columns)
+                    started = time.perf_counter()
+                    async with cur.copy(f"COPY restore_{table} ({column_list}) FROM STDIN") as copy:
+                        while record is not None and record["table"] == table:
+                            await copy.write_row([record["row"].get(column) for column in columns])
+                            stats[table]["rows"] += 1
+                            record = _table_row(await _next_record(lines))
+                    stats[table]["copy_ms"] += (time.perf_counter() - started) * 1000
+
+                for table in BACKUP_TABLES:
+                    if not stats[table]["rows"]:
+                        continue
+                    started = time.perf_counter()
+                    await cur.execute(_upsert_sql(table))
+                    inserted, updated = await cur.fetchone()
+                    stats[table].update(
+                        inserted=inserted,
+                        updated=updated,
+                        skipped=stats[table]["rows"] - inserted - updated,
+                        upsert_ms=(time.perf_counter() - started) * 1000
+                    )
+            await pg.commit()
+        except psycopg.Error as e:
+            await pg.rollback()
+            print(f"Error restoring backup: {e}")
+            raise HTTPException(status_code=400, detail=f"Restore failed: {e.diag.message_primary or e}")
+        except BaseException:
+            await pg.rollback()
+            raise
+
+    for table_stats in stats.values():
+        table_stats["copy_ms"] = round(table_stats["copy_ms"], 2)
+        table_stats["upsert_ms"] = round(table_stats["upsert_ms"], 2)
+    return stats
@@ -0,0 +1,45 @@
+from sqlalchemy import func, literal_column, or_, Select
+
+from app.database import CaseDB
+
+# These expressions must stay textually in sync with the GIN indexes in
+# alembic/versions/005_case_search_indexes.py, otherwise the planner will
+# not match them against the index and falls back to a sequential scan.
+CASE_SEARCH_TEXT = (
+    "lexcloud_fold(title || ' ' || case_number || ' ' || defendant || ' ' || client_name)"
+)
+CASE_SEARCH_VECTOR = (
+    "(setweight(to_tsvector('simple'::regconfig, lexcloud_fold(title || ' ' || case_number)), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, lexcloud_fold(defendant || ' ' || client_name)), 'B'))"
+)
+
+# Trigram indexes cannot answer substring matches shorter than a trigram.
+MIN_SUBSTRING_LENGTH = 3
+
+search_text = literal_column(CASE_SEARCH_TEXT)
+search_vector = literal_column(CASE_SEARCH_VECTOR)
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def apply_case_search(query: Select, q: str) -> Select:
+    """Filter ``query`` to cases matching ``q`` and order them by relevance.
+
+    Matches are whole words (full text), substrings such as partial case
+    numbers (trigram LIKE) or near-misses in names (trigram word
+    similarity). Input is folded the same way as the indexed text, so
+    "ISTANBUL", "İstanbul" and "istanbul" are equivalent.
+    """
+    folded = func.lexcloud_fold(q)
+    ts_query = func.plainto_tsquery(literal_column("'simple'::regconfig"), folded)
+    matches = [search_vector.op("@@")(ts_query)]
+
+    if len(q.strip()) >= MIN_SUBSTRING_LENGTH:
+        pattern = func.lexcloud_fold("%" + escape_like(q.strip()) + "%")
+        matches.append(search_text.like(pattern, escape="\\"))
+        matches.append(folded.op("<%")(search_text))
+
+    rank = func.ts_rank_cd(search_vector, ts_query) + func.word_similarity(folded, search_text)
+    return query.where(or_(*matches)).order_by(rank.desc(), CaseDB.updated_at.desc(), CaseDB.id)
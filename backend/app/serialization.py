@@ -0,0 +1,47 @@
+import json
+from datetime import date, datetime
+from typing import Any, List, Sequence, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(Response):
+    """JSON response that skips FastAPI's response_model validation pass.
+
+    Content must already be plain dicts/lists of JSON-compatible values,
+    dates and datetimes. Encoded with orjson when it is installed and with
+    the standard library otherwise; both produce the same ISO timestamps
+    FastAPI would.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def projection(schema: Type[BaseModel], model) -> list:
+    """ORM columns for every field of ``schema``, in the schema's field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def rows_as_dicts(rows: Sequence) -> List[dict]:
+    return [row._asdict() for row in rows]
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+
+# Taken when this module is first imported, which main.py does before any
+# other application import, so the "import" phase covers loading the app.
+PROCESS_STARTED = time.perf_counter()
+
+STARTUP_MODES = ("full", "fast")
+
+ALEMBIC_DIR = Path(__file__).parent.parent / "alembic"
+
+
+def startup_mode() -> str:
+    mode = os.getenv("STARTUP_MODE", "full").lower()
+    if mode not in STARTUP_MODES:
+        raise ValueError(f"STARTUP_MODE must be one of {', '.join(STARTUP_MODES)}")
+    return mode
+
+
+class StartupReport:
+    """Wall-clock timings of the startup phases and the readiness flag.
+
+    Phases may run concurrently; each records its own duration, and
+    ``total_ms`` is measured from process import to ``finish()``. The
+    instance is ready once startup has finished and no required phase
+    has failed; an optional phase's failure is only reported.
+    """
+
+    def __init__(self, mode: str, clock=time.perf_counter, started: float = PROCESS_STARTED):
+        self.mode = mode
+        self._clock = clock
+        self.started = started
+        self.phases: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.optional: Set[str] = set()
+        self.total_ms: Optional[float] = None
+        self.finished = False
+
+    @property
+    def ready(self) -> bool:
+        return self.finished and all(name in self.optional for name in self.errors)
+
+    def _elapsed_ms(self, since: float) -> float:
+        return round((self._clock() - since) * 1000, 2)
+
+    def mark(self, name: str):
+        """Record a phase that ran from process start until now."""
+        self.phases[name] = self._elapsed_ms(self.started)
+
+    @asynccontextmanager
+    async def phase(self, name: str, required: bool = True):
+        """Time a phase; a failure is recorded and does not stop startup."""
+        if not required:
+            self.optional.add(name)
+        started = self._clock()
+        try:
+            yield
+        except Exception as e:
+            self.errors[name] = str(e)
+            print(f"⚠️ Startup phase {name} failed: {e}")
+        finally:
+            self.phases[name] = self._elapsed_ms(started)
+
+    def resolve(self, name: str):
+        """Clear the error of a phase that has since succeeded in the background."""
+        if self.errors.pop(name, None) is not None:
+            print(f"✅ Startup phase {name} recovered")
+
+    def finish(self):
+        self.total_ms = self._elapsed_ms(self.started)
+        self.finished = True
+        print(json.dumps({"event": "startup", **self.as_dict()}))
+
+    def as_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "ready": self.ready,
+            "total_ms": self.total_ms,
+            "phases": self.phases,
+            "errors": self.errors,
+        }
+
+
+async def warm_pool(engine, connections: int) -> int:
+    """Open up to ``connections`` pooled connections at once.
+
+    Each connection is checked out concurrently so the pool really opens
+    that many, then returned; capped at the pool size, since overflow
+    connections would be closed again on return.
+    """
+    connections = min(connections, engine.pool.size())
+    if connections <= 0:
+        return 0
+
+    opened = await asyncio.gather(*(engine.connect() for _ in range(connections)))
+    try:
+        await asyncio.gather(*(connection.execute(text("SELECT 1")) for connection in opened))
+    finally:
+        await asyncio.gather(*(connection.close() for connection in opened))
+    return connections
+
+
+def alembic_head() -> Optional[str]:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    return ScriptDirectory.from_config(config).get_current_head()
+
+
+async def check_schema(engine) -> str:
+    """Fail when the database is not at the Alembic head revision.
+
+    Read-only: the schema is changed by ``alembic upgrade head`` on
+    release, never at startup.
+    """
+    head = alembic_head()
+    current = None
+    async with engine.connect() as connection:
+        if await connection.scalar(text("SELECT to_regclass('alembic_version') IS NOT NULL")):
+            current = await connection.scalar(text("SELECT version_num FROM alembic_version"))
+    if current != head:
+        raise RuntimeError(f"Database schema is at {current or 'no revision'}, expected {head}; run alembic upgrade head")
+    print(f"✅ Database schema at {head}")
+    return head
@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel
+from sqlalchemy import Select, exists, select, tuple_
+
+Position = Tuple[datetime, str]
+
+# Rows are stamped with updated_at before their transaction commits, so a
+# slow writer can become visible with a timestamp older than rows a poll
+# has already seen. Positions never advance past now - grace, which makes
+# every row in that window be re-sent until the window has passed.
+SYNC_GRACE = timedelta(seconds=5)
+
+
+def encode_sync_token(positions: Dict[str, Position]) -> str:
+    payload = {entity: [updated_at.isoformat(), entity_id] for entity, (updated_at, entity_id) in positions.items()}
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_sync_token(token: Optional[str]) -> Dict[str, Position]:
+    if not token:
+        return {}
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {
+            str(entity): (datetime.fromisoformat(updated_at), str(entity_id))
+            for entity, (updated_at, entity_id) in payload.items()
+        }
+    except (binascii.Error, ValueError, TypeError, AttributeError, UnicodeDecodeError):
+        raise ValueError("Malformed sync token")
+
+
+def sync_row(schema: Type[BaseModel], row) -> BaseModel:
+    """A changed ORM row as the entity's API schema, field by field."""
+    return schema(**{field: getattr(row, field) for field in schema.model_fields})
+
+
+def changed_since(model, position: Optional[Position]):
+    if position is None:
+        return model.is_deleted == False
+    return tuple_(model.updated_at, model.id) > tuple_(*position)
+
+
+def changes_probe(models: Dict[str, object], positions: Dict[str, Position]) -> Select:
+    """One round trip answering "did anything change?" for every entity."""
+    return select(*(
+        exists().where(changed_since(model, positions.get(entity))).label(entity)
+        for entity, model in models.items()
+    ))
+
+
+def changes_query(model, position: Optional[Position], limit: int) -> Select:
+    return (
+        select(model)
+        .where(changed_since(model, position))
+        .order_by(model.updated_at, model.id)
+        .limit(limit + 1)
+    )
+
+
+def advance_position(previous: Optional[Position], rows: Sequence, limit: int, now: datetime) -> Tuple[Optional[Position], bool]:
+    """Return the position to resume from and whether more rows are waiting."""
+    if not rows:
+        return previous, False
+    has_more = len(rows) > limit
+    last = rows[limit - 1] if has_more else rows[-1]
+    horizon = (now - SYNC_GRACE, "")
+    position = (last.updated_at, last.id)
+    if position > horizon:
+        # The page reaches into the grace window: everything before it has
+        # been sent, and the rest is re-sent by the next poll anyway, so
+        # there is nothing further to fetch right now.
+        position, has_more = horizon, False
+        if previous is not None and previous > position:
+            position = previous
+    return position, has_more
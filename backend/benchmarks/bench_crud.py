@@ -0,0 +1,117 @@
+"""
+Micro-benchmark for single-row CRUD: the old hand-written case handlers vs
+the generated CrudResource routes.
+
+Both paths run against the database configured by DATABASE_URL, on one
+existing case, and stop at the response body bytes:
+
+- handwritten: select(CaseDB) -> setattr per field -> client looked up
+  twice -> commit -> refresh -> db_to_pydantic_case -> response_model
+  validation -> json (the handlers that lived in main.py)
+- generated: cases.fetch / cases.update (column projection,
+  UPDATE ... RETURNING, one client lookup)
+
+Change events are not broadcast in either path.
+
+Usage:
+    python -m benchmarks.bench_crud --repeat 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, CaseDB, ClientDB
+from app.main import Case, CaseUpdate, cases, db_to_pydantic_case
+
+adapter = TypeAdapter(Case)
+
+
+async def no_broadcast(*args):
+    pass
+
+
+async def handwritten_get(db, case_id, version):
+    db_case = (await db.execute(select(CaseDB).where(CaseDB.id == case_id, CaseDB.is_deleted == False))).scalars().first()
+    body = JSONResponse(adapter.dump_python(adapter.validate_python(db_to_pydantic_case(db_case)), mode="json")).body
+    db.expunge_all()
+    return body
+
+
+async def handwritten_update(db, case_id, version):
+    case_update = CaseUpdate(client_id=await client_of(db, case_id), notes="benchmark", version=version)
+    db_case = (await db.execute(select(CaseDB).where(CaseDB.id == case_id, CaseDB.is_deleted == False))).scalars().first()
+    db_client = (await db.execute(select(ClientDB).where(ClientDB.id == case_update.client_id, ClientDB.is_deleted == False))).scalars().first()
+    for field, value in case_update.dict(exclude_unset=True, exclude={"version"}).items():
+        setattr(db_case, field, value)
+    db_client = (await db.execute(select(ClientDB).where(ClientDB.id == case_update.client_id, ClientDB.is_deleted == False))).scalars().first()
+    db_case.client_name = db_client.name
+    db_case.updated_at = datetime.now()
+    db_case.version += 1
+    await db.commit()
+    await db.refresh(db_case)
+    body = JSONResponse(adapter.dump_python(adapter.validate_python(db_to_pydantic_case(db_case)), mode="json")).body
+    db.expunge_all()
+    return body
+
+
+async def generated_get(db, case_id, version):
+    return (await cases.fetch(db, case_id)).body
+
+
+async def generated_update(db, case_id, version):
+    case_update = CaseUpdate(client_id=await client_of(db, case_id), notes="benchmark", version=version)
+    return (await cases.update(db, case_id, case_update, no_broadcast)).body
+
+
+async def client_of(db, case_id):
+    # Not timed separately; both update paths pay for it equally.
+    return await db.scalar(select(CaseDB.client_id).where(CaseDB.id == case_id))
+
+
+async def measure(path, case_id, repeat):
+    async with AsyncSessionLocal() as db:
+        timings = []
+        for _ in range(repeat + 1):
+            version = await db.scalar(select(CaseDB.version).where(CaseDB.id == case_id))
+            await db.commit()
+            started = time.perf_counter()
+            await path(db, case_id, version)
+            timings.append(time.perf_counter() - started)
+    timings = sorted(timings[1:])
+    return {
+        "median_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "best_ms": round(timings[0] * 1000, 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    async with AsyncSessionLocal() as db:
+        case_id = await db.scalar(select(CaseDB.id).where(CaseDB.is_deleted == False).limit(1))
+    if case_id is None:
+        raise SystemExit("No cases in the database")
+
+    report = {}
+    for operation in ("get", "update"):
+        handwritten = await measure(globals()[f"handwritten_{operation}"], case_id, args.repeat)
+        generated = await measure(globals()[f"generated_{operation}"], case_id, args.repeat)
+        report[operation] = {
+            "handwritten": handwritten,
+            "generated": generated,
+            "speedup": round(handwritten["median_ms"] / generated["median_ms"], 2) if generated["median_ms"] else None,
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Overhead of the /metrics instrumentation.
+
+- middleware: a minimal FastAPI route called straight through ASGI (no
+  socket, no server), with and without RequestMetrics in front of it.
+- engine events: ``SELECT 1`` through an AsyncSession on an engine with
+  and without the statement timing events, against DATABASE_URL.
+
+Plain and instrumented calls alternate so drift in the machine or the
+database affects both alike. Each reports the median per-call time and
+the difference, i.e. what the instrumentation adds to every request and
+every query.
+
+Usage:
+    python -m benchmarks.bench_metrics --requests 20000 --queries 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import ASYNC_DATABASE_URL
+from app.metrics import Counter, Gauge, Histogram, RequestMetrics, instrument_engine
+
+
+def make_app(instrumented: bool):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(
+            RequestMetrics,
+            duration=Histogram("duration", "", ["method", "route", "status"]),
+            in_flight=Gauge("in_flight", "")
+        )
+    return app
+
+
+async def call(app, path: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("127.0.0.1", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+def median_us(timings):
+    timings = sorted(timings)
+    return round(timings[len(timings) // 2] * 1e6, 2)
+
+
+async def measure_requests(repeat: int) -> tuple:
+    apps = (make_app(False), make_app(True))
+    timings = ([], [])
+    for app in apps:
+        await call(app, "/items/warmup")
+    for number in range(repeat):
+        for app, app_timings in zip(apps, timings):
+            started = time.perf_counter()
+            await call(app, f"/items/{number}")
+            app_timings.append(time.perf_counter() - started)
+    return tuple(median_us(app_timings) for app_timings in timings)
+
+
+async def measure_queries(repeat: int) -> tuple:
+    engines = (create_async_engine(ASYNC_DATABASE_URL, pool_size=1), create_async_engine(ASYNC_DATABASE_URL, pool_size=1))
+    instrument_engine(engines[1].sync_engine, Histogram("queries", "", ["statement"]), Counter("errors", "", ["statement"]))
+    timings = ([], [])
+    try:
+        sessions = [AsyncSession(engine) for engine in engines]
+        for db in sessions:
+            await db.execute(text("SELECT 1"))
+        for _ in range(repeat):
+            for db, session_timings in zip(sessions, timings):
+                started = time.perf_counter()
+                await db.execute(text("SELECT 1"))
+                session_timings.append(time.perf_counter() - started)
+        for db in sessions:
+            await db.close()
+    finally:
+        for engine in engines:
+            await engine.dispose()
+    return tuple(median_us(session_timings) for session_timings in timings)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    report = {}
+    for name, measure, repeat in (("middleware", measure_requests, args.requests), ("engine_events", measure_queries, args.queries)):
+        plain, instrumented = await measure(repeat)
+        report[name] = {
+            "plain_us": plain,
+            "instrumented_us": instrumented,
+            "overhead_us": round(instrumented - plain, 2),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
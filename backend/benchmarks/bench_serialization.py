@@ -0,0 +1,83 @@
+"""
+Micro-benchmark for list serialization: ORM + pydantic vs column projection.
+
+Both paths read the same page of cases from the database configured by
+DATABASE_URL and produce the response body bytes:
+
+- orm: select(CaseDB) -> db_to_pydantic_case per row -> response_model
+  validation and serialization -> json
+- projected: select(*CASE_COLUMNS) -> plain dicts -> FastJSONResponse
+
+Usage:
+    python -m benchmarks.bench_serialization --limit 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal, CaseDB
+from app.main import CASE_COLUMNS, Case, db_to_pydantic_case, list_response
+from app.serialization import orjson
+
+
+async def orm_path(db, limit):
+    adapter = TypeAdapter(List[Case])
+    result = await db.execute(
+        select(CaseDB).where(CaseDB.is_deleted == False).order_by(CaseDB.updated_at.desc()).limit(limit)
+    )
+    cases = [db_to_pydantic_case(case) for case in result.scalars().all()]
+    content = adapter.dump_python(adapter.validate_python(cases), mode="json")
+    db.expunge_all()
+    return len(cases), JSONResponse(content).body
+
+
+async def projected_path(db, limit):
+    result = await db.execute(
+        select(*CASE_COLUMNS).where(CaseDB.is_deleted == False).order_by(CaseDB.updated_at.desc()).limit(limit)
+    )
+    rows = result.all()
+    return len(rows), list_response(rows).body
+
+
+async def measure(path, limit, repeat):
+    async with AsyncSessionLocal() as db:
+        await path(db, limit)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows, body = await path(db, limit)
+            timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {
+        "rows": rows,
+        "bytes": len(body),
+        "best_ms": round(best * 1000, 2),
+        "rows_per_second": round(rows / best) if rows else None,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orm = await measure(orm_path, args.limit, args.repeat)
+    projected = await measure(projected_path, args.limit, args.repeat)
+    print(json.dumps({
+        "encoder": "orjson" if orjson is not None else "json",
+        "orm": orm,
+        "projected": projected,
+        "speedup": round(orm["best_ms"] / projected["best_ms"], 2) if projected["best_ms"] else None,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
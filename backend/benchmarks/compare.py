@@ -0,0 +1,68 @@
+"""
+Compare two benchmarks.load reports.
+
+Prints, per scenario, throughput and p50/p95/p99 for both runs with the
+relative change, and marks a regression when throughput drops or a
+latency percentile grows by more than --threshold percent. Exits with
+status 1 if anything regressed, so it can gate CI.
+
+Usage:
+    python -m benchmarks.compare before.json after.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+# metric, True if higher is better
+METRICS = [("throughput_rps", True), ("p50_ms", False), ("p95_ms", False), ("p99_ms", False)]
+
+
+def change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if before is None or after is None or before == 0:
+        return None
+    return (after - before) / before * 100
+
+
+def compare(before: dict, after: dict, threshold: float) -> tuple:
+    lines: List[str] = []
+    regressions: List[str] = []
+    if before["meta"].get("dataset") != after["meta"].get("dataset"):
+        lines.append(f"warning: datasets differ: {before['meta'].get('dataset')} vs {after['meta'].get('dataset')}")
+    lines.append(f"{'scenario':<15}{'metric':<16}{before['meta']['commit']:>12}{after['meta']['commit']:>12}{'change':>10}")
+
+    for scenario in sorted(set(before["scenarios"]) & set(after["scenarios"])):
+        for metric, higher_is_better in METRICS:
+            old = before["scenarios"][scenario].get(metric)
+            new = after["scenarios"][scenario].get(metric)
+            delta = change(old, new)
+            regressed = delta is not None and (-delta if higher_is_better else delta) > threshold
+            if regressed:
+                regressions.append(f"{scenario} {metric}")
+            delta_text = f"{delta:+.1f}%" if delta is not None else "n/a"
+            lines.append(f"{scenario:<15}{metric:<16}{old!s:>12}{new!s:>12}{delta_text:>10}{'  REGRESSION' if regressed else ''}")
+
+    errors = {name: result["errors"] for name, result in after["scenarios"].items() if result.get("errors")}
+    if errors:
+        lines.append(f"errors in {after['meta']['commit']}: {errors}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.before) as before, open(args.after) as after:
+        lines, regressions = compare(json.load(before), json.load(after), args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Concurrent latency benchmark for a running LexCloud backend.
+
+Heavy workers hammer the slow endpoints (large case pages, dashboard) while
+probe workers hit cheap endpoints; if handlers block the event loop the probe
+p99 climbs to the duration of the slowest heavy request.
+
+Usage:
+    python -m benchmarks.concurrency --base-url http://localhost:8000 --duration 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import jwt
+
+
+def percentile(samples, pct):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples, errors, duration):
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / duration, 2),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2) if samples else None,
+        "p95_ms": round(percentile(samples, 95) * 1000, 2) if samples else None,
+        "p99_ms": round(percentile(samples, 99) * 1000, 2) if samples else None,
+        "mean_ms": round(statistics.fmean(samples) * 1000, 2) if samples else None,
+    }
+
+
+def make_token(secret):
+    payload = {"sub": "admin", "jti": uuid.uuid4().hex, "exp": datetime.now(timezone.utc) + timedelta(hours=1)}
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+async def worker(client, paths, deadline, samples, errors):
+    i = 0
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        # Failed requests still waited on the event loop, so their latency
+        # counts; dropping them would leave only the lucky fast ones.
+        try:
+            response = await client.get(path)
+            if response.status_code >= 400:
+                errors[0] += 1
+        except httpx.HTTPError:
+            errors[0] += 1
+        samples.append(time.perf_counter() - started)
+
+
+async def run(args):
+    token = args.token or make_token(args.jwt_secret)
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=args.heavy + args.probes)
+    deadline = time.perf_counter() + args.duration
+
+    heavy_paths = [f"/api/cases?limit={args.case_limit}", "/api/dashboard", f"/api/executions?limit={args.case_limit}"]
+    probe_paths = ["/health", "/api/clients?limit=20"]
+
+    heavy_samples, probe_samples = [], []
+    heavy_errors, probe_errors = [0], [0]
+
+    async with httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=args.timeout) as client:
+        tasks = [worker(client, heavy_paths, deadline, heavy_samples, heavy_errors) for _ in range(args.heavy)]
+        tasks += [worker(client, probe_paths, deadline, probe_samples, probe_errors) for _ in range(args.probes)]
+        await asyncio.gather(*tasks)
+
+    return {
+        "base_url": args.base_url,
+        "duration_s": args.duration,
+        "heavy_workers": args.heavy,
+        "probe_workers": args.probes,
+        "heavy": summarize(heavy_samples, heavy_errors[0], args.duration),
+        "probe": summarize(probe_samples, probe_errors[0], args.duration),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("BENCH_TOKEN"))
+    parser.add_argument("--jwt-secret", default=os.getenv("JWT_SECRET"))
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--heavy", type=int, default=4, help="workers requesting slow endpoints")
+    parser.add_argument("--probes", type=int, default=16, help="workers requesting cheap endpoints")
+    parser.add_argument("--case-limit", type=int, default=10000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    if not args.token and not args.jwt_secret:
+        parser.error("either --token or --jwt-secret (JWT_SECRET) is required")
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
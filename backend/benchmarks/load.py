@@ -0,0 +1,225 @@
+"""
+Scripted load scenarios against a running LexCloud backend.
+
+Each scenario runs for --duration seconds with --concurrency workers and
+reports throughput and per-request p50/p95/p99. The JSON output carries
+the git commit and the dataset size; compare two runs with
+benchmarks.compare. Seed the database with benchmarks.seed first.
+
+Scenarios:
+- list_paging: walk /api/cases with keyset cursors, --pages pages deep
+- dashboard:   /api/dashboard
+- search:      /api/cases/search with Turkish terms from the seed data
+- create_update: create a case, update it twice, delete it
+- mixed:       list paging, detail reads, search, dashboard and writes in
+               roughly the proportions the UI produces them
+
+Usage:
+    python -m benchmarks.load --duration 30 --concurrency 8 --output before.json
+    python -m benchmarks.load --scenario search --scenario dashboard
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import date, datetime
+
+import httpx
+
+from app.pagination import NEXT_CURSOR_HEADER
+from benchmarks.concurrency import make_token, summarize
+from benchmarks.seed import CASE_SUBJECTS, CITIES, FIRST_NAMES, LAST_NAMES
+
+SEARCH_TERMS = [*LAST_NAMES[:10], *CASE_SUBJECTS[:6], *CITIES[:5], "yilmaz", "ozturk", "itiraz", "2023/1"]
+
+
+class Session:
+    """One worker's client plus the latencies it recorded."""
+
+    def __init__(self, client: httpx.AsyncClient, context: dict, rng: random.Random):
+        self.client = client
+        self.context = context
+        self.rng = rng
+        self.samples = []
+        self.errors = 0
+
+    async def request(self, method: str, path: str, **kwargs):
+        started = time.perf_counter()
+        # Failed requests are timed too; dropping them would leave the
+        # percentiles covering only the requests that succeeded.
+        try:
+            response = await self.client.request(method, path, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        self.samples.append(time.perf_counter() - started)
+        if response is None or response.status_code >= 400:
+            self.errors += 1
+            return None
+        return response
+
+
+async def list_paging(session: Session):
+    cursor = ""
+    for _ in range(session.context["pages"]):
+        response = await session.request("GET", "/api/cases", params={"limit": session.context["page_size"], "cursor": cursor})
+        if response is None:
+            return
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return
+
+
+async def dashboard(session: Session):
+    await session.request("GET", "/api/dashboard")
+
+
+async def search(session: Session):
+    await session.request("GET", "/api/cases/search", params={"q": session.rng.choice(SEARCH_TERMS), "limit": 50})
+
+
+async def case_detail(session: Session):
+    await session.request("GET", f"/api/cases/{session.rng.choice(session.context['case_ids'])}")
+
+
+async def create_update(session: Session):
+    rng = session.rng
+    response = await session.request("POST", "/api/cases", json={
+        "title": f"Benchmark - {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "client_id": rng.choice(session.context["client_ids"]),
+        "case_type": "Hukuk",
+        "status": "Derdest",
+        "court": f"{rng.choice(CITIES)} 3. Asliye Hukuk Mahkemesi",
+        "case_number": f"{date.today().year}/{rng.randint(1, 99999)} E.",
+        "defendant": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "start_date": date.today().isoformat(),
+        "office_archive_no": "BENCH",
+    })
+    if response is None:
+        return
+    case = response.json()
+    for status in ("Bilirkişi", "Kabul"):
+        response = await session.request("PUT", f"/api/cases/{case['id']}", json={"status": status, "version": case["version"]})
+        if response is None:
+            return
+        case = response.json()
+    await session.request("DELETE", f"/api/cases/{case['id']}")
+
+
+MIXED = [(list_paging, 40), (case_detail, 25), (search, 15), (dashboard, 12), (create_update, 8)]
+
+
+async def mixed(session: Session):
+    step = session.rng.choices([step for step, _ in MIXED], weights=[weight for _, weight in MIXED])[0]
+    await step(session)
+
+
+SCENARIOS = {
+    "list_paging": list_paging,
+    "dashboard": dashboard,
+    "search": search,
+    "create_update": create_update,
+    "mixed": mixed,
+}
+
+
+async def worker(step, session: Session, deadline: float):
+    while time.perf_counter() < deadline:
+        await step(session)
+
+
+async def run_scenario(name: str, client: httpx.AsyncClient, context: dict, args) -> dict:
+    sessions = [Session(client, context, random.Random(f"{args.seed}-{name}-{number}")) for number in range(args.concurrency)]
+    step = SCENARIOS[name]
+    if args.warmup > 0:
+        warmup_deadline = time.perf_counter() + args.warmup
+        await asyncio.gather(*(worker(step, session, warmup_deadline) for session in sessions))
+        for session in sessions:
+            session.samples, session.errors = [], 0
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(step, session, started + args.duration) for session in sessions))
+    elapsed = time.perf_counter() - started
+    samples = [sample for session in sessions for sample in session.samples]
+    return summarize(samples, sum(session.errors for session in sessions), elapsed)
+
+
+async def load_context(client: httpx.AsyncClient, args) -> dict:
+    clients = (await client.get("/api/clients", params={"limit": 200, "cursor": ""})).json()
+    cases = (await client.get("/api/cases", params={"limit": 1000, "cursor": ""})).json()
+    totals = (await client.get("/api/dashboard")).json()
+    if not clients or not cases:
+        raise SystemExit("The database is empty; run python -m benchmarks.seed first")
+    return {
+        "client_ids": [row["id"] for row in clients],
+        "case_ids": [row["id"] for row in cases],
+        "pages": args.pages,
+        "page_size": args.page_size,
+        "dataset": {key: totals.get(key) for key in ("total_cases", "total_clients", "total_executions", "total_compensation_letters")},
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args) -> dict:
+    token = args.token or make_token(args.jwt_secret)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, headers={"Authorization": f"Bearer {token}"},
+                                 limits=limits, timeout=args.timeout) as client:
+        context = await load_context(client, args)
+        results = {}
+        for name in args.scenario or list(SCENARIOS):
+            results[name] = await run_scenario(name, client, context, args)
+            print(f"{name}: {results[name]['throughput_rps']} req/s, p95 {results[name]['p95_ms']} ms", flush=True)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "base_url": args.base_url,
+            "duration_s": args.duration,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "dataset": context["dataset"],
+        },
+        "scenarios": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("BENCH_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.getenv("BENCH_TOKEN"))
+    parser.add_argument("--jwt-secret", default=os.getenv("JWT_SECRET"))
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="repeatable; default is all")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=5, help="pages walked per list_paging iteration")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="write the JSON report here as well as to stdout")
+    args = parser.parse_args()
+
+    if not args.token and not args.jwt_secret:
+        parser.error("either --token or --jwt-secret (JWT_SECRET) is required")
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Synthetic law-office dataset for benchmarks.
+
+Generates clients, cases, executions and compensation letters with
+Turkish names, courts, icra offices and banks, and loads them with COPY.
+The same --seed and --anchor-date always produce the same rows, so two
+commits can be benchmarked against identical data. Reminder and hearing
+dates are spread around --anchor-date, which defaults to today, so the
+dashboard has upcoming work to show.
+
+The tables must exist (alembic upgrade head). --reset truncates them
+first; without it the rows are added to whatever is there.
+
+Usage:
+    python -m benchmarks.seed --reset
+    python -m benchmarks.seed --clients 2000 --cases 30000 --executions 15000 --letters 5000
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List
+
+import psycopg
+
+from app.backup import BACKUP_TABLES, column_names
+from app.database import DATABASE_URL
+
+FIRST_NAMES = [
+    "Ahmet", "Mehmet", "Mustafa", "Ali", "Hüseyin", "Hasan", "İbrahim", "İsmail", "Osman", "Yusuf",
+    "Ömer", "Murat", "Emre", "Burak", "Serkan", "Kenan", "Şerif", "Oğuz", "Çağlar", "Gökhan",
+    "Ayşe", "Fatma", "Emine", "Hatice", "Zeynep", "Elif", "Meryem", "Şerife", "Sultan", "Zehra",
+    "Hülya", "Özlem", "Pınar", "Ebru", "Yaren", "Gülşen", "Derya", "Nurcan", "Büşra", "İrem",
+]
+LAST_NAMES = [
+    "Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın", "Özdemir",
+    "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek",
+    "Polat", "Özcan", "Korkmaz", "Çakır", "Erdoğan", "Yavuz", "Can", "Acar", "Şen", "Aktaş",
+    "Güler", "Yalçın", "Güneş", "Bozkurt", "Bulut", "Keskin", "Ünal", "Turan", "Gül", "Uçar",
+]
+COMPANY_WORDS = [
+    "Anadolu", "Marmara", "Ege", "Karadeniz", "Toros", "Başkent", "Boğaziçi", "Kuzey", "Güney", "Yıldız",
+    "Doğuş", "Özgür", "Birlik", "Akdeniz", "Fırat", "Kartal", "Meriç", "Çınar", "Işık", "Ufuk",
+]
+COMPANY_SECTORS = [
+    "İnşaat", "Gıda", "Tekstil", "Lojistik", "Enerji", "Otomotiv", "Turizm", "Sağlık", "Yazılım", "Tarım",
+]
+COMPANY_SUFFIXES = ["A.Ş.", "Ltd. Şti.", "San. ve Tic. A.Ş.", "Tic. Ltd. Şti."]
+CITIES = [
+    "İstanbul", "Ankara", "İzmir", "Bursa", "Antalya", "Konya", "Adana", "Gaziantep", "Kocaeli", "Mersin",
+    "Diyarbakır", "Kayseri", "Eskişehir", "Samsun", "Denizli", "Şanlıurfa", "Trabzon", "Malatya", "Erzurum", "Muğla",
+]
+DISTRICTS = ["Merkez", "Çankaya", "Kadıköy", "Üsküdar", "Karşıyaka", "Nilüfer", "Muratpaşa", "Selçuklu", "Seyhan", "Şahinbey"]
+STREETS = ["Atatürk Cad.", "Cumhuriyet Cad.", "İnönü Cad.", "Gazi Mustafa Kemal Bulvarı", "Fevzi Çakmak Sok.", "Menekşe Sok."]
+COURTS = [
+    "Asliye Hukuk Mahkemesi", "Asliye Ticaret Mahkemesi", "Sulh Hukuk Mahkemesi", "İş Mahkemesi",
+    "Aile Mahkemesi", "Tüketici Mahkemesi", "Asliye Ceza Mahkemesi", "Ağır Ceza Mahkemesi",
+    "İdare Mahkemesi", "Vergi Mahkemesi", "İcra Hukuk Mahkemesi", "Kadastro Mahkemesi",
+]
+CASE_TYPES = ["Hukuk", "Ceza", "İcra", "İdari Yargı", "Arabuluculuk", "Cbs", "Tazminat Komisyonu Başkanlığı", "Satış Memurluğu"]
+CASE_STATUSES = [
+    "Derdest", "Derdest", "Derdest", "Bilirkişi", "Kabul", "Red", "Kısmen kabul Kısmen red", "İstinaf",
+    "Temyiz", "Kesinleştirme", "G.K. Bekleniyor", "Beraat", "Konkordato",
+]
+# Only cases still before a court get a next hearing date.
+OPEN_CASE_STATUSES = {"Derdest", "Bilirkişi", "İstinaf", "Temyiz", "G.K. Bekleniyor"}
+CASE_SUBJECTS = [
+    "Alacak", "İtirazın İptali", "Tazminat", "Menfi Tespit", "Tahliye", "Kira Tespiti", "İşe İade",
+    "Kıdem Tazminatı", "Boşanma", "Nafaka", "Tapu İptali ve Tescil", "Ortaklığın Giderilmesi", "Dolandırıcılık",
+]
+EXECUTION_TYPES = [
+    "İlamsız Kredi Kartı", "İlamsız İhtiyaç Kartı", "İlamsız GKS", "İlamsız Fatura", "İlamsız / Çek",
+    "Kambiyo / Çek", "Kambiyo / Bono", "İpotek – Örnek 6", "Rehin – Örnek 8", "Tahliye – Örnek 14", "Nafaka – Örnek 49",
+]
+EXECUTION_STATUSES = ["Derdest", "Derdest", "İtirazlı", "Haricen Tahsil", "Ödeme Sözü", "Protokollü", "İnfaz", "İcranın Geri Bırakılması"]
+HACIZ_STATES = [None, None, "Hacizli Araç", "Rehinli Araç", "Hacizli / Gayrimenkul", "İpotekli / Gayrimenkul", "Yakalamalı / Şatış"]
+BANKS = [
+    "TÜRKİYE GARANTİ BANKASI A.Ş.", "TÜRKİYE VAKIFLAR BANKASI T.A.O.", "ŞEKERBANK T.A.Ş.", "T.C. ZİRAAT BANKASI A.Ş.",
+    "TÜRKİYE İŞ BANKASI A.Ş.", "YAPI VE KREDİ BANKASI A.Ş.", "AKBANK T.A.Ş.", "TÜRKİYE HALK BANKASI A.Ş.",
+]
+LETTER_STATUSES = ["DEVAM EDİYOR", "DEVAM EDİYOR", "İADE İSTENDİ", "İADE"]
+RESPONSIBLE = ["İsmail Bey", "Ömer Bey", "Yaren Hanım", "Pınar Hanım", "Ebru Hanım", "Av.İbrahim Bey", "Av.M.Şerif Bey", "Av.Kenan Bey"]
+REMINDERS = ["Duruşma hazırlığı", "Bilirkişi raporuna itiraz", "Tebligat kontrolü", "Haciz talebi", "Dilekçe süresi doluyor", "Müvekkil ile görüşme"]
+
+
+class Generator:
+    """Deterministic row generator; every value comes from one seeded RNG."""
+
+    def __init__(self, seed: int, anchor: date):
+        self.rng = random.Random(seed)
+        self.anchor = anchor
+        self.now = datetime.combine(anchor, datetime.min.time()) + timedelta(hours=12)
+
+    def uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def person(self) -> str:
+        return f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+
+    def company(self) -> str:
+        return f"{self.rng.choice(COMPANY_WORDS)} {self.rng.choice(COMPANY_SECTORS)} {self.rng.choice(COMPANY_SUFFIXES)}"
+
+    def court(self) -> str:
+        return f"{self.rng.choice(CITIES)} {self.rng.randint(1, 40)}. {self.rng.choice(COURTS)}"
+
+    def file_number(self) -> str:
+        return f"{self.rng.randint(2015, self.anchor.year)}/{self.rng.randint(1, 99999)}"
+
+    def day_around(self, before: int, after: int, missing: float):
+        if self.rng.random() < missing:
+            return None
+        return self.anchor + timedelta(days=self.rng.randint(-before, after))
+
+    def timestamps(self) -> tuple:
+        created = self.now - timedelta(minutes=self.rng.randint(60, 3 * 365 * 24 * 60))
+        updated = min(created + timedelta(minutes=self.rng.randint(0, 365 * 24 * 60)), self.now)
+        return created, updated
+
+    def client(self) -> dict:
+        company = self.rng.random() < 0.4
+        name = self.company() if company else self.person()
+        slug = name.split()[0].lower().translate(str.maketrans("çğıöşüİ", "cgiosui"))
+        created, updated = self.timestamps()
+        return {
+            "id": self.uuid(),
+            "name": name,
+            "email": f"{slug}{self.rng.randint(1, 9999)}@example.com.tr",
+            "phone": f"05{self.rng.randint(30, 59)} {self.rng.randint(100, 999)} {self.rng.randint(10, 99)} {self.rng.randint(10, 99)}",
+            "address": f"{self.rng.choice(STREETS)} No:{self.rng.randint(1, 200)} {self.rng.choice(DISTRICTS)}/{self.rng.choice(CITIES)}",
+            "tax_id": str(self.rng.randint(10 ** 9, 10 ** 10 - 1)) if company else None,
+            "vekalet_ofis_no": f"V-{self.rng.randint(1, 9999):04d}" if self.rng.random() < 0.5 else None,
+            "created_at": created,
+            "updated_at": updated,
+            "version": self.rng.randint(1, 4),
+            "is_deleted": self.rng.random() < 0.02,
+        }
+
+    def case(self, client: dict) -> dict:
+        defendant = self.person() if self.rng.random() < 0.6 else self.company()
+        subject = self.rng.choice(CASE_SUBJECTS)
+        status = self.rng.choice(CASE_STATUSES)
+        created, updated = self.timestamps()
+        return {
+            "id": self.uuid(),
+            "title": f"{client['name']} - {defendant} {subject}",
+            "case_name": f"{subject} Davası" if self.rng.random() < 0.7 else None,
+            "description": f"{subject} talepli dava." if self.rng.random() < 0.5 else None,
+            "client_id": client["id"],
+            "client_name": client["name"],
+            "case_type": self.rng.choice(CASE_TYPES),
+            "status": status,
+            "court": self.court(),
+            "case_number": self.file_number() + " E.",
+            "defendant": defendant,
+            "notes": self.rng.choice(REMINDERS) if self.rng.random() < 0.3 else None,
+            "start_date": self.anchor - timedelta(days=self.rng.randint(0, 6 * 365)),
+            "next_hearing_date": self.day_around(30, 180, 0.4) if status in OPEN_CASE_STATUSES else None,
+            "reminder_date": self.day_around(180, 60, 0.7),
+            "office_archive_no": f"{self.rng.randint(2015, self.anchor.year)}-{self.rng.randint(1, 99999):05d}",
+            "responsible_person": self.rng.choice(RESPONSIBLE) if self.rng.random() < 0.8 else None,
+            "görevlendiren": self.rng.choice(RESPONSIBLE) if self.rng.random() < 0.5 else None,
+            "created_at": created,
+            "updated_at": updated,
+            "version": self.rng.randint(1, 6),
+            "is_deleted": self.rng.random() < 0.03,
+        }
+
+    def execution(self, client: dict) -> dict:
+        reminder_date = self.day_around(180, 60, 0.7)
+        created, updated = self.timestamps()
+        return {
+            "id": self.uuid(),
+            "client_id": client["id"],
+            "client_name": client["name"],
+            "defendant": self.person() if self.rng.random() < 0.8 else self.company(),
+            "execution_office": f"{self.rng.choice(CITIES)} {self.rng.randint(1, 45)}. İcra Dairesi",
+            "execution_number": self.file_number() + " E.",
+            "status": self.rng.choice(EXECUTION_STATUSES),
+            "execution_type": self.rng.choice(EXECUTION_TYPES),
+            "start_date": self.anchor - timedelta(days=self.rng.randint(0, 6 * 365)),
+            "office_archive_no": f"İ-{self.rng.randint(1, 99999):05d}",
+            "reminder_date": reminder_date,
+            "reminder_text": self.rng.choice(REMINDERS) if reminder_date else None,
+            "notes": None,
+            "haciz_durumu": self.rng.choice(HACIZ_STATES),
+            "responsible_person": self.rng.choice(RESPONSIBLE) if self.rng.random() < 0.8 else None,
+            "görevlendiren": self.rng.choice(RESPONSIBLE) if self.rng.random() < 0.5 else None,
+            "created_at": created,
+            "updated_at": updated,
+            "version": self.rng.randint(1, 6),
+            "is_deleted": self.rng.random() < 0.03,
+        }
+
+    def letter(self, client: dict) -> dict:
+        bank = self.rng.choice(BANKS)
+        letter_number = f"TM-{self.rng.randint(2015, self.anchor.year)}-{self.rng.randint(1, 999999):06d}"
+        reminder_date = self.day_around(180, 60, 0.6)
+        created, updated = self.timestamps()
+        return {
+            "id": self.uuid(),
+            "title": f"{bank} - {letter_number}",
+            "client_id": client["id"],
+            "client_name": client["name"],
+            "letter_number": letter_number,
+            "bank": bank,
+            "customer_number": str(self.rng.randint(10 ** 7, 10 ** 8 - 1)),
+            "customer": self.person(),
+            "court": self.court(),
+            "case_number": self.file_number() + " E.",
+            "status": self.rng.choice(LETTER_STATUSES),
+            "description_text": None,
+            "reminder_date": reminder_date,
+            "reminder_text": self.rng.choice(REMINDERS) if reminder_date else None,
+            "responsible_person": self.rng.choice(RESPONSIBLE) if self.rng.random() < 0.8 else None,
+            "görevlendiren": self.rng.choice(RESPONSIBLE) if self.rng.random() < 0.5 else None,
+            "created_at": created,
+            "updated_at": updated,
+            "version": self.rng.randint(1, 3),
+            "is_deleted": self.rng.random() < 0.03,
+        }
+
+
+def _rows(generator: Generator, make, clients: List[dict], count: int) -> Iterator[dict]:
+    # A few large clients hold most of the files, as in a real office.
+    weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(clients))]
+    for owner in generator.rng.choices(clients, weights=weights, k=count):
+        yield make(owner)
+
+
+def copy_rows(cur, table: str, rows) -> int:
+    columns = column_names(BACKUP_TABLES[table])
+    # Model attribute names differ from column names only for görevlendiren.
+    keys = ["görevlendiren" if column == "gÃ¶revlendiren" else column for column in columns]
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    count = 0
+    with cur.copy(f"COPY {table} ({column_list}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row([row[key] for key in keys])
+            count += 1
+    return count
+
+
+def seed(args) -> Dict[str, dict]:
+    generator = Generator(args.seed, args.anchor_date)
+    clients = [generator.client() for _ in range(args.clients)]
+    plan = [
+        ("clients", iter(clients)),
+        ("cases", _rows(generator, generator.case, clients, args.cases)),
+        ("executions", _rows(generator, generator.execution, clients, args.executions)),
+        ("compensation_letters", _rows(generator, generator.letter, clients, args.letters)),
+    ]
+
+    report = {}
+    with psycopg.connect(DATABASE_URL) as conn:
+        with conn.cursor() as cur:
+            if args.reset:
+                cur.execute("TRUNCATE clients, cases, executions, compensation_letters")
+            for table, rows in plan:
+                started = time.perf_counter()
+                count = copy_rows(cur, table, rows)
+                elapsed = time.perf_counter() - started
+                report[table] = {"rows": count, "seconds": round(elapsed, 2), "rows_per_second": round(count / elapsed) if elapsed else None}
+        conn.commit()
+        conn.autocommit = True
+        started = time.perf_counter()
+        conn.execute("ANALYZE clients, cases, executions, compensation_letters")
+        report["analyze"] = {"seconds": round(time.perf_counter() - started, 2)}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=20000)
+    parser.add_argument("--cases", type=int, default=300000)
+    parser.add_argument("--executions", type=int, default=150000)
+    parser.add_argument("--letters", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--reset", action="store_true", help="truncate the four tables first")
+    args = parser.parse_args()
+    print(json.dumps(seed(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
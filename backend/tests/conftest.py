@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Tests that write to Postgres take the database_url or run_db fixture and
+# are skipped unless TEST_DATABASE_URL names a database they may use.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+# app.database reads DATABASE_URL when it is imported; patch it for the
+# import only, so nothing else in the process sees a changed environment.
+with patch.dict(os.environ, {"DATABASE_URL": TEST_DATABASE_URL or os.getenv("DATABASE_URL", "postgresql://user@localhost/lexcloud")}):
+    from app.database import Base
+
+
+def async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+psycopg://", 1)
+
+
+@pytest.fixture(scope="session")
+def database_url():
+    """The test database URL, with every table created."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    try:
+        Base.metadata.create_all(engine)
+    finally:
+        engine.dispose()
+    return TEST_DATABASE_URL
+
+
+@pytest.fixture
+def run_db(database_url):
+    """``run(scenario)`` awaits ``scenario(engine)`` on a fresh async engine and returns its result."""
+    def run(scenario):
+        async def wrapper():
+            engine = create_async_engine(async_url(database_url))
+            try:
+                return await scenario(engine)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(wrapper())
+
+    return run
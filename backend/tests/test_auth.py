@@ -0,0 +1,122 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import jwt
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+with patch.dict(os.environ, {"DATABASE_URL": os.getenv("DATABASE_URL", "postgresql://user@localhost/lexcloud")}):
+    from app.auth import RevocationRefresher, TokenRevoked, TokenVerifier, hash_password, password_matches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+def test_hot_tokens_skip_signature_verification():
+    """Test that a cached token is not decoded again"""
+    verifier = TokenVerifier("secret")
+    token = verifier.issue("admin", timedelta(hours=1))
+    verifier.verify(token)
+    with patch("app.auth.jwt.decode") as decode:
+        assert verifier.verify(token)["sub"] == "admin"
+        decode.assert_not_called()
+    assert (verifier.hits, verifier.misses) == (1, 1)
+
+def test_cached_token_still_expires():
+    """Test that expiry is enforced for tokens served from the cache"""
+    clock = FakeClock()
+    verifier = TokenVerifier("secret", clock=clock)
+    token = verifier.issue("admin", timedelta(minutes=5))
+    verifier.verify(token)
+    clock.now += 301
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+
+def test_revoked_token_rejected_until_it_expires():
+    """Test that revocations apply to cached tokens and are dropped after exp"""
+    clock = FakeClock()
+    verifier = TokenVerifier("secret", clock=clock)
+    token = verifier.issue("admin", timedelta(minutes=5))
+    payload = verifier.verify(token)
+    verifier.revoke(payload["jti"], payload["exp"])
+    with pytest.raises(TokenRevoked):
+        verifier.verify(token)
+    clock.now = payload["exp"] + 1
+    with pytest.raises(jwt.ExpiredSignatureError):
+        verifier.verify(token)
+    assert verifier.stats()["revoked_tokens"] == 0
+
+class FakeRevocationSession:
+    def __init__(self, rows, error=None):
+        self.rows = rows
+        self.error = error
+
+    async def __aenter__(self):
+        if self.error:
+            raise self.error
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        return self
+
+    def all(self):
+        return self.rows
+
+def test_revocation_refresher_retries_a_failed_load():
+    """Test that the refresher keeps re-reading revoked_tokens until a load succeeds"""
+    verifier = TokenVerifier("secret")
+    token = verifier.issue("admin", timedelta(hours=1))
+    payload = verifier.verify(token)
+    expires = datetime.fromtimestamp(payload["exp"], timezone.utc).replace(tzinfo=None)
+    sessions = [FakeRevocationSession([], OSError("connection refused"))]
+    loaded = []
+
+    def session_factory():
+        return sessions.pop(0) if sessions else FakeRevocationSession([(payload["jti"], expires)])
+
+    async def scenario():
+        refresher = RevocationRefresher(session_factory, verifier, interval=0, on_loaded=loaded.append)
+        refresher.start()
+        while not loaded:
+            await asyncio.sleep(0.01)
+        await refresher.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert loaded[0] == 1
+    with pytest.raises(TokenRevoked):
+        verifier.verify(token)
+
+def test_lru_evicts_least_recently_used():
+    """Test that the verified-token cache is bounded"""
+    verifier = TokenVerifier("secret", cache_size=2)
+    first, second, third = (verifier.issue("admin", timedelta(hours=1)) for _ in range(3))
+    for token in (first, second, first, third):
+        verifier.verify(token)
+    assert list(verifier._verified) == [first, third]
+
+def test_tokens_without_jti_rejected():
+    """Test that tokens which could never be revoked are refused"""
+    verifier = TokenVerifier("secret")
+    token = jwt.encode({"sub": "admin", "exp": int(time.time()) + 60}, "secret", algorithm="HS256")
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token)
+
+def test_password_hash_round_trip():
+    """Test that stored password hashes verify only the original password"""
+    stored = hash_password("gizli-şifre")
+    assert password_matches("gizli-şifre", stored)
+    assert not password_matches("yanlış", stored)
+    assert not password_matches("gizli-şifre", "garbage")
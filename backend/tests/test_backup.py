@@ -0,0 +1,64 @@
+import asyncio
+import gzip
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+with patch.dict(os.environ, {"DATABASE_URL": os.getenv("DATABASE_URL", "postgresql://user@localhost/lexcloud")}):
+    from app.backup import _csv_field, compress, compression_available
+
+from fastapi.testclient import TestClient
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(stream):
+    return b"".join([chunk async for chunk in stream])
+
+def test_csv_fields_distinguish_null_from_empty():
+    """Test that NULL is written unquoted and every value is quoted"""
+    row = [None, "", 'Ali "Usta"', date(2025, 1, 15), datetime(2025, 6, 1, 12, 30), False]
+    assert ",".join(_csv_field(value) for value in row) == ',"","Ali ""Usta""","2025-01-15","2025-06-01T12:30:00","False"'
+
+def test_gzip_stream_round_trip():
+    """Test that streamed gzip output decompresses to the original chunks"""
+    body = asyncio.run(collect(compress(chunks(b'{"a":1}\n', b'{"b":2}\n'), "gzip")))
+    assert gzip.decompress(body) == b'{"a":1}\n{"b":2}\n'
+
+def test_uncompressed_stream_passes_through():
+    """Test that chunks are forwarded unchanged without compression"""
+    assert asyncio.run(collect(compress(chunks(b"x", b"y"), None))) == b"xy"
+
+def test_zstd_stream_round_trip():
+    """Test that streamed zstd output decompresses to the original chunks"""
+    zstandard = pytest.importorskip("zstandard")
+    assert compression_available("zstd")
+    body = asyncio.run(collect(compress(chunks(b'{"a":1}\n', b'{"b":2}\n'), "zstd")))
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(body) == b'{"a":1}\n{"b":2}\n'
+
+def test_compressed_export_is_downloaded_as_a_compressed_file(database_url):
+    """Test that a gzip export is served as application/gzip with a .gz name, not as a Content-Encoding"""
+    with patch.dict(os.environ, {"ADMIN_PASSWORD": os.getenv("ADMIN_PASSWORD", "backup-tests"),
+                                 "JWT_SECRET": os.getenv("JWT_SECRET", "backup-tests")}):
+        from app.main import app, verify_token
+
+    app.dependency_overrides[verify_token] = lambda: {"sub": "admin"}
+    try:
+        response = TestClient(app).get("/api/backup", params={"format": "csv", "table": "clients", "compression": "gzip"},
+                                       headers={"Accept-Encoding": "identity"})
+    finally:
+        app.dependency_overrides.pop(verify_token)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-disposition"].endswith('-clients.csv.gz"')
+    assert gzip.decompress(response.content).startswith(b"id,")
@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.realtime import ConnectionManager, PostgresBroadcastBackend
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        pass
+
+
+async def start_instances(count, channel):
+    engine = create_async_engine(TEST_DATABASE_URL.replace("postgresql://", "postgresql+psycopg://", 1))
+    instances = []
+    for _ in range(count):
+        manager = ConnectionManager()
+        backend = PostgresBroadcastBackend(manager, TEST_DATABASE_URL, engine, channel=channel)
+        backend.start()
+        await asyncio.wait_for(backend.listening.wait(), timeout=5)
+        socket = FakeWebSocket()
+        manager.connect(socket, "user")
+        instances.append((manager, backend, socket))
+    return engine, instances
+
+
+async def stop_instances(engine, instances):
+    for _, backend, _ in instances:
+        await backend.stop()
+    await engine.dispose()
+
+
+def test_change_reaches_sockets_on_other_instances_once():
+    """Test that a change is delivered once to local and remote sockets"""
+    async def scenario():
+        engine, instances = await start_instances(2, "lexcloud_test_relay")
+        (origin, _, origin_socket), (_, remote_backend, remote_socket) = instances
+        invalidated = []
+        instances[1][0].add_change_listener(invalidated.append)
+        try:
+            await origin.broadcast_data_change("update", "case", "c-1", {"title": "Dava"})
+            for _ in range(50):
+                if remote_socket.sent:
+                    break
+                await asyncio.sleep(0.05)
+            await asyncio.sleep(0.1)
+            assert [m["entity_id"] for m in origin_socket.sent] == ["c-1"]
+            assert [m["entity_id"] for m in remote_socket.sent] == ["c-1"]
+            assert remote_socket.sent[0]["data"] == {"title": "Dava"}
+            assert len(invalidated) == 1
+            assert remote_backend.received == 1
+        finally:
+            await stop_instances(engine, instances)
+
+    asyncio.run(scenario())
+
+
+def test_oversized_payload_is_truncated():
+    """Test that events over the NOTIFY size limit still arrive without data"""
+    async def scenario():
+        engine, instances = await start_instances(2, "lexcloud_test_truncate")
+        remote_socket = instances[1][2]
+        try:
+            await instances[0][0].broadcast_data_change("update", "case", "c-2", {"notes": "x" * 20000})
+            for _ in range(50):
+                if remote_socket.sent:
+                    break
+                await asyncio.sleep(0.05)
+            assert remote_socket.sent[0]["entity_id"] == "c-2"
+            assert remote_socket.sent[0]["truncated"] is True
+            assert remote_socket.sent[0]["data"] == {}
+        finally:
+            await stop_instances(engine, instances)
+
+    asyncio.run(scenario())
+
+
+def test_internal_events_reach_handlers_not_sockets():
+    """Test that events with a registered handler are not sent to remote sockets"""
+    async def scenario():
+        engine, instances = await start_instances(2, "lexcloud_test_events")
+        remote, _, remote_socket = instances[1]
+        handled = []
+        remote.add_event_handler("token_revoked", handled.append)
+        try:
+            await instances[0][0].publish({"type": "token_revoked", "jti": "abc", "exp": 0})
+            for _ in range(50):
+                if handled:
+                    break
+                await asyncio.sleep(0.05)
+            assert [event["jti"] for event in handled] == ["abc"]
+            assert remote_socket.sent == []
+        finally:
+            await stop_instances(engine, instances)
+
+    asyncio.run(scenario())
@@ -0,0 +1,107 @@
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bulk import BulkRequest, apply_bulk
+from app.database import ClientDB, ExecutionDB
+
+
+class ExecutionCreate(BaseModel):
+    client_id: str
+    defendant: str
+    execution_office: str
+    execution_number: str
+    status: str
+    execution_type: str
+    start_date: date
+    office_archive_no: str
+
+class ExecutionUpdate(BaseModel):
+    client_id: Optional[str] = None
+    status: Optional[str] = None
+    version: Optional[int] = None
+
+
+def new_execution(client_id):
+    return {
+        "client_id": client_id,
+        "defendant": "Ahmet Yılmaz",
+        "execution_office": "İstanbul 3. İcra Dairesi",
+        "execution_number": f"2025/{uuid.uuid4().hex[:6]}",
+        "status": "active",
+        "execution_type": "ilamsız",
+        "start_date": "2025-01-15",
+        "office_archive_no": "A-1"
+    }
+
+
+def with_client(scenario):
+    """Adapt ``scenario(db, client_id)`` for run_db, creating the client first."""
+    async def wrapper(engine):
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            now = datetime.now()
+            client = ClientDB(id=str(uuid.uuid4()), name="Deniz Hukuk", email="d@example.com", phone="1",
+                              address="Ankara", created_at=now, updated_at=now, version=1, is_deleted=False)
+            db.add(client)
+            await db.commit()
+            await scenario(db, client.id)
+
+    return wrapper
+
+
+def test_bulk_reports_per_item_results(run_db):
+    """Test that valid items are applied and invalid ones reported by index"""
+    async def scenario(db, client_id):
+        request = BulkRequest(operations=[
+            {"op": "create", "data": new_execution(client_id)},
+            {"op": "create", "data": new_execution("missing-client")},
+            {"op": "create", "data": {"client_id": client_id}},
+            {"op": "delete", "id": "missing-execution"},
+        ])
+        result, changes = await apply_bulk(db, ExecutionDB, ExecutionCreate, ExecutionUpdate, request)
+        assert result.committed and (result.succeeded, result.failed) == (1, 3)
+        assert [item.status for item in result.results] == ["ok", "invalid", "invalid", "not_found"]
+        row = (await db.execute(select(ExecutionDB).where(ExecutionDB.id == result.results[0].id))).scalars().one()
+        assert row.client_name == "Deniz Hukuk" and row.version == 1
+        assert changes["create"] == [row.id]
+
+    run_db(with_client(scenario))
+
+
+def test_bulk_update_checks_versions(run_db):
+    """Test that stale versions conflict and current ones are bumped"""
+    async def scenario(db, client_id):
+        created, _ = await apply_bulk(db, ExecutionDB, ExecutionCreate, ExecutionUpdate, BulkRequest(operations=[
+            {"op": "create", "data": new_execution(client_id)},
+            {"op": "create", "data": new_execution(client_id)},
+        ]))
+        first, second = (item.id for item in created.results)
+        result, changes = await apply_bulk(db, ExecutionDB, ExecutionCreate, ExecutionUpdate, BulkRequest(operations=[
+            {"op": "update", "id": first, "version": 1, "data": {"status": "closed"}},
+            {"op": "update", "id": second, "data": {"status": "closed", "version": 7}},
+        ]))
+        assert [item.status for item in result.results] == ["ok", "conflict"]
+        assert result.results[0].version == 2
+        assert changes["update"] == [first]
+
+    run_db(with_client(scenario))
+
+
+def test_atomic_bulk_applies_nothing_on_failure(run_db):
+    """Test that atomic mode rolls back the whole batch when one item fails"""
+    async def scenario(db, client_id):
+        data = new_execution(client_id)
+        result, changes = await apply_bulk(db, ExecutionDB, ExecutionCreate, ExecutionUpdate, BulkRequest(atomic=True, operations=[
+            {"op": "create", "data": data},
+            {"op": "update", "id": "missing-execution", "data": {"status": "closed"}},
+        ]))
+        assert not result.committed and changes == {}
+        assert [item.status for item in result.results] == ["skipped", "not_found"]
+        count = (await db.execute(select(ExecutionDB.id).where(ExecutionDB.execution_number == data["execution_number"]))).all()
+        assert count == []
+
+    run_db(with_client(scenario))
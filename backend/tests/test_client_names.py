@@ -0,0 +1,107 @@
+import uuid
+from datetime import date, datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.client_names import RECONCILE_LOCK_KEY, ClientNameReconciler, propagate_client_names, reconcile_chunk
+from app.database import ClientDB, ExecutionDB
+
+
+def new_client(name):
+    now = datetime.now()
+    return ClientDB(id=str(uuid.uuid4()), name=name, email="d@example.com", phone="1",
+                    address="Ankara", created_at=now, updated_at=now, version=1, is_deleted=False)
+
+
+def new_execution(client):
+    now = datetime.now()
+    return ExecutionDB(
+        id=str(uuid.uuid4()), client_id=client.id, client_name=client.name, defendant="Ahmet Yılmaz",
+        execution_office="İstanbul 3. İcra Dairesi", execution_number="2025/1", status="active",
+        execution_type="ilamsız", start_date=date(2025, 1, 15), office_archive_no="A-1",
+        created_at=now, updated_at=now, version=1, is_deleted=False
+    )
+
+
+def test_rename_propagates_to_that_clients_rows_only(run_db):
+    """Test that propagation rewrites and bumps the version of that client's rows only"""
+    async def scenario(engine):
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            renamed, other = new_client("Deniz Hukuk"), new_client("Ege Ltd")
+            db.add_all([renamed, other])
+            await db.flush()
+            executions = [new_execution(renamed), new_execution(renamed), new_execution(other)]
+            db.add_all(executions)
+            await db.commit()
+
+            await db.execute(update(ClientDB).where(ClientDB.id == renamed.id).values(name="Deniz Hukuk A.Ş."))
+            propagated = await propagate_client_names(db, [renamed.id], datetime.now())
+            await db.commit()
+            assert propagated == {"execution": 2}
+
+            rows = dict((await db.execute(
+                select(ExecutionDB.id, ExecutionDB.client_name).where(ExecutionDB.id.in_([e.id for e in executions]))
+            )).all())
+            assert rows == {
+                executions[0].id: "Deniz Hukuk A.Ş.",
+                executions[1].id: "Deniz Hukuk A.Ş.",
+                executions[2].id: "Ege Ltd",
+            }
+            versions = (await db.execute(
+                select(ExecutionDB.version).where(ExecutionDB.client_id == renamed.id)
+            )).scalars().all()
+            assert versions == [2, 2]
+
+    run_db(scenario)
+
+
+def test_reconcile_repairs_drift_across_chunks(run_db):
+    """Test that walking small id chunks repairs every drifted name"""
+    async def scenario(engine):
+        # Ids sort after everything else so the walk only covers these rows.
+        prefix = f"zzzz-{uuid.uuid4().hex}-"
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            client = new_client("Marmara Yapı")
+            db.add(client)
+            await db.flush()
+            for index in range(5):
+                execution = new_execution(client)
+                execution.id = f"{prefix}{index}"
+                execution.client_name = "Eski Ad"
+                db.add(execution)
+            await db.commit()
+
+        after_id, repaired, chunks = prefix, 0, 0
+        while after_id is not None:
+            async with AsyncSession(engine) as db:
+                after_id, fixed = await reconcile_chunk(db, ExecutionDB, after_id, 2)
+            repaired += fixed
+            chunks += 1
+        assert repaired == 5 and chunks >= 3
+
+        async with AsyncSession(engine) as db:
+            names = (await db.execute(
+                select(ExecutionDB.client_name).where(ExecutionDB.client_id == client.id)
+            )).scalars().all()
+            assert names == ["Marmara Yapı"] * 5
+
+    run_db(scenario)
+
+
+def test_reconciler_skips_a_pass_while_another_instance_holds_the_lock(run_db):
+    """Test that only the instance holding the advisory lock reconciles"""
+    async def scenario(engine):
+        def session_factory():
+            return AsyncSession(engine)
+
+        async def on_repaired(entity_type, count):
+            pass
+
+        reconciler = ClientNameReconciler(session_factory, on_repaired, chunk_size=10000, pause=0)
+        async with AsyncSession(engine) as other_instance:
+            assert await other_instance.scalar(select(func.pg_try_advisory_xact_lock(RECONCILE_LOCK_KEY)))
+            assert await reconciler.run_once() is None
+        assert set(await reconciler.run_once()) == {"case", "execution", "compensation_letter"}
+
+    run_db(scenario)
@@ -0,0 +1,211 @@
+import json
+import uuid
+from datetime import date, datetime
+from typing import Optional
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.crud import CrudResource
+from app.database import ClientDB, ExecutionDB
+
+
+class Execution(BaseModel):
+    id: str
+    client_id: str
+    client_name: str
+    status: str
+    görevlendiren: Optional[str] = None
+    updated_at: datetime
+    version: int
+
+class ExecutionCreate(BaseModel):
+    client_id: str
+    defendant: str = "Ahmet Yılmaz"
+    execution_office: str = "İstanbul 3. İcra Dairesi"
+    execution_number: str = "2025/1"
+    status: str = "active"
+    execution_type: str = "ilamsız"
+    start_date: date = date(2025, 1, 15)
+    office_archive_no: str = "A-1"
+    görevlendiren: Optional[str] = None
+
+class ExecutionUpdate(BaseModel):
+    client_id: Optional[str] = None
+    status: Optional[str] = None
+    version: Optional[int] = None
+
+
+executions = CrudResource(ExecutionDB, Execution, ExecutionCreate, ExecutionUpdate, "execution", "Execution", filters={
+    "status": ExecutionDB.status,
+    "görevlendiren": ExecutionDB.görevlendiren,
+}, summary=("client_name", "status"))
+
+
+def with_client(scenario):
+    """Adapt ``scenario(db, client_id, broadcast, events)`` for run_db, creating the client first."""
+    async def wrapper(engine):
+        events = []
+
+        async def broadcast(*event):
+            events.append(event)
+
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            now = datetime.now()
+            client = ClientDB(id=str(uuid.uuid4()), name="Deniz Hukuk", email="d@example.com", phone="1",
+                              address="Ankara", created_at=now, updated_at=now, version=1, is_deleted=False)
+            db.add(client)
+            await db.commit()
+            await scenario(db, client.id, broadcast, events)
+
+    return wrapper
+
+
+def body(response):
+    return json.loads(response.body)
+
+
+def test_create_update_delete_round_trip(run_db):
+    """Test that writes return the projected row and broadcast one event each"""
+    async def scenario(db, client_id, broadcast, events):
+        created = body(await executions.create(db, ExecutionCreate(client_id=client_id, görevlendiren="Ayşe"), broadcast))
+        assert created["client_name"] == "Deniz Hukuk" and created["version"] == 1
+        assert created["görevlendiren"] == "Ayşe"
+
+        updated = body(await executions.update(db, created["id"], ExecutionUpdate(status="closed", version=1), broadcast))
+        assert updated["status"] == "closed" and updated["version"] == 2
+
+        await executions.delete(db, created["id"], broadcast)
+        with pytest.raises(HTTPException) as error:
+            await executions.fetch(db, created["id"])
+        assert error.value.status_code == 404
+        assert [event[0] for event in events] == ["create", "update", "delete"]
+
+    run_db(with_client(scenario))
+
+
+def test_update_reports_conflict_missing_row_and_bad_client(run_db):
+    """Test that a stale version is 409, an unknown id 404 and an unknown client 400"""
+    async def scenario(db, client_id, broadcast, events):
+        created = body(await executions.create(db, ExecutionCreate(client_id=client_id), broadcast))
+        cases = [
+            (created["id"], ExecutionUpdate(status="closed", version=5), 409),
+            ("missing-execution", ExecutionUpdate(status="closed"), 404),
+            (created["id"], ExecutionUpdate(client_id="missing-client"), 400),
+        ]
+        for item_id, update, status_code in cases:
+            with pytest.raises(HTTPException) as error:
+                await executions.update(db, item_id, update, broadcast)
+            assert error.value.status_code == status_code
+        assert body(await executions.fetch(db, created["id"]))["version"] == 1
+
+    run_db(with_client(scenario))
+
+
+def test_list_filters_and_route_parameters(run_db):
+    """Test that configured filters become query parameters and narrow the list"""
+    async def scenario(db, client_id, broadcast, events):
+        marker = uuid.uuid4().hex
+        await executions.create(db, ExecutionCreate(client_id=client_id, görevlendiren=marker), broadcast)
+        rows = body(await executions.fetch_page(db, {"görevlendiren": marker, "status": None}, 1, 10, None))
+        assert [row["görevlendiren"] for row in rows] == [marker]
+
+    run_db(with_client(scenario))
+
+    app = FastAPI()
+    app.include_router(executions.router("/api/executions", lambda: None, lambda: None, None))
+    parameters = app.openapi()["paths"]["/api/executions"]["get"]["parameters"]
+    assert [parameter["name"] for parameter in parameters] == ["status", "görevlendiren", "page", "limit", "cursor", "fields"]
+
+
+def test_sparse_fieldsets_select_only_requested_columns(run_db):
+    """Test that fields= narrows list rows to the preset or named fields plus id, updated_at and version"""
+    async def scenario(db, client_id, broadcast, events):
+        marker = uuid.uuid4().hex
+        await executions.create(db, ExecutionCreate(client_id=client_id, görevlendiren=marker), broadcast)
+        filters = {"görevlendiren": marker, "status": None}
+
+        summary = body(await executions.fetch_page(db, filters, 1, 10, None, "summary"))
+        assert list(summary[0]) == ["id", "client_name", "status", "updated_at", "version"]
+        named = body(await executions.fetch_page(db, filters, 1, 10, "", "summary, görevlendiren"))
+        assert named[0]["görevlendiren"] == marker and "client_id" not in named[0]
+        assert set(body(await executions.fetch_page(db, filters, 1, 10, None))[0]) == set(Execution.model_fields)
+
+        with pytest.raises(HTTPException) as error:
+            await executions.fetch_page(db, filters, 1, 10, None, "summary,notes")
+        assert error.value.status_code == 400
+
+    run_db(with_client(scenario))
+
+    with pytest.raises(ValueError):
+        CrudResource(ExecutionDB, Execution, ExecutionCreate, ExecutionUpdate, "execution", "Execution", summary=("notes",))
+
+
+def test_conditional_gets_with_etags(run_db, database_url):
+    """Test that lists and rows answer a matching If-None-Match with 304 until they change"""
+    marker = uuid.uuid4().hex
+    created = []
+
+    async def scenario(db, client_id, broadcast, events):
+        created.append(body(await executions.create(db, ExecutionCreate(client_id=client_id, görevlendiren=marker), broadcast)))
+
+    run_db(with_client(scenario))
+
+    async def get_db():
+        engine = create_async_engine(database_url.replace("postgresql://", "postgresql+psycopg://", 1), poolclass=NullPool)
+        try:
+            async with AsyncSession(engine) as db:
+                yield db
+        finally:
+            await engine.dispose()
+
+    async def broadcast(*event):
+        pass
+
+    app = FastAPI()
+    app.include_router(executions.router("/api/executions", get_db, lambda: "token", broadcast))
+    client = TestClient(app)
+    item = f"/api/executions/{created[0]['id']}"
+
+    listed = client.get("/api/executions", params={"görevlendiren": marker})
+    detail = client.get(item)
+    assert listed.headers["cache-control"] == detail.headers["cache-control"] == "no-cache"
+    list_etag, row_etag = listed.headers["etag"], detail.headers["etag"]
+    assert row_etag.startswith('W/"1-')
+    assert client.get("/api/executions", params={"görevlendiren": "other"}).headers["etag"] != list_etag
+
+    revalidated = client.get("/api/executions", params={"görevlendiren": marker}, headers={"If-None-Match": list_etag})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert client.get(item, headers={"If-None-Match": f'"other", {row_etag}'}).status_code == 304
+
+    client.put(item, json={"status": "closed"})
+    changed = client.get("/api/executions", params={"görevlendiren": marker}, headers={"If-None-Match": list_etag})
+    assert changed.status_code == 200 and changed.json()[0]["status"] == "closed"
+    assert client.get(item, headers={"If-None-Match": row_etag}).headers["etag"].startswith('W/"2-')
+
+    # A write that commits late, with a timestamp older than the newest
+    # row, still changes the list's tag, and so does a row joining the page.
+    list_etag = client.get("/api/executions", params={"görevlendiren": marker}).headers["etag"]
+
+    async def late_update(db, client_id, broadcast, events):
+        await db.execute(update(ExecutionDB).where(ExecutionDB.id == created[0]["id"])
+                         .values(status="reopened", version=ExecutionDB.version + 1, updated_at=datetime(2020, 1, 1)))
+        await db.commit()
+
+    run_db(with_client(late_update))
+    listed = client.get("/api/executions", params={"görevlendiren": marker}, headers={"If-None-Match": list_etag})
+    assert listed.status_code == 200 and listed.json()[0]["status"] == "reopened"
+    list_etag = listed.headers["etag"]
+
+    async def backdated(db, client_id, broadcast, events):
+        row = body(await executions.create(db, ExecutionCreate(client_id=client_id, görevlendiren=marker), broadcast))
+        await db.execute(update(ExecutionDB).where(ExecutionDB.id == row["id"]).values(updated_at=datetime(2020, 1, 1)))
+        await db.commit()
+
+    run_db(with_client(backdated))
+    assert client.get("/api/executions", params={"görevlendiren": marker}, headers={"If-None-Match": list_etag}).status_code == 200
@@ -0,0 +1,84 @@
+import os
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import CaseDB, ClientDB, CompensationLetterDB, ExecutionDB
+from app.reminders import ReminderScheduler
+
+with patch.dict(os.environ, {
+    "ADMIN_PASSWORD": os.getenv("ADMIN_PASSWORD", "dashboard-tests"),
+    "JWT_SECRET": os.getenv("JWT_SECRET", "dashboard-tests"),
+}):
+    import app.main as main
+
+TODAY = date.today()
+
+
+def new_client(is_deleted=False):
+    now = datetime.now()
+    return ClientDB(id=str(uuid.uuid4()), name="Deniz Hukuk", email="d@example.com", phone="1",
+                    address="Ankara", created_at=now, updated_at=now, version=1, is_deleted=is_deleted)
+
+
+def new_case(client, status, reminder_date=None, is_deleted=False):
+    now = datetime.now()
+    return CaseDB(
+        id=str(uuid.uuid4()), title="Kira Davası", client_id=client.id, client_name=client.name,
+        case_type="Hukuk", status=status, court="İstanbul 3. Asliye Hukuk", case_number="2025/1",
+        defendant="Ahmet Yılmaz", start_date=date(2025, 1, 15), reminder_date=reminder_date,
+        office_archive_no="A-1", created_at=now, updated_at=now, version=1, is_deleted=is_deleted
+    )
+
+
+def new_execution(client, is_deleted=False):
+    now = datetime.now()
+    return ExecutionDB(
+        id=str(uuid.uuid4()), client_id=client.id, client_name=client.name, defendant="Ahmet Yılmaz",
+        execution_office="İstanbul 3. İcra Dairesi", execution_number="2025/1", status="active",
+        execution_type="ilamsız", start_date=date(2025, 1, 15), office_archive_no="A-1",
+        created_at=now, updated_at=now, version=1, is_deleted=is_deleted
+    )
+
+
+def test_dashboard_aggregates_match_counting_every_row(run_db):
+    """Test that the SQL totals and status counts equal counting the loaded rows, deleted rows excluded"""
+    async def scenario(engine):
+        # Rows are added inside a transaction that is rolled back when the
+        # connection closes.
+        async with engine.connect() as conn:
+            await conn.begin()
+            db = AsyncSession(bind=conn)
+            client, gone = new_client(), new_client(is_deleted=True)
+            due = new_case(client, "Derdest", reminder_date=TODAY + timedelta(days=3))
+            later = new_case(client, "Derdest", reminder_date=TODAY + timedelta(days=30))
+            deleted = new_case(client, "Karar", reminder_date=TODAY + timedelta(days=2), is_deleted=True)
+            db.add_all([client, gone, due, later, deleted, new_case(client, "Kapandı"),
+                        new_execution(client), new_execution(client, is_deleted=True)])
+            await db.flush()
+
+            scheduler = ReminderScheduler(lambda: AsyncSession(bind=conn), notify=lambda message: None,
+                                          today=lambda: TODAY)
+            with patch.object(main, "reminder_scheduler", scheduler):
+                dashboard = await main.build_dashboard(db)
+
+            async def active(model):
+                return [row for row in (await db.execute(select(model))).scalars() if not row.is_deleted]
+
+            cases = await active(CaseDB)
+            assert dashboard["total_cases"] == len(cases)
+            assert dashboard["total_clients"] == len(await active(ClientDB))
+            assert dashboard["total_executions"] == len(await active(ExecutionDB))
+            assert dashboard["total_compensation_letters"] == len(await active(CompensationLetterDB))
+            assert dashboard["status_counts"] == dict(Counter(case.status for case in cases))
+
+            reminded = {entry.get("case_id") for entry in dashboard["upcoming_reminders"]}
+            assert due.id in reminded
+            assert later.id not in reminded and deleted.id not in reminded
+            assert "upcoming_hearings" in dashboard
+
+    run_db(scenario)
@@ -0,0 +1,136 @@
+import asyncio
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.cache import DashboardCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.day = date(2025, 1, 1)
+
+    def __call__(self):
+        return self.now
+
+    def today(self):
+        return self.day
+
+
+def make_loader():
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"build": len(calls)}
+
+    return loader, calls
+
+
+def test_snapshot_served_from_memory_until_ttl():
+    """Test that repeated loads within the TTL are cache hits"""
+    clock = FakeClock()
+    cache = DashboardCache(ttl_seconds=10, clock=clock, today=clock.today)
+    loader, calls = make_loader()
+
+    async def scenario():
+        assert await cache.get(loader) == {"build": 1}
+        clock.now = 9
+        assert await cache.get(loader) == {"build": 1}
+        clock.now = 10
+        assert await cache.get(loader) == {"build": 2}
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test_snapshot_rolls_over_at_midnight():
+    """Test that a new calendar day forces a rebuild even inside the TTL"""
+    clock = FakeClock()
+    cache = DashboardCache(ttl_seconds=3600, clock=clock, today=clock.today)
+    loader, calls = make_loader()
+
+    async def scenario():
+        await cache.get(loader)
+        clock.day += timedelta(days=1)
+        await cache.get(loader)
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+
+def test_invalidate_discards_snapshot():
+    """Test that a data change invalidates the cached snapshot"""
+    clock = FakeClock()
+    cache = DashboardCache(ttl_seconds=3600, clock=clock, today=clock.today)
+    loader, calls = make_loader()
+
+    async def scenario():
+        await cache.get(loader)
+        cache.invalidate({"type": "data_change"})
+        return await cache.get(loader)
+
+    assert asyncio.run(scenario()) == {"build": 2}
+    assert cache.stats()["invalidations"] == 1
+
+def test_invalidation_during_rebuild_is_not_cached():
+    """Test that a snapshot built while a change arrived is not stored"""
+    clock = FakeClock()
+    cache = DashboardCache(ttl_seconds=3600, clock=clock, today=clock.today)
+    calls = []
+
+    async def racing_loader():
+        calls.append(1)
+        if len(calls) == 1:
+            cache.invalidate()
+        return len(calls)
+
+    async def scenario():
+        assert await cache.get(racing_loader) == 1
+        assert await cache.get(racing_loader) == 2
+
+    asyncio.run(scenario())
+
+def test_concurrent_misses_share_one_rebuild():
+    """Test that simultaneous misses only run the loader once"""
+    clock = FakeClock()
+    cache = DashboardCache(ttl_seconds=3600, clock=clock, today=clock.today)
+    calls = []
+
+    async def slow_loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "snapshot"
+
+    async def scenario():
+        return await asyncio.gather(*(cache.get(slow_loader) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["snapshot"] * 5
+    assert len(calls) == 1
+
+def test_snapshot_tags_follow_rebuilds():
+    """Test that a cached snapshot keeps its ETag and a rebuild or an uncached build does not share it"""
+    clock = FakeClock()
+    cache = DashboardCache(ttl_seconds=3600, clock=clock, today=clock.today)
+    calls = []
+
+    async def racing_loader():
+        calls.append(1)
+        if len(calls) == 2:
+            cache.invalidate()
+        return len(calls)
+
+    async def scenario():
+        first = await cache.get_tagged(racing_loader)
+        assert await cache.get_tagged(racing_loader) == first
+        cache.invalidate()
+        assert await cache.get_tagged(racing_loader) == (2, None)
+        third = await cache.get_tagged(racing_loader)
+        return first, third
+
+    (first, first_tag), (third, third_tag) = asyncio.run(scenario())
+    assert (first, third) == (1, 3)
+    assert first_tag.startswith('W/"dashboard-') and third_tag not in (None, first_tag)
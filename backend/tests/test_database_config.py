@@ -10,6 +10,8 @@ def test_database_url_required():
     """Test that DATABASE_URL environment variable is required"""
     with patch.dict(os.environ, {}, clear=True):
         with pytest.raises(ValueError, match="DATABASE_URL environment variable is required"):
+            if 'app.database' in sys.modules:
+                del sys.modules['app.database']
             import app.database
 
 def test_database_url_must_be_postgresql():
@@ -0,0 +1,82 @@
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.metrics import Counter, Gauge, Histogram, Registry, RequestMetrics, scrape_authorized, statement_kind
+
+
+def test_render_text_exposition_format():
+    """Test that histograms are cumulative and counters and gauges carry labels"""
+    registry = Registry()
+    latency = registry.register(Histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0)))
+    errors = registry.register(Counter("errors", "Errors", ["kind"]))
+    registry.register(Gauge("connections", "Open sockets", function=lambda: 3))
+
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    errors.inc('say "hi"')
+
+    assert registry.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 1',
+        'latency_seconds_bucket{route="/a",le="1.0"} 2',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 2',
+        'latency_seconds_sum{route="/a"} 0.55',
+        'latency_seconds_count{route="/a"} 2',
+        "# HELP errors Errors",
+        "# TYPE errors counter",
+        'errors_total{kind="say \\"hi\\""} 1.0',
+        "# HELP connections Open sockets",
+        "# TYPE connections gauge",
+        "connections 3",
+    ]
+
+
+def test_middleware_labels_by_route_template_and_status():
+    """Test that requests are recorded per route template, not per raw path"""
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str):
+        if item_id == "missing":
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    duration = Histogram("duration", "", ["method", "route", "status"])
+    in_flight = Gauge("in_flight", "")
+    app.add_middleware(RequestMetrics, duration=duration, in_flight=in_flight)
+
+    client = TestClient(app)
+    for path in ("/items/1", "/items/2", "/items/missing", "/nowhere"):
+        client.get(path)
+
+    assert {labels: series[2] for labels, series in duration._series.items()} == {
+        ("GET", "/items/{item_id}", "200"): 2,
+        ("GET", "/items/{item_id}", "404"): 1,
+        ("GET", "unmatched", "404"): 1,
+    }
+    assert in_flight._values[()] == 0
+
+
+def test_statement_kind():
+    """Test that statements are labelled by their leading keyword"""
+    assert statement_kind("SELECT cases.id FROM cases") == "SELECT"
+    assert statement_kind("\n  update cases SET status=%(status)s") == "UPDATE"
+    assert statement_kind("WITH moved AS (...) SELECT 1") == "WITH"
+    assert statement_kind("LISTEN lexcloud_changes") == "OTHER"
+    assert statement_kind("") == "OTHER"
+
+
+def test_scrape_authorized_needs_the_bearer_token():
+    """Test that /metrics scrapes are accepted only with the configured bearer token"""
+    assert scrape_authorized("Bearer s3cret", "s3cret")
+    assert scrape_authorized("bearer s3cret", "s3cret")
+    assert not scrape_authorized("Bearer wrong", "s3cret")
+    assert not scrape_authorized("Basic s3cret", "s3cret")
+    assert not scrape_authorized("s3cret", "s3cret")
+    assert not scrape_authorized(None, "s3cret")
@@ -0,0 +1,96 @@
+import ast
+import os
+import re
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import psycopg
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from psycopg import sql
+from sqlalchemy import create_engine, inspect
+
+from app.database import Base
+
+ALEMBIC_DIR = Path(__file__).parent.parent / "alembic"
+
+# Dropped by 007 and put back by its downgrade.
+LEGACY_INDEXES = {"idx_cases_is_deleted", "idx_cases_status_updated_at", "idx_cases_defendant", "idx_clients_updated_at"}
+
+
+@pytest.fixture
+def empty_database(database_url):
+    """A new, empty database on the test server, dropped afterwards."""
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        available = {row[0] for row in conn.execute(
+            "SELECT name FROM pg_available_extensions WHERE name IN ('unaccent', 'pg_trgm')"
+        )}
+        if available != {"unaccent", "pg_trgm"}:
+            pytest.skip("005 needs the unaccent and pg_trgm extensions")
+        name = f"lexcloud_migrations_{uuid.uuid4().hex[:12]}"
+        conn.execute(sql.SQL("CREATE DATABASE {} TEMPLATE template0 ENCODING 'UTF8'").format(sql.Identifier(name)))
+        try:
+            yield database_url.rsplit("/", 1)[0] + "/" + name
+        finally:
+            conn.execute(sql.SQL("DROP DATABASE {} WITH (FORCE)").format(sql.Identifier(name)))
+
+
+def schema(url: str) -> dict:
+    engine = create_engine(url)
+    try:
+        inspector = inspect(engine)
+        return {
+            table: {
+                "columns": {column["name"] for column in inspector.get_columns(table)},
+                "indexes": {index["name"] for index in inspector.get_indexes(table)},
+            }
+            for table in inspector.get_table_names()
+        }
+    finally:
+        engine.dispose()
+
+
+def assert_at_head(url: str):
+    tables = schema(url)
+    for name, table in Base.metadata.tables.items():
+        missing = {column.name for column in table.columns} - tables[name]["columns"]
+        assert not missing, f"{name} is missing {missing}"
+    assert not LEGACY_INDEXES & set().union(*(table["indexes"] for table in tables.values()))
+
+
+def test_every_concurrent_index_is_listed_for_cleanup():
+    """Test that env.py may drop every index a revision builds concurrently, and nothing else"""
+    module = ast.parse((ALEMBIC_DIR / "env.py").read_text())
+    listed = next(
+        ast.literal_eval(node.value) for node in module.body
+        if isinstance(node, ast.Assign) and getattr(node.targets[0], "id", None) == "CONCURRENT_INDEXES"
+    )
+    built = set()
+    for path in (ALEMBIC_DIR / "versions").glob("*.py"):
+        source = path.read_text()
+        if "concurrently" in source.lower():
+            built.update(re.findall(r"\bidx_\w+", source))
+    assert set(listed) == built
+
+
+def test_migrations_upgrade_downgrade_and_upgrade_again(empty_database):
+    """Test that the chain builds the models' schema, downgrades to nothing and builds it again"""
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+    assert len(ScriptDirectory.from_config(config).get_heads()) == 1
+
+    with patch.dict(os.environ, {"DATABASE_URL": empty_database, "DIRECT_DATABASE_URL": ""}):
+        command.upgrade(config, "head")
+        assert_at_head(empty_database)
+
+        command.downgrade(config, "006_auth_tables")
+        assert LEGACY_INDEXES <= set().union(*(table["indexes"] for table in schema(empty_database).values()))
+
+        command.downgrade(config, "base")
+        assert set(schema(empty_database)) == {"alembic_version"}
+
+        command.upgrade(config, "head")
+        assert_at_head(empty_database)
@@ -0,0 +1,38 @@
+import pytest
+import sys
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.pagination import encode_cursor, decode_cursor, next_cursor
+
+Row = namedtuple("Row", ["id", "updated_at"])
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to the (updated_at, id) it was built from"""
+    updated_at = datetime(2025, 3, 14, 9, 26, 53, 589793)
+    cursor = encode_cursor(updated_at, "case-1")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (updated_at, "case-1")
+
+def test_malformed_cursor_rejected():
+    """Test that tampered or garbage cursors raise ValueError"""
+    for cursor in ["garbage", "e30", encode_cursor(datetime(2025, 1, 1), "x")[:-3]]:
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+def test_next_cursor_points_at_last_row_of_full_page():
+    """Test that the extra fetched row signals another page"""
+    rows = [Row(id=f"id-{i}", updated_at=datetime(2025, 1, 1, 12, 0, 10 - i)) for i in range(4)]
+    page, cursor = next_cursor(rows, limit=3)
+    assert [row.id for row in page] == ["id-0", "id-1", "id-2"]
+    assert decode_cursor(cursor) == (rows[2].updated_at, "id-2")
+
+def test_last_page_has_no_cursor():
+    """Test that a short page ends the iteration"""
+    rows = [Row(id="id-0", updated_at=datetime(2025, 1, 1))]
+    page, cursor = next_cursor(rows, limit=3)
+    assert page == rows
+    assert cursor is None
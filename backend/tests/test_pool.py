@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.pool import PoolConfig, PoolStats, instrumented, pool_status
+
+DATABASE_URL = "postgresql://user@pooler:6432/lexcloud"
+
+
+def test_config_defaults_and_pgbouncer_mode():
+    """Test that pool settings come from the environment and PgBouncer mode disables prepared statements"""
+    config = PoolConfig(DATABASE_URL, environ={})
+    assert config.engine_kwargs()["pool_size"] == 5 and config.engine_kwargs()["pool_timeout"] == 30.0
+    assert "prepare_threshold" not in config.connect_args()
+    assert config.direct_url == DATABASE_URL
+
+    config = PoolConfig(DATABASE_URL, environ={
+        "DB_POOL_SIZE": "2", "DB_POOL_MAX_OVERFLOW": "0", "DB_POOL_TIMEOUT_SECONDS": "1.5",
+        "DB_PGBOUNCER": "true", "DIRECT_DATABASE_URL": "postgres://user@db:5432/lexcloud",
+    })
+    assert config.as_dict() == {"size": 2, "max_overflow": 0, "timeout_seconds": 1.5,
+                                "recycle_seconds": 3600, "pgbouncer": True}
+    assert config.connect_args()["prepare_threshold"] is None
+    assert config.engine_kwargs()["pool_use_lifo"] is True
+    assert config.direct_url == "postgresql://user@db:5432/lexcloud"
+
+
+def test_histogram_is_cumulative():
+    """Test that wait times land in the first bucket whose bound they do not exceed"""
+    stats = PoolStats(buckets=(0.01, 0.1))
+    for wait in (0.001, 0.01, 0.05, 2.0):
+        stats.observe(wait)
+    assert stats.histogram() == {"0.01": 2, "0.1": 3, "+Inf": 4}
+    assert stats.max_wait_seconds == 2.0
+
+
+def test_instrumented_pool_counts_checkouts_and_timeouts():
+    """Test that checkouts are timed and an exhausted pool records a timeout"""
+    stats = PoolStats()
+    pool = instrumented(QueuePool, stats)(MagicMock, pool_size=1, max_overflow=0, timeout=0.01)
+
+    held = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    status = pool_status(pool, stats)
+    assert status["checked_out"] == 1 and status["checkouts"] == 2 and status["timeouts"] == 1
+    assert status["wait_histogram"]["+Inf"] == 2
+
+    held.close()
+    pool.connect().close()
+    assert pool_status(pool, stats)["checked_out"] == 0
@@ -0,0 +1,311 @@
+import asyncio
+import json
+import os
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL not set", allow_module_level=True)
+
+# What app.main needs at import and at startup. Full startup loads the
+# reminder index, and every request is sampled for the query report.
+APP_ENV = {
+    "DATABASE_URL": TEST_DATABASE_URL,
+    "ADMIN_PASSWORD": os.getenv("ADMIN_PASSWORD", "plan-tests"),
+    "JWT_SECRET": os.getenv("JWT_SECRET", "plan-tests"),
+    "STARTUP_MODE": "full",
+    "QUERY_STATS_SAMPLE_RATE": "1.0",
+}
+
+import psycopg
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from psycopg import sql
+from sqlalchemy import event
+
+with patch.dict(os.environ, APP_ENV):
+    from app.main import JWT_SECRET, app, async_engine, dashboard_cache, reminder_scheduler
+from app.pagination import encode_cursor
+from app.query_stats import current_request
+from app.reminders import REMINDER_SOURCES
+from benchmarks.concurrency import make_token
+from benchmarks.seed import Generator, _rows, copy_rows
+
+ALEMBIC_DIR = Path(__file__).parent.parent / "alembic"
+
+# Plans are checked against the schema the migrations build, search
+# indexes included, loaded with a dataset large enough that the planner
+# would rather read a whole table than use a missing index. It lives in a
+# database of its own on the test server, dropped afterwards.
+SEED_ROWS = {
+    "clients": int(os.getenv("PLAN_SEED_CLIENTS", "2000")),
+    "cases": int(os.getenv("PLAN_SEED_CASES", "60000")),
+    "executions": int(os.getenv("PLAN_SEED_EXECUTIONS", "30000")),
+    "compensation_letters": int(os.getenv("PLAN_SEED_LETTERS", "10000")),
+}
+MAX_SEQ_SCAN_ROWS = int(os.getenv("PLAN_MAX_SEQ_SCAN_ROWS", "1000"))
+MAX_COST = float(os.getenv("PLAN_MAX_COST", "5000"))
+
+# Statements known to read whole tables: aggregates over every active row
+# need them whatever the indexes are. Each is matched on its SQL and may
+# scan only the tables listed with it.
+FULL_SCANS = {
+    "dashboard totals": (
+        re.compile(r"^SELECT \(SELECT count\(\*\) AS count_1 FROM cases WHERE cases\.is_deleted = false\)"),
+        {"cases", "clients", "executions", "compensation_letters"},
+    ),
+    "dashboard status counts": (
+        re.compile(r"^SELECT cases\.status, count\(\*\) AS count_1 FROM cases WHERE cases\.is_deleted = false GROUP BY cases\.status$"),
+        {"cases"},
+    ),
+}
+
+CASE_REQUESTS = [
+    ("/api/cases", {"limit": 50}),
+    ("/api/cases", {"limit": 50, "page": 20}),
+    ("/api/cases", {"limit": 50, "cursor": ""}),
+    ("/api/cases", {"limit": 50, "cursor": encode_cursor(datetime.now() - timedelta(days=90), "")}),
+    ("/api/cases", {"limit": 50, "status": "Derdest"}),
+    ("/api/cases", {"limit": 50, "cursor": "", "status": "Derdest"}),
+    ("/api/cases", {"limit": 50, "query": "yılmaz"}),
+    ("/api/cases", {"limit": 50, "cursor": "", "fields": "summary"}),
+    ("/api/cases/{case_id}", {}),
+]
+EXECUTION_REQUESTS = [
+    ("/api/executions", {"limit": 50}),
+    ("/api/executions", {"limit": 50, "cursor": ""}),
+    ("/api/executions", {"limit": 50, "status": "Derdest"}),
+    ("/api/executions", {"limit": 50, "client_id": "{client_id}"}),
+]
+DASHBOARD_REQUESTS = [
+    ("/api/dashboard", {}),
+]
+SEARCH_REQUESTS = [
+    ("/api/cases/search", {"limit": 50}),
+    ("/api/cases/search", {"limit": 50, "status": "Derdest"}),
+    ("/api/cases/search", {"limit": 50, "client_id": "{client_id}"}),
+    ("/api/cases/search", {"q": "yılmaz", "limit": 50}),
+    ("/api/cases/search", {"q": "2023/1", "limit": 50}),
+]
+
+# Work a group depends on that runs outside any request. The dashboard
+# reads reminders from the index these queries fill, at startup, at
+# midnight and after changes it cannot apply in place.
+BACKGROUND = {
+    "dashboard": {
+        "reminder index reload": lambda: reminder_scheduler.reload(list(REMINDER_SOURCES)),
+    },
+}
+
+# Set while a BACKGROUND step runs, so its statements are captured.
+in_background = ContextVar("in_background", default=False)
+
+
+def seed_dataset(cur) -> dict:
+    generator = Generator(7, date.today())
+    clients = [generator.client() for _ in range(SEED_ROWS["clients"])]
+    copy_rows(cur, "clients", iter(clients))
+    cases = list(_rows(generator, generator.case, clients, SEED_ROWS["cases"]))
+    copy_rows(cur, "cases", iter(cases))
+    copy_rows(cur, "executions", _rows(generator, generator.execution, clients, SEED_ROWS["executions"]))
+    copy_rows(cur, "compensation_letters", _rows(generator, generator.letter, clients, SEED_ROWS["compensation_letters"]))
+    return {
+        "client_id": next(client["id"] for client in clients if not client["is_deleted"]),
+        "case_id": next(case["id"] for case in cases if not case["is_deleted"]),
+    }
+
+
+@pytest.fixture(scope="module")
+def plan_database(database_url):
+    """``(url, name, ids)``: a new database migrated to head and seeded, dropped afterwards."""
+    with psycopg.connect(database_url, autocommit=True) as conn:
+        available = {row[0] for row in conn.execute(
+            "SELECT name FROM pg_available_extensions WHERE name IN ('unaccent', 'pg_trgm')"
+        )}
+        if available != {"unaccent", "pg_trgm"}:
+            pytest.skip("plans are checked against a migrated database, and 005 needs the unaccent and pg_trgm extensions")
+        name = f"lexcloud_plans_{uuid.uuid4().hex[:12]}"
+        conn.execute(sql.SQL("CREATE DATABASE {} TEMPLATE template0 ENCODING 'UTF8'").format(sql.Identifier(name)))
+        try:
+            url = database_url.rsplit("/", 1)[0] + "/" + name
+            config = Config()
+            config.set_main_option("script_location", str(ALEMBIC_DIR))
+            with patch.dict(os.environ, {"DATABASE_URL": url, "DIRECT_DATABASE_URL": ""}):
+                command.upgrade(config, "head")
+
+            with psycopg.connect(url) as seed:
+                with seed.cursor() as cur:
+                    ids = seed_dataset(cur)
+            with psycopg.connect(url, autocommit=True) as analyze:
+                analyze.execute("VACUUM ANALYZE clients, cases, executions, compensation_letters")
+            yield url, name, ids
+        finally:
+            conn.execute(sql.SQL("DROP DATABASE {} WITH (FORCE)").format(sql.Identifier(name)))
+
+
+def capture(groups: dict, database: str, ids: dict) -> dict:
+    """Call each endpoint and run each background step, collecting the statements each sends."""
+    captured = {group: {} for group in groups}
+    current = []
+
+    def connect_to_plan_database(dialect, connection_record, cargs, cparams):
+        cparams["dbname"] = database
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Other background work (client name reconciliation, revocation
+        # refreshes) may run meanwhile and is left out.
+        if current_request.get() is not None or in_background.get():
+            current.append((statement, parameters))
+
+    async def run_in_background(step):
+        in_background.set(True)
+        await step()
+
+    # The app's connections are opened afresh, to the plan database, and
+    # closed again before other tests use the engine.
+    asyncio.run(async_engine.dispose(close=False))
+    event.listen(async_engine.sync_engine, "do_connect", connect_to_plan_database)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        # One client for every request: the app's locks and events belong to
+        # the event loop its startup ran on.
+        with patch.dict(os.environ, APP_ENV), TestClient(app) as client:
+            try:
+                client.headers["Authorization"] = f"Bearer {make_token(JWT_SECRET)}"
+                for group, requests in groups.items():
+                    for path, params in requests:
+                        dashboard_cache.invalidate()
+                        current.clear()
+                        path = path.format(**ids)
+                        params = {name: str(value).format(**ids) for name, value in params.items()}
+                        response = client.get(path, params=params)
+                        assert response.status_code == 200, (path, params, response.text)
+                        captured[group][f"{path} {params}"] = list(current)
+                    for name, step in BACKGROUND.get(group, {}).items():
+                        current.clear()
+                        client.portal.call(run_in_background, step)
+                        captured[group][name] = list(current)
+            finally:
+                client.portal.call(async_engine.dispose)
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(async_engine.sync_engine, "do_connect", connect_to_plan_database)
+    return captured
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def allowed_full_scan(statement: str):
+    """The FULL_SCANS entry ``(name, tables)`` a statement matches, or ``(None, set())``."""
+    flat = " ".join(statement.split())
+    for name, (pattern, tables) in FULL_SCANS.items():
+        if pattern.search(flat):
+            return name, tables
+    return None, set()
+
+
+def plan_problems(statement: str, plan: dict) -> list:
+    problems = []
+    allowed, tables = allowed_full_scan(statement)
+    for node in plan_nodes(plan):
+        if node["Node Type"] == "Seq Scan" and node["Plan Rows"] > MAX_SEQ_SCAN_ROWS and node["Relation Name"] not in tables:
+            problems.append(f"Seq Scan on {node['Relation Name']} (~{node['Plan Rows']} rows)")
+    if plan["Total Cost"] > MAX_COST and not allowed:
+        problems.append(f"estimated cost {plan['Total Cost']:.0f} over {MAX_COST:.0f}")
+    return problems
+
+
+_plans = {}
+
+
+def explain_all(plan_database) -> dict:
+    """Capture every endpoint's statements and EXPLAIN them, once per run."""
+    if _plans:
+        return _plans
+    url, name, ids = plan_database
+    groups = {"cases": CASE_REQUESTS, "executions": EXECUTION_REQUESTS,
+              "dashboard": DASHBOARD_REQUESTS, "search": SEARCH_REQUESTS}
+    plans = {}
+    with psycopg.connect(url) as conn:
+        with conn.cursor() as cur:
+            for group, requests in capture(groups, name, ids).items():
+                plans[group] = {}
+                for request, statements in requests.items():
+                    explained = []
+                    for statement, parameters in statements:
+                        cur.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                        plan = cur.fetchone()[0]
+                        plan = json.loads(plan) if isinstance(plan, str) else plan
+                        explained.append((statement, plan[0]["Plan"]))
+                    plans[group][request] = explained
+    _plans.update(plans)
+    return _plans
+
+
+def assert_plans(plan_database, group: str):
+    failures = []
+    for request, explained in explain_all(plan_database)[group].items():
+        assert explained, f"{request} ran no statements"
+        for statement, plan in explained:
+            for problem in plan_problems(statement, plan):
+                failures.append(f"{request}: {problem}\n    {' '.join(statement.split())[:300]}")
+    assert not failures, "\n".join(failures)
+
+
+def test_plan_checks_flag_seq_scans_and_cost():
+    """Test that a large seq scan or an expensive plan is reported unless the statement is allowed a full scan"""
+    plan = {"Node Type": "Limit", "Total Cost": 9000.0, "Plans": [
+        {"Node Type": "Seq Scan", "Relation Name": "cases", "Plan Rows": 60000, "Total Cost": 9000.0},
+    ]}
+    assert plan_problems("SELECT cases.id FROM cases", plan) == [
+        "Seq Scan on cases (~60000 rows)",
+        f"estimated cost 9000 over {MAX_COST:.0f}",
+    ]
+    assert plan_problems("SELECT count(*) AS count_1 FROM cases", plan) == [
+        "Seq Scan on cases (~60000 rows)",
+        f"estimated cost 9000 over {MAX_COST:.0f}",
+    ]
+
+    status_counts = """SELECT cases.status, count(*) AS count_1
+        FROM cases
+        WHERE cases.is_deleted = false GROUP BY cases.status"""
+    assert allowed_full_scan(status_counts)[0] == "dashboard status counts"
+    assert plan_problems(status_counts, plan) == []
+    plan["Plans"][0]["Relation Name"] = "executions"
+    assert plan_problems(status_counts, plan) == ["Seq Scan on executions (~60000 rows)"]
+
+
+def test_case_list_and_detail_plans(plan_database):
+    """Test that case list pages, filters and detail reads use indexes"""
+    assert_plans(plan_database, "cases")
+
+
+def test_execution_list_plans(plan_database):
+    """Test that execution list pages and filters use indexes"""
+    assert_plans(plan_database, "executions")
+
+
+def test_dashboard_plans(plan_database):
+    """Test that the dashboard and the reminder index reload behind it use indexes, aggregates aside"""
+    assert_plans(plan_database, "dashboard")
+    dashboard = explain_all(plan_database)["dashboard"]
+    statements = [statement for explained in dashboard.values() for statement, _ in explained]
+    assert {allowed_full_scan(statement)[0] for statement in statements} >= set(FULL_SCANS)
+    assert len(dashboard["reminder index reload"]) == len(REMINDER_SOURCES)
+
+
+def test_search_plans(plan_database):
+    """Test that case search, text queries included, uses its indexes"""
+    assert_plans(plan_database, "search")
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.query_stats import QueryStatsConfig, QueryStatsMiddleware, QueryStatsRecorder
+
+CLIENT_BY_ID = "SELECT clients.name FROM clients WHERE clients.id = %(id_1)s"
+
+
+def make_app(environ, sample=lambda: 0.0):
+    logged = []
+    recorder = QueryStatsRecorder(QueryStatsConfig(environ), log=logged.append)
+    app = FastAPI()
+
+    @app.get("/api/cases/{item_id}")
+    async def get_case(item_id: str):
+        # Stands in for the engine events firing during the handler.
+        recorder.observe("SELECT cases.id FROM cases WHERE cases.id = %(id_1)s", 0.002)
+        for _ in range(6):
+            recorder.observe(CLIENT_BY_ID, 0.001)
+        return {"id": item_id}
+
+    app.add_middleware(QueryStatsMiddleware, recorder=recorder, sample=sample)
+    return TestClient(app), recorder, logged
+
+
+def test_repeated_statements_are_reported_with_the_route():
+    """Test that a statement shape repeated past the threshold logs one warning naming the route"""
+    client, recorder, logged = make_app({"QUERY_STATS_MAX_REPEATS": "5"})
+    response = client.get("/api/cases/c-1")
+
+    assert "server-timing" not in response.headers
+    assert logged == [f"⚠️ GET /api/cases/{{item_id}}: 6x {CLIENT_BY_ID}"]
+    assert recorder.warnings == 1
+
+
+def test_server_timing_header_and_thresholds():
+    """Test that Server-Timing splits database and app time and quiet requests log nothing"""
+    client, _, logged = make_app({"SERVER_TIMING": "true", "QUERY_STATS_MAX_REPEATS": "10"})
+    response = client.get("/api/cases/c-1")
+
+    db, app_time = response.headers["server-timing"].split(", ")
+    assert db == 'db;dur=8.0;desc="7 queries"'
+    assert app_time.startswith("app;dur=")
+    assert logged == []
+
+    client, _, logged = make_app({"QUERY_STATS_MAX_QUERIES": "3", "QUERY_STATS_SLOW_QUERY_MS": "2"})
+    client.get("/api/cases/c-1")
+    assert logged == [
+        "⚠️ GET /api/cases/{item_id}: 7 queries; 6x " + CLIENT_BY_ID
+        + "; slow query (2 ms): SELECT cases.id FROM cases WHERE cases.id = %(id_1)s"
+    ]
+
+
+def test_unsampled_requests_and_background_queries_are_not_recorded():
+    """Test that requests outside the sample and queries outside a request are ignored"""
+    client, recorder, logged = make_app({"QUERY_STATS_SAMPLE_RATE": "0.1", "QUERY_STATS_MAX_QUERIES": "0"}, sample=lambda: 0.5)
+    client.get("/api/cases/c-1")
+    recorder.observe(CLIENT_BY_ID, 1.0)
+    assert logged == [] and recorder.warnings == 0
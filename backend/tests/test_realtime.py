@@ -0,0 +1,170 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.realtime import ConnectionManager, PostgresBroadcastBackend
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed = None
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket gone")
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+def test_broadcast_does_not_wait_for_slow_clients():
+    """Test that a slow socket delays neither the broadcast nor other sockets"""
+    async def scenario():
+        manager = ConnectionManager()
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=5)
+        manager.connect(fast, "a")
+        manager.connect(slow, "b")
+
+        await asyncio.wait_for(manager.broadcast_data_change("create", "case", "1", {}), timeout=0.1)
+        await asyncio.sleep(0.05)
+        assert [m["entity_id"] for m in fast.sent] == ["1"]
+        assert slow.sent == []
+
+        manager.disconnect(fast, "a")
+        manager.disconnect(slow, "b")
+
+    asyncio.run(scenario())
+
+def test_message_serialized_once_per_broadcast():
+    """Test that json.dumps runs once regardless of subscriber count"""
+    async def scenario():
+        manager = ConnectionManager()
+        sockets = [FakeWebSocket() for _ in range(10)]
+        for i, socket in enumerate(sockets):
+            manager.connect(socket, f"user-{i}")
+        with patch("app.realtime.json.dumps", wraps=json.dumps) as dumps:
+            await manager.broadcast_data_change("update", "client", "c1", {"name": "Ayşe"})
+        assert dumps.call_count == 1
+        await asyncio.sleep(0.01)
+        assert all(len(socket.sent) == 1 for socket in sockets)
+
+    asyncio.run(scenario())
+
+def test_overflowing_subscriber_is_marked_for_resync():
+    """Test that a full outbox is replaced by a single resync message"""
+    async def scenario():
+        manager = ConnectionManager(queue_size=3)
+        slow = FakeWebSocket(delay=0.05)
+        manager.connect(slow, "a")
+        for i in range(10):
+            await manager.broadcast_data_change("update", "case", str(i), {})
+        await asyncio.sleep(0.3)
+        return manager, slow
+
+    manager, slow = asyncio.run(scenario())
+    assert slow.sent[-1]["type"] == "resync"
+    assert len(slow.sent) <= 4
+    assert manager.resyncs == 1
+
+def test_failed_socket_is_dropped():
+    """Test that a socket whose send fails is disconnected and closed"""
+    async def scenario():
+        manager = ConnectionManager()
+        broken = FakeWebSocket(fail=True)
+        manager.connect(broken, "a")
+        await manager.broadcast_data_change("delete", "case", "1", {})
+        await asyncio.sleep(0.01)
+        return manager, broken
+
+    manager, broken = asyncio.run(scenario())
+    assert manager.active_connections == {}
+    assert broken.closed == 1011
+    assert manager.stats()["dropped_connections"] == 1
+
+
+class FakeListenConnection:
+    """Stands in for the LISTEN connection: replays payloads, then drops."""
+
+    def __init__(self, payloads, drop):
+        self.payloads = payloads
+        self.drop = drop
+        self.executed = []
+
+    async def execute(self, query):
+        self.executed.append(query.as_string(None))
+
+    async def notifies(self):
+        for payload in self.payloads:
+            yield SimpleNamespace(payload=payload)
+        if self.drop:
+            raise OSError("server closed the connection")
+        await asyncio.Event().wait()
+
+    async def close(self):
+        pass
+
+
+def test_envelopes_are_truncated_and_own_events_skipped():
+    """Test that oversized payloads lose their data and a process ignores its own notifications"""
+    manager = ConnectionManager()
+    received = []
+    manager.add_change_listener(received.append)
+    backend = PostgresBroadcastBackend(manager, "postgresql://unused", publish_engine=None)
+    other = PostgresBroadcastBackend(ConnectionManager(), "postgresql://unused", publish_engine=None)
+
+    big = {"type": "data_change", "entity_id": "c-1", "data": {"description": "x" * 10000}}
+    payload = other._encode(big)
+    assert len(payload.encode()) <= PostgresBroadcastBackend.MAX_PAYLOAD_BYTES
+    assert json.loads(payload)["message"] == {"type": "data_change", "entity_id": "c-1", "data": {}, "truncated": True}
+
+    backend._handle(backend._encode({"type": "data_change", "entity_id": "mine"}))
+    backend._handle(payload)
+    backend._handle("not json")
+    assert [message["entity_id"] for message in received] == ["c-1"]
+    assert backend.received == 1
+
+
+def test_listener_reconnects_with_quoted_channel_and_resyncs():
+    """Test that a dropped LISTEN connection is reopened and clients are told to resync"""
+    connections = [FakeListenConnection([], drop=True), FakeListenConnection([], drop=False)]
+
+    opened = []
+
+    async def connect(*args, **kwargs):
+        opened.append(connections[len(opened)])
+        return opened[-1]
+
+    async def scenario():
+        manager = ConnectionManager()
+        received = []
+        manager.add_change_listener(received.append)
+        backend = PostgresBroadcastBackend(manager, "postgresql://unused", publish_engine=None,
+                                           channel="LexCloud-changes", reconnect_delay=0.0)
+        with patch("app.realtime.psycopg.AsyncConnection.connect", connect):
+            task = asyncio.create_task(backend._listen())
+            for _ in range(100):
+                if len(opened) == 2 and backend.listening.is_set():
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        return received
+
+    received = asyncio.run(scenario())
+    assert len(opened) == 2
+    assert connections[0].executed == ['LISTEN "LexCloud-changes"']
+    assert [message["type"] for message in received] == ["resync"]
+    assert received[0]["reason"] == "listener_reconnected"
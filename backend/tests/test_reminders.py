@@ -0,0 +1,164 @@
+import asyncio
+import os
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+with patch.dict(os.environ, {"DATABASE_URL": os.getenv("DATABASE_URL", "postgresql://user@localhost/lexcloud")}):
+    from app.reminders import REMINDER_HORIZON_DAYS, TEXT_PREVIEW_LENGTH, ReminderScheduler
+
+TODAY = date(2025, 3, 10)
+
+
+def execution(entity_id, reminder_date):
+    return {
+        "id": entity_id, "execution_number": "2025/1", "execution_office": "İstanbul 3. İcra Dairesi",
+        "client_name": "Deniz Hukuk", "defendant": "Ahmet Yılmaz", "reminder_text": "Haciz",
+        "responsible_person": None, "görevlendiren": None,
+        "reminder_date": reminder_date.isoformat() if reminder_date else None,
+    }
+
+
+def change(change_type, entity_id, data):
+    return {"type": "data_change", "change_type": change_type, "entity_type": "execution",
+            "entity_id": entity_id, "data": data}
+
+
+def make_scheduler(day):
+    sent = []
+    clock = {"today": day}
+    scheduler = ReminderScheduler(
+        session_factory=None,
+        notify=sent.append,
+        today=lambda: clock["today"],
+        now=lambda: datetime.combine(clock["today"], datetime.min.time())
+    )
+    scheduler.index.roll(day)
+    scheduler.index.loaded = True
+    return scheduler, sent, clock
+
+
+def test_change_events_update_index_in_date_order():
+    """Test that creates, moves and deletes keep the upcoming list sorted"""
+    scheduler, _, _ = make_scheduler(TODAY)
+    scheduler.handle_change(change("create", "e-1", execution("e-1", TODAY + timedelta(days=5))))
+    scheduler.handle_change(change("create", "e-2", execution("e-2", TODAY + timedelta(days=2))))
+    scheduler.handle_change(change("create", "e-3", execution("e-3", TODAY + timedelta(days=30))))
+    scheduler.handle_change(change("create", "e-4", execution("e-4", TODAY - timedelta(days=1))))
+
+    upcoming = scheduler.upcoming(days=7)["upcoming_reminders"]
+    assert [(r["execution_id"], r["days_until"]) for r in upcoming] == [("e-2", 2), ("e-1", 5)]
+
+    scheduler.handle_change(change("update", "e-1", execution("e-1", None)))
+    scheduler.handle_change(change("delete", "e-2", {}))
+    assert scheduler.upcoming(days=7)["upcoming_reminders"] == []
+    # e-3 is beyond the horizon and e-4 in the past; neither was indexed.
+    assert len(scheduler.index) == 0
+
+
+def test_reminder_moved_onto_today_is_announced_once():
+    """Test that a reminder set to today is pushed immediately and only once"""
+    scheduler, sent, _ = make_scheduler(TODAY)
+    scheduler.handle_change(change("create", "e-1", execution("e-1", TODAY)))
+    scheduler.handle_change(change("update", "e-1", {**execution("e-1", TODAY), "reminder_text": "Tebligat"}))
+
+    assert len(sent) == 1
+    assert sent[0]["type"] == "reminder_due"
+    assert [r["execution_id"] for r in sent[0]["reminders"]] == ["e-1"]
+
+
+def test_midnight_roll_drops_past_entries_and_announces_due():
+    """Test that rolling to a new day announces everything due that day"""
+    scheduler, sent, clock = make_scheduler(TODAY)
+    scheduler.handle_change(change("create", "e-1", execution("e-1", TODAY + timedelta(days=1))))
+    scheduler.handle_change(change("create", "e-2", execution("e-2", TODAY + timedelta(days=3))))
+    assert sent == []
+
+    clock["today"] = TODAY + timedelta(days=1)
+    scheduler._roll(clock["today"])
+    assert [r["execution_id"] for r in sent[0]["reminders"]] == ["e-1"]
+    assert sent[0]["date"] == clock["today"].isoformat()
+
+    clock["today"] = TODAY + timedelta(days=2)
+    scheduler._roll(clock["today"])
+    assert len(sent) == 1
+    assert [r["execution_id"] for r in scheduler.upcoming(days=7)["upcoming_reminders"]] == ["e-2"]
+
+
+def test_events_without_full_rows_schedule_a_reload():
+    """Test that bulk, truncated, rename and resync events mark types for reload"""
+    scheduler, _, _ = make_scheduler(TODAY)
+    scheduler.handle_change({"type": "data_change", "change_type": "bulk", "entity_type": "execution",
+                             "entity_id": "", "data": {"update": ["e-1"]}})
+    scheduler.handle_change({"type": "data_change", "change_type": "update", "entity_type": "client",
+                             "entity_id": "c-1", "data": {"propagated": {"case": 2}}})
+    assert scheduler.stats()["pending_reloads"] == ["case", "execution"]
+
+    scheduler.handle_change({"type": "resync", "reason": "restore"})
+    assert scheduler.stats()["pending_reloads"] == ["case", "compensation_letter", "execution"]
+
+
+def test_long_notes_are_cut_to_a_preview():
+    """Test that a long reminder text is indexed as a preview with an ellipsis"""
+    scheduler, _, _ = make_scheduler(TODAY)
+    scheduler.handle_change(change("create", "e-1", {**execution("e-1", TODAY + timedelta(days=1)), "reminder_text": "x" * 5000}))
+    text = scheduler.upcoming(days=7)["upcoming_reminders"][0]["reminder_text"]
+    assert len(text) == TEXT_PREVIEW_LENGTH and text.endswith("…")
+
+
+def test_type_marked_dirty_during_a_reload_is_reloaded_without_waiting():
+    """Test that a change arriving while a reload runs wakes the loop again"""
+    scheduler, _, _ = make_scheduler(TODAY)
+    scheduler.max_sleep = 60
+    fetched = []
+
+    async def fetch(entity_type, today, ceiling):
+        fetched.append(entity_type)
+        if entity_type == "execution":
+            scheduler._mark_dirty(["case"])
+        await asyncio.sleep(0)
+        return []
+
+    async def scenario():
+        scheduler._fetch = fetch
+        scheduler._mark_dirty(["execution"])
+        scheduler.start()
+        while "case" not in fetched:
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+    assert fetched == ["execution", "case"]
+
+
+def test_changes_during_a_reload_are_replayed_instead_of_refetching():
+    """Test that a reload under steady writes fetches once and keeps the changes made meanwhile"""
+    scheduler, _, _ = make_scheduler(TODAY)
+    fetched = []
+
+    async def fetch(entity_type, today, ceiling):
+        fetched.append((today, ceiling))
+        # Committed after the query's snapshot, so the rows below miss them.
+        scheduler.handle_change(change("create", "e-2", execution("e-2", TODAY + timedelta(days=2))))
+        scheduler.handle_change(change("delete", "e-1", {}))
+        return [execution("e-1", TODAY + timedelta(days=1)), execution("e-3", TODAY + timedelta(days=3))]
+
+    scheduler._fetch = fetch
+    asyncio.run(scheduler.reload(["execution"]))
+    assert fetched == [(TODAY, TODAY + timedelta(days=REMINDER_HORIZON_DAYS))]
+    assert [r["execution_id"] for r in scheduler.upcoming()["upcoming_reminders"]] == ["e-2", "e-3"]
+    assert scheduler.stats()["pending_reloads"] == []
+
+
+def test_midnight_roll_reloads_the_day_entering_the_window():
+    """Test that rolling forward moves the horizon and schedules a reload to fill it"""
+    scheduler, _, clock = make_scheduler(TODAY)
+    assert scheduler.index.ceiling == TODAY + timedelta(days=REMINDER_HORIZON_DAYS)
+
+    clock["today"] = TODAY + timedelta(days=1)
+    scheduler._roll(clock["today"])
+    assert scheduler.index.ceiling == clock["today"] + timedelta(days=REMINDER_HORIZON_DAYS)
+    assert scheduler.stats()["pending_reloads"] == ["case", "compensation_letter", "execution"]
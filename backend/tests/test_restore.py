@@ -0,0 +1,123 @@
+import asyncio
+import gzip
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+with patch.dict(os.environ, {"DATABASE_URL": TEST_DATABASE_URL or os.getenv("DATABASE_URL", "postgresql://user@localhost/lexcloud")}):
+    from app.restore import _lines, restore_backup
+
+HEADER = {"format": "lexcloud-backup", "version": 1, "tables": ["clients"]}
+
+
+async def chunks(*parts):
+    for part in parts:
+        yield part
+
+
+async def collect(stream):
+    return [line async for line in stream]
+
+
+def client_row(client_id, version, name="Deniz Hukuk"):
+    return {
+        "id": client_id, "name": name, "email": "d@example.com", "phone": "1", "address": "Ankara",
+        "tax_id": None, "vekalet_ofis_no": None, "created_at": "2025-06-01T12:00:00",
+        "updated_at": "2025-06-01T12:00:00", "version": version, "is_deleted": False
+    }
+
+
+def ndjson(*records):
+    return b"".join(json.dumps(record).encode() + b"\n" for record in records)
+
+def test_lines_reassembled_across_chunks():
+    """Test that NDJSON lines split over chunk boundaries are rejoined"""
+    assert asyncio.run(collect(_lines(chunks(b'{"a":', b'1}\n\n{"b"', b':2}'), False))) == [b'{"a":1}', b'{"b":2}']
+
+def test_gzipped_upload_is_decompressed():
+    """Test that gzip uploads are decompressed incrementally"""
+    body = gzip.compress(b'{"a":1}\n{"b":2}\n')
+    assert asyncio.run(collect(_lines(chunks(body[:10], body[10:]), True))) == [b'{"a":1}', b'{"b":2}']
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+def test_restore_upserts_by_version():
+    """Test that new rows are inserted, newer versions applied and stale ones skipped"""
+    existing, fresh = f"restore-{uuid.uuid4()}", f"restore-{uuid.uuid4()}"
+
+    async def scenario():
+        from app.restore import async_engine
+        try:
+            await restore_backup(chunks(ndjson(HEADER, {"table": "clients", "row": client_row(existing, 2)})))
+            body = ndjson(
+                HEADER,
+                {"table": "clients", "row": client_row(existing, 1, name="stale")},
+                {"table": "clients", "row": client_row(fresh, 1)},
+            )
+            stale = await restore_backup(chunks(body))
+            newer = await restore_backup(chunks(ndjson(HEADER, {"table": "clients", "row": client_row(existing, 3, name="newer")})))
+            async with async_engine.connect() as conn:
+                stamps = (await conn.execute(
+                    text("SELECT updated_at FROM clients WHERE id IN (:existing, :fresh)"), {"existing": existing, "fresh": fresh}
+                )).scalars().all()
+            return stale["clients"], newer["clients"], stamps
+        finally:
+            await async_engine.dispose()
+
+    stale, newer, stamps = asyncio.run(scenario())
+    assert (stale["rows"], stale["inserted"], stale["updated"], stale["skipped"]) == (2, 1, 0, 1)
+    assert (newer["inserted"], newer["updated"]) == (0, 1)
+    assert len(stamps) == 2 and all(stamp > datetime(2025, 6, 1, 12) for stamp in stamps)
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+def test_restore_undeletes_rows_soft_deleted_since_the_backup():
+    """Test that restoring a backup brings back a row deleted after it, with a higher version"""
+    client_id = f"restore-{uuid.uuid4()}"
+    backup = ndjson(HEADER, {"table": "clients", "row": client_row(client_id, 1)})
+
+    async def scenario():
+        from app.restore import async_engine
+        try:
+            await restore_backup(chunks(backup))
+            async with async_engine.begin() as conn:
+                # As CrudResource.delete does: the version is left alone.
+                await conn.execute(text("UPDATE clients SET is_deleted = true WHERE id = :id"), {"id": client_id})
+            restored = await restore_backup(chunks(backup))
+            again = await restore_backup(chunks(backup))
+            async with async_engine.connect() as conn:
+                row = (await conn.execute(
+                    text("SELECT is_deleted, version FROM clients WHERE id = :id"), {"id": client_id}
+                )).one()
+            return restored["clients"], again["clients"], row
+        finally:
+            await async_engine.dispose()
+
+    restored, again, (is_deleted, version) = asyncio.run(scenario())
+    assert (restored["updated"], again["skipped"]) == (1, 1)
+    assert is_deleted is False and version == 2
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+def test_restore_rejects_bad_format_versions():
+    """Test that a non-integer or newer format version is a 400, not a server error"""
+    async def scenario(version):
+        from app.restore import async_engine
+        try:
+            await restore_backup(chunks(ndjson({**HEADER, "version": version})))
+        finally:
+            await async_engine.dispose()
+
+    for version in ("2", None, 1.5, True, 99):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(scenario(version))
+        assert error.value.status_code == 400
@@ -0,0 +1,103 @@
+import re
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import CaseDB
+from app.search import CASE_SEARCH_TEXT, CASE_SEARCH_VECTOR, apply_case_search, escape_like
+
+MIGRATION = Path(__file__).parent.parent / "alembic" / "versions" / "005_case_search_indexes.py"
+
+# As created by 005, for test databases built from the models.
+FOLD_FUNCTION = """
+    CREATE OR REPLACE FUNCTION lexcloud_fold(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+    AS $$ SELECT lower(public.unaccent('public.unaccent'::regdictionary, translate(value, 'İIı', 'iii'))) $$
+"""
+
+
+def compiled(q: str):
+    return apply_case_search(select(CaseDB.id), q).compile(dialect=postgresql.dialect())
+
+
+def squeeze(sql: str) -> str:
+    return re.sub(r"\s+", "", sql)
+
+
+def test_escape_like():
+    """Test that LIKE wildcards and the escape character match literally"""
+    assert escape_like("2023/1") == "2023/1"
+    assert escape_like("50%_a\\b") == "50\\%\\_a\\\\b"
+
+
+def test_search_expressions_match_the_indexes():
+    """Test that the searched expressions are the ones 005 indexes"""
+    migration = squeeze(MIGRATION.read_text())
+    assert squeeze(CASE_SEARCH_TEXT) in migration
+    assert squeeze(CASE_SEARCH_VECTOR) in migration
+    sql = str(compiled("yılmaz"))
+    assert CASE_SEARCH_TEXT in sql and CASE_SEARCH_VECTOR in sql
+
+
+def test_short_queries_use_full_text_only():
+    """Test that queries shorter than a trigram skip the LIKE and similarity matches"""
+    short = str(compiled(" ab "))
+    assert "@@ plainto_tsquery" in short
+    assert " LIKE " not in short and "<%" not in short
+
+    full = compiled(" 10%_1 ")
+    assert "LIKE lexcloud_fold(" in str(full) and "ESCAPE" in str(full)
+    assert "%10\\%\\_1%" in full.params.values()
+    assert "<%" in str(full)
+    assert "ORDER BY ts_rank_cd(" in str(full)
+
+
+def new_case(title, case_number, defendant, client_name="Deniz Hukuk", is_deleted=False):
+    now = datetime.now()
+    return CaseDB(
+        id=str(uuid.uuid4()), title=title, client_id=str(uuid.uuid4()), client_name=client_name,
+        case_type="Hukuk", status="Derdest", court="İstanbul 3. Asliye Hukuk", case_number=case_number,
+        defendant=defendant, start_date=date(2025, 1, 15), office_archive_no="A-1",
+        created_at=now, updated_at=now, version=1, is_deleted=is_deleted
+    )
+
+
+def test_search_matches_folded_words_substrings_and_near_misses(run_db):
+    """Test that search folds Turkish letters, finds partial case numbers and typos, and ranks title hits first"""
+    async def scenario(engine):
+        # Everything, extensions included, is rolled back when the
+        # connection closes.
+        async with engine.connect() as conn:
+            available = {name for name, in await conn.execute(text(
+                "SELECT name FROM pg_available_extensions WHERE name IN ('unaccent', 'pg_trgm')"
+            ))}
+            if available != {"unaccent", "pg_trgm"}:
+                pytest.skip("search needs the unaccent and pg_trgm extensions")
+
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+            await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            await conn.execute(text(FOLD_FUNCTION))
+
+            db = AsyncSession(bind=conn)
+            in_title = new_case("İSTANBUL Kira Davası", "2023/145", "Mehmet Kaya")
+            in_defendant = new_case("Alacak Davası", "2024/9", "Ahmet Yılmaz", client_name="Istanbul Tekstil")
+            unrelated = new_case("Tapu İptali", "2022/77", "Zeynep Demir")
+            deleted = new_case("İstanbul Tahliye", "2023/146", "Ali Veli", is_deleted=True)
+            db.add_all([in_title, in_defendant, unrelated, deleted])
+            await db.flush()
+
+            async def search(q):
+                query = select(CaseDB.id).where(CaseDB.is_deleted == False)
+                return list((await db.execute(apply_case_search(query, q))).scalars())
+
+            assert await search("istanbul") == [in_title.id, in_defendant.id]
+            assert await search("2023/14") == [in_title.id]
+            assert await search("yilmazz") == [in_defendant.id]
+            assert await search("100%") == []
+
+    run_db(scenario)
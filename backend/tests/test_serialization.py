@@ -0,0 +1,35 @@
+import sys
+from datetime import date, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+
+from app import serialization
+from app.serialization import FastJSONResponse
+
+ROWS = [{
+    "id": "k1",
+    "court": "İstanbul 3. Asliye Hukuk",
+    "start_date": date(2025, 1, 15),
+    "reminder_date": None,
+    "updated_at": datetime(2025, 6, 1, 12, 0, 0, 123456),
+    "created_at": datetime(2025, 6, 1, 12, 0, 0),
+    "version": 3,
+}]
+EXPECTED = JSONResponse([
+    {**row, "start_date": row["start_date"].isoformat(), "updated_at": row["updated_at"].isoformat(),
+     "created_at": row["created_at"].isoformat()}
+    for row in ROWS
+]).body
+
+def test_fast_response_matches_standard_encoding():
+    """Test that the fast path produces the same bytes as JSONResponse"""
+    assert FastJSONResponse(ROWS).body == EXPECTED
+
+def test_fast_response_without_orjson():
+    """Test that the standard library fallback produces the same bytes"""
+    with patch.object(serialization, "orjson", None):
+        assert FastJSONResponse(ROWS).body == EXPECTED
@@ -0,0 +1,113 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.startup import StartupReport, startup_mode, warm_pool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeConnection:
+    def __init__(self, engine):
+        self.engine = engine
+
+    async def execute(self, statement):
+        self.engine.open += 1
+        self.engine.peak = max(self.engine.peak, self.engine.open)
+        await asyncio.sleep(0)
+
+    async def close(self):
+        self.engine.open -= 1
+
+
+class FakePool:
+    def size(self):
+        return 5
+
+
+class FakeEngine:
+    pool = FakePool()
+
+    def __init__(self):
+        self.open = 0
+        self.peak = 0
+
+    async def connect(self):
+        return FakeConnection(self)
+
+
+def test_phases_are_timed_and_failures_recorded():
+    """Test that each phase records its duration and a failing phase does not abort startup"""
+    clock = FakeClock()
+    report = StartupReport("fast", clock=clock, started=0.0)
+
+    async def scenario():
+        clock.now = 0.5
+        report.mark("import")
+        async with report.phase("pool_warmup"):
+            clock.now = 0.75
+        async with report.phase("reminder_index", required=False):
+            clock.now = 1.0
+            raise RuntimeError("relation does not exist")
+
+    asyncio.run(scenario())
+    assert not report.ready
+    report.finish()
+    assert report.as_dict() == {
+        "mode": "fast",
+        "ready": True,
+        "total_ms": 1000.0,
+        "phases": {"import": 500.0, "pool_warmup": 250.0, "reminder_index": 250.0},
+        "errors": {"reminder_index": "relation does not exist"},
+    }
+
+
+def test_failed_required_phase_keeps_instance_unready():
+    """Test that a failed required phase keeps readiness false until it is resolved"""
+    report = StartupReport("full", clock=FakeClock(), started=0.0)
+
+    async def scenario():
+        async with report.phase("schema_check"):
+            raise RuntimeError("Database schema is at 006, expected 007")
+
+    asyncio.run(scenario())
+    report.finish()
+    assert not report.ready and report.as_dict()["ready"] is False
+    assert report.errors == {"schema_check": "Database schema is at 006, expected 007"}
+
+    report.resolve("schema_check")
+    assert report.ready and report.errors == {}
+
+
+def test_warm_pool_holds_connections_concurrently_up_to_pool_size():
+    """Test that warm-up opens the requested connections at once, capped at the pool size"""
+    engine = FakeEngine()
+    assert asyncio.run(warm_pool(engine, 3)) == 3
+    assert engine.peak == 3 and engine.open == 0
+
+    engine = FakeEngine()
+    assert asyncio.run(warm_pool(engine, 20)) == 5
+    assert asyncio.run(warm_pool(engine, 0)) == 0
+
+
+def test_startup_mode_is_validated():
+    """Test that STARTUP_MODE defaults to full and rejects unknown modes"""
+    with patch.dict(os.environ, {}, clear=True):
+        assert startup_mode() == "full"
+    with patch.dict(os.environ, {"STARTUP_MODE": "Fast"}):
+        assert startup_mode() == "fast"
+    with patch.dict(os.environ, {"STARTUP_MODE": "lazy"}):
+        with pytest.raises(ValueError):
+            startup_mode()
@@ -0,0 +1,67 @@
+import pytest
+import sys
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from pydantic import BaseModel
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.sync import SYNC_GRACE, encode_sync_token, decode_sync_token, advance_position, sync_row
+
+Row = namedtuple("Row", ["id", "updated_at"])
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+def test_sync_token_round_trip():
+    """Test that per-entity positions survive encoding"""
+    positions = {"cases": (datetime(2025, 6, 1, 11, 0, 0, 123456), "case-9"), "clients": (NOW, "")}
+    assert decode_sync_token(encode_sync_token(positions)) == positions
+    assert decode_sync_token(None) == {}
+
+def test_malformed_sync_token_rejected():
+    """Test that garbage tokens raise ValueError"""
+    with pytest.raises(ValueError):
+        decode_sync_token("not-a-token")
+
+def test_position_unchanged_without_rows():
+    """Test that an empty poll keeps the previous position"""
+    previous = (NOW - timedelta(hours=1), "a")
+    assert advance_position(previous, [], 10, NOW) == (previous, False)
+
+def test_position_held_back_by_grace_window():
+    """Test that rows newer than now - grace will be sent again"""
+    rows = [Row("a", NOW - timedelta(minutes=5)), Row("b", NOW - timedelta(seconds=1))]
+    position, has_more = advance_position(None, rows, 10, NOW)
+    assert position == (NOW - SYNC_GRACE, "")
+    assert has_more is False
+
+def test_position_advances_to_last_settled_row():
+    """Test that rows older than the grace window are not re-sent"""
+    rows = [Row("a", NOW - timedelta(minutes=5)), Row("b", NOW - timedelta(minutes=1))]
+    assert advance_position(None, rows, 10, NOW) == ((rows[1].updated_at, "b"), False)
+
+def test_truncated_page_resumes_after_last_returned_row():
+    """Test that a full page reports has_more and resumes after the last row sent"""
+    rows = [Row(str(i), NOW - timedelta(minutes=10 - i)) for i in range(4)]
+    assert advance_position(None, rows, 3, NOW) == ((rows[2].updated_at, "2"), True)
+
+def test_truncated_page_held_back_by_grace_window():
+    """Test that a full page ending inside the grace window resumes from now - grace"""
+    rows = [Row(str(i), NOW - timedelta(seconds=4 - i)) for i in range(4)]
+    assert advance_position(None, rows, 3, NOW) == ((NOW - SYNC_GRACE, ""), False)
+    previous = (NOW - timedelta(seconds=2), "x")
+    assert advance_position(previous, rows, 3, NOW) == (previous, False)
+
+def test_sync_row_copies_schema_fields_from_the_orm_row():
+    """Test that a changed row is serialized with exactly its schema's fields"""
+    class Client(BaseModel):
+        id: str
+        name: str
+        tax_id: Optional[str] = None
+        version: int
+
+    row = SimpleNamespace(id="client-1", name="Deniz Hukuk", tax_id=None, version=3, is_deleted=False)
+    assert sync_row(Client, row).model_dump() == {"id": "client-1", "name": "Deniz Hukuk", "tax_id": None, "version": 3}
@@ -44,7 +44,8 @@ const getDateLocale = () => {
 
   const loadCases = async () => {
     try {
-      const params: any = {}
+      // The table shows a truncated description but none of the other long text.
+      const params: any = { fields: 'summary,description' }
       if (statusFilter && statusFilter !== 'all') {
         params.status = statusFilter
       }
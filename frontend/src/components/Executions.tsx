@@ -33,7 +33,7 @@ export default function Executions() {
 
   const loadExecutions = async () => {
     try {
-      const executionsData = await api.executions.getAll()
+      const executionsData = await api.executions.getAll({ fields: 'summary,reminder_text' })
       setExecutions(executionsData)
     } catch (error) {
       toast({
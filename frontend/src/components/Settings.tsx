@@ -63,12 +63,11 @@ export default function Settings() {
 
   const handleBackup = async () => {
     try {
-      const backupData = await api.backup.export()
-      const blob = new Blob([JSON.stringify(backupData, null, 2)], { type: 'application/json' })
+      const blob = await api.backup.export()
       const url = URL.createObjectURL(blob)
       const a = document.createElement('a')
       a.href = url
-      a.download = `lexcloud-backup-${new Date().toISOString().split('T')[0]}.json`
+      a.download = `lexcloud-backup-${new Date().toISOString().split('T')[0]}.ndjson`
       document.body.appendChild(a)
       a.click()
       document.body.removeChild(a)
@@ -92,20 +91,7 @@ export default function Settings() {
     if (!file) return
 
     try {
-      const text = await file.text()
-      const backupData = JSON.parse(text)
-      
-      if (!backupData || typeof backupData !== 'object') {
-        throw new Error('Invalid backup file format')
-      }
-      
-      const requiredSections = ['clients', 'cases', 'executions', 'compensation_letters']
-      const hasValidSections = requiredSections.some(section => backupData[section])
-      if (!hasValidSections) {
-        throw new Error('Backup file does not contain valid data sections')
-      }
-      
-      await api.backup.import(backupData)
+      await api.backup.import(file)
       toast({
         title: "Başarılı",
         description: "Veriler başarıyla geri yüklendi.",
@@ -118,10 +104,8 @@ export default function Settings() {
       console.error('Restore error:', error)
       let errorMessage = "Geri yükleme başarısız. Dosya formatını kontrol edin."
       
-      if (error.message === 'Invalid backup file format') {
-        errorMessage = "Geçersiz yedek dosya formatı. JSON dosyası seçtiğinizden emin olun."
-      } else if (error.message === 'Backup file does not contain valid data sections') {
-        errorMessage = "Yedek dosyası geçerli veri bölümleri içermiyor."
+      if (error.status === 400) {
+        errorMessage = `Geçersiz yedek dosyası: ${error.message}`
       } else if (error.status === 500) {
         errorMessage = "Sunucu hatası. Lütfen daha sonra tekrar deneyin."
       }
@@ -242,13 +226,13 @@ export default function Settings() {
               <Input
                 id="restore-file"
                 type="file"
-                accept=".json"
+                accept=".ndjson"
                 onChange={handleRestore}
               />
             </div>
             
             <div className="text-sm text-gray-500">
-              <p>⚠️ Geri yükleme işlemi mevcut tüm verileri değiştirecektir.</p>
+              <p>⚠️ Yedekteki yeni kayıtlar eklenir, mevcut kayıtlar yalnızca yedekteki sürüm daha yeniyse değiştirilir.</p>
             </div>
           </CardContent>
         </Card>
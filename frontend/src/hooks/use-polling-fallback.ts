@@ -1,14 +1,23 @@
 import { useEffect, useRef, useState } from 'react'
 import { api } from '@/lib/api'
+import type { SyncEntity } from '@/types'
 
 interface PollingFallbackOptions {
   enabled: boolean
   interval?: number
 }
 
+export interface PolledChanges {
+  entities: SyncEntity[]
+  timestamp: number
+}
+
+const SYNC_ENTITIES: SyncEntity[] = ['clients', 'cases', 'executions', 'compensation_letters']
+
 export function usePollingFallback({ enabled, interval = 10000 }: PollingFallbackOptions) {
-  const [lastPolledData, setLastPolledData] = useState<any>(null)
+  const [lastPolledData, setLastPolledData] = useState<PolledChanges | null>(null)
   const intervalRef = useRef<number>()
+  const tokenRef = useRef<string | null>(null)
 
   useEffect(() => {
     if (!enabled) {
@@ -16,34 +25,44 @@ export function usePollingFallback({ enabled, interval = 10000 }: PollingFallbac
         clearInterval(intervalRef.current)
         intervalRef.current = undefined
       }
+      tokenRef.current = null
       return
     }
 
     const pollData = async () => {
       try {
-        const [clients, cases, executions, compensationLetters] = await Promise.all([
-          api.clients.getAll(),
-          api.cases.getAll(),
-          api.executions.getAll(),
-          api.compensationLetters.getAll()
-        ])
-        
-        const newData = {
-          clients,
-          cases,
-          executions,
-          compensationLetters,
-          timestamp: Date.now()
+        if (!tokenRef.current) {
+          const { token } = await api.sync.getToken()
+          tokenRef.current = token
+          return
+        }
+
+        const changed = new Set<SyncEntity>()
+        let hasMore = true
+        while (hasMore) {
+          const response = await api.sync.changes(tokenRef.current)
+          tokenRef.current = response.token
+          hasMore = response.has_more
+          for (const entity of SYNC_ENTITIES) {
+            if (response.changes[entity].length > 0 || response.deleted[entity].length > 0) {
+              changed.add(entity)
+            }
+          }
+        }
+
+        if (changed.size > 0) {
+          setLastPolledData({
+            entities: Array.from(changed),
+            timestamp: Date.now()
+          })
         }
-        
-        setLastPolledData(newData)
       } catch (error) {
         console.error('Polling fallback error:', error)
       }
     }
 
     pollData()
-    
+
     intervalRef.current = window.setInterval(pollData, interval)
 
     return () => {
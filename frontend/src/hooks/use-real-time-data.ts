@@ -2,16 +2,24 @@ import { useEffect, useState, useCallback } from 'react'
 import { useWebSocket } from './use-websocket'
 import { usePollingFallback } from './use-polling-fallback'
 import { useToast } from './use-toast'
+import type { SyncEntity } from '@/types'
 
 interface DataChangeEvent {
   type: 'data_change'
-  change_type: 'create' | 'update' | 'delete'
+  change_type: 'create' | 'update' | 'delete' | 'bulk'
   entity_type: 'client' | 'case' | 'compensation_letter' | 'execution'
   entity_id: string
   data: any
   timestamp: string
 }
 
+const SYNC_ENTITY_TYPES: Record<SyncEntity, DataChangeEvent['entity_type']> = {
+  clients: 'client',
+  cases: 'case',
+  executions: 'execution',
+  compensation_letters: 'compensation_letter'
+}
+
 export function useRealTimeData() {
   const { lastMessage, isConnected } = useWebSocket()
   const { lastPolledData } = usePollingFallback({ enabled: !isConnected })
@@ -25,8 +33,19 @@ export function useRealTimeData() {
   useEffect(() => {
     if (lastMessage?.type === 'data_change') {
       const changeEvent = lastMessage as DataChangeEvent
-      setDataChanges(prev => [...prev, changeEvent])
-      
+      // Client renames also rewrite client_name on dependent rows.
+      const propagated: Record<string, number> = changeEvent.data?.propagated || {}
+      const propagatedChanges = Object.entries(propagated)
+        .filter(([, count]) => count > 0)
+        .map(([entityType]) => ({
+          ...changeEvent,
+          change_type: 'update' as const,
+          entity_type: entityType as DataChangeEvent['entity_type'],
+          entity_id: 'client-rename',
+          data: null
+        }))
+      setDataChanges(prev => [...prev, changeEvent, ...propagatedChanges])
+
       const entityNames = {
         client: 'Müvekkil',
         case: 'Dava',
@@ -37,7 +56,8 @@ export function useRealTimeData() {
       const actionNames = {
         create: 'oluşturuldu',
         update: 'güncellendi',
-        delete: 'silindi'
+        delete: 'silindi',
+        bulk: 'toplu olarak güncellendi'
       }
       
       const entityName = entityNames[changeEvent.entity_type] || changeEvent.entity_type
@@ -48,19 +68,48 @@ export function useRealTimeData() {
         description: `${entityName} ${actionName}. Sayfa otomatik olarak yenileniyor.`,
         duration: 3000,
       })
+    } else if (lastMessage?.type === 'reminder_due') {
+      const reminders: Array<{ type?: DataChangeEvent['entity_type'] }> = (lastMessage as any).reminders || []
+      const timestamp = lastMessage.timestamp || new Date().toISOString()
+      const entityTypes = Array.from(new Set(reminders.map(reminder => reminder.type || 'case')))
+      setDataChanges(prev => [...prev, ...entityTypes.map(entityType => ({
+        type: 'data_change' as const,
+        change_type: 'update' as const,
+        entity_type: entityType,
+        entity_id: 'reminder-due',
+        data: null,
+        timestamp
+      }))])
+
+      toast({
+        title: "Hatırlatma",
+        description: `Bugün için ${reminders.length} hatırlatma var.`,
+        duration: 5000,
+      })
+    } else if (lastMessage?.type === 'resync') {
+      const timestamp = lastMessage.timestamp || new Date().toISOString()
+      setDataChanges(prev => [...prev, ...Object.values(SYNC_ENTITY_TYPES).map(entityType => ({
+        type: 'data_change' as const,
+        change_type: 'update' as const,
+        entity_type: entityType,
+        entity_id: 'resync',
+        data: null,
+        timestamp
+      }))])
     }
   }, [lastMessage, toast])
 
   useEffect(() => {
     if (!isConnected && lastPolledData) {
-      setDataChanges(prev => [...prev, {
-        type: 'data_change',
-        change_type: 'update',
-        entity_type: 'client',
+      const timestamp = new Date(lastPolledData.timestamp).toISOString()
+      setDataChanges(prev => [...prev, ...lastPolledData.entities.map(entity => ({
+        type: 'data_change' as const,
+        change_type: 'update' as const,
+        entity_type: SYNC_ENTITY_TYPES[entity],
         entity_id: 'polling-fallback',
-        data: lastPolledData,
-        timestamp: new Date().toISOString()
-      }])
+        data: null,
+        timestamp
+      }))])
     }
   }, [lastPolledData, isConnected])
 
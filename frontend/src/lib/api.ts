@@ -1,7 +1,7 @@
 const API_URL = (import.meta.env.VITE_API_URL as string) || 'http://localhost:8000'
 
-import type { Client, ClientCreate, ClientUpdate, DashboardData, Case, CaseCreate, CaseUpdate, CaseSearchParams,Execution, ExecutionCreate, ExecutionUpdate, CompensationLetter, CompensationLetterCreate, CompensationLetterUpdate} from '../types'
-export type { Client, ClientCreate, ClientUpdate, DashboardData, Case, CaseCreate, CaseUpdate, CaseSearchParams,Execution, ExecutionCreate, ExecutionUpdate, CompensationLetter, CompensationLetterCreate, CompensationLetterUpdate}
+import type { Client, ClientCreate, ClientUpdate, DashboardData, Case, CaseCreate, CaseUpdate, CaseSearchParams,Execution, ExecutionCreate, ExecutionUpdate, CompensationLetter, CompensationLetterCreate, CompensationLetterUpdate, SyncResponse, RestoreResponse} from '../types'
+export type { Client, ClientCreate, ClientUpdate, DashboardData, Case, CaseCreate, CaseUpdate, CaseSearchParams,Execution, ExecutionCreate, ExecutionUpdate, CompensationLetter, CompensationLetterCreate, CompensationLetterUpdate, SyncResponse, RestoreResponse}
 
 
 
@@ -77,6 +77,11 @@ export const api = {
   dashboard: {
     getData: () => apiRequest<DashboardData>('/api/dashboard'),
   },
+
+  sync: {
+    getToken: () => apiRequest<{ token: string }>('/api/sync/token'),
+    changes: (since: string) => apiRequest<SyncResponse>(`/api/sync?since=${encodeURIComponent(since)}`),
+  },
   
   auth: {
     changePassword: (currentPassword: string, newPassword: string) => 
@@ -87,16 +92,42 @@ export const api = {
   },
   
   backup: {
-    export: () => apiRequest<any>('/api/backup'),
-    import: (data: any) => apiRequest<{ message: string }>('/api/restore', {
-      method: 'POST',
-      body: JSON.stringify(data),
-    }),
+    export: async (): Promise<Blob> => {
+      const token = localStorage.getItem('auth_token')
+      const response = await fetch(`${API_URL}/api/backup?format=ndjson`, {
+        headers: token ? { 'Authorization': `Bearer ${token}` } : {},
+      })
+      if (!response.ok) {
+        throw new ApiError(response.status, response.statusText)
+      }
+      return response.blob()
+    },
+    import: async (file: Blob): Promise<RestoreResponse> => {
+      const token = localStorage.getItem('auth_token')
+      const response = await fetch(`${API_URL}/api/restore`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/x-ndjson',
+          ...(token && { 'Authorization': `Bearer ${token}` }),
+        },
+        body: file,
+      })
+      if (!response.ok) {
+        let errorMessage = response.statusText
+        try {
+          errorMessage = (await response.json()).detail || errorMessage
+        } catch {
+          // keep statusText
+        }
+        throw new ApiError(response.status, errorMessage)
+      }
+      return response.json()
+    },
   },
 
 
  cases: {
-    getAll: (params?: { status?: string; client_id?: string; query?: string; responsible_person?: string; görevlendiren?: string; page?: number; limit?: number }) => {
+    getAll: (params?: { status?: string; client_id?: string; query?: string; responsible_person?: string; görevlendiren?: string; page?: number; limit?: number; fields?: string }) => {
       const searchParams = new URLSearchParams()
       if (params?.status) searchParams.append('status', params.status)
       if (params?.client_id) searchParams.append('client_id', params.client_id)
@@ -105,6 +136,7 @@ export const api = {
       if (params?.görevlendiren) searchParams.append('görevlendiren', params.görevlendiren)
       if (params?.page) searchParams.append('page', params.page.toString())
       if (params?.limit) searchParams.append('limit', params.limit.toString())
+      if (params?.fields) searchParams.append('fields', params.fields)
       
       const query = searchParams.toString()
       return apiRequest<Case[]>(`/api/cases${query ? `?${query}` : ''}`)
@@ -134,12 +166,13 @@ export const api = {
     },
   },
   executions: {
-    getAll: (params?: { status?: string; client_id?: string; responsible_person?: string; görevlendiren?: string }) => {
+    getAll: (params?: { status?: string; client_id?: string; responsible_person?: string; görevlendiren?: string; fields?: string }) => {
       const searchParams = new URLSearchParams()
       if (params?.status) searchParams.append('status', params.status)
       if (params?.client_id) searchParams.append('client_id', params.client_id)
       if (params?.responsible_person) searchParams.append('responsible_person', params.responsible_person)
       if (params?.görevlendiren) searchParams.append('görevlendiren', params.görevlendiren)
+      if (params?.fields) searchParams.append('fields', params.fields)
       
       const query = searchParams.toString()
       return apiRequest<Execution[]>(`/api/executions${query ? `?${query}` : ''}`)
@@ -249,4 +249,33 @@ export interface CompensationLetterUpdate {
   responsible_person?: string
   görevlendiren?: string
   version?: number
-}
\ No newline at end of file
+}
+
+export type SyncEntity = 'clients' | 'cases' | 'executions' | 'compensation_letters'
+
+export interface SyncResponse {
+  token: string
+  has_more: boolean
+  changes: {
+    clients: Client[]
+    cases: Case[]
+    executions: Execution[]
+    compensation_letters: CompensationLetter[]
+  }
+  deleted: Record<SyncEntity, string[]>
+}
+
+export interface RestoreTableStats {
+  rows: number
+  inserted: number
+  updated: number
+  skipped: number
+  copy_ms: number
+  upsert_ms: number
+}
+
+export interface RestoreResponse {
+  message: string
+  elapsed_ms: number
+  tables: Record<SyncEntity, RestoreTableStats>
+}